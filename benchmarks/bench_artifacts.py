@@ -0,0 +1,47 @@
+# Compare what the first session of a server process pays for each loss-ratio
+# page: building its data in the page (datasets read from the columnar cache,
+# then prioritization, endorsement attach, usage join and cube) against
+# reading the prebuilt data written by `python pipeline.py`.
+# Run from the repository root with the source workbooks present:
+#
+#     python benchmarks/bench_artifacts.py
+import importlib
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+os.environ["LOSS_RATIO_ARTIFACTS_DIR"] = tempfile.mkdtemp()
+
+import pipeline
+from data_store import invalidate
+
+REPEAT = 5
+
+
+# Function to time one call in milliseconds (best of REPEAT), dropping the
+# loaded datasets before each call as a fresh server process would have none
+def best_ms(func):
+    best = float("inf")
+    for _ in range(REPEAT):
+        invalidate()
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+if __name__ == "__main__":
+    today = pd.Timestamp.today().normalize()
+    start = time.perf_counter()
+    print(f"built {pipeline.build_artifacts(today)} in {time.perf_counter() - start:.2f} s")
+
+    print(f"{'page':<18}{'built in page':>16}{'prebuilt':>12}")
+    for page in pipeline.ARTIFACT_PAGES:
+        module = importlib.import_module(page)
+        built_ms = best_ms(lambda: module.load_data(today))
+        prebuilt_ms = best_ms(lambda: module.load_page_data(today))
+        print(f"{page:<18}{built_ms:>14.1f}ms{prebuilt_ms:>10.1f}ms")
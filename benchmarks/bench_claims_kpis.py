@@ -0,0 +1,75 @@
+# Compare the claims page metric cards computed from ten boolean-mask subsets
+# (one copy of the frame each) with the one-pass KPI aggregation.
+# Run from the repository root:
+#
+#     python benchmarks/bench_claims_kpis.py [rows ...]
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+
+from kpis import claims_kpis
+
+CLAIM_TYPES = ["Outpatient", "Dental", "Wellness", "Optical", "Pharmacy", "Maternity", "ProActiv", "Inpatient"]
+
+
+# Function to build a claims-like frame with the columns behind the metric cards
+def make_claims(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    claim_amount = rng.gamma(2, 5e4, rows)
+    return pd.DataFrame({
+        "Claim ID": rng.integers(0, rows // 2 + 1, rows),
+        "Claim Type": rng.choice(CLAIM_TYPES, rows),
+        "Claim Status": rng.choice(["Approved", "Declined", "Pending"], rows),
+        "Employer Name": np.char.add("EMPLOYER ", rng.integers(0, 2000, rows).astype(str)),
+        "Claim Amount": claim_amount,
+        "Approved Claim Amount": claim_amount * rng.random(rows),
+    })
+
+
+# The previous metric cards, one subset per claim type and status
+def subset_kpis(df):
+    values = {
+        "claim_amount": df["Claim Amount"].sum(),
+        "claim_amount_mean": df["Claim Amount"].mean(),
+        "approved_amount_mean": df["Approved Claim Amount"].mean(),
+        "clients": df["Employer Name"].nunique(),
+        "claims": df["Claim ID"].nunique(),
+    }
+    for claim_type in CLAIM_TYPES:
+        values[claim_type] = df[df["Claim Type"] == claim_type]["Approved Claim Amount"].sum()
+    for status in ["Approved", "Declined"]:
+        subset = df[df["Claim Status"] == status]
+        values[status + " amount"] = subset["Claim Amount"].sum()
+        values[status + " claims"] = subset["Claim ID"].nunique()
+    return values
+
+
+# Function to flatten the one-pass KPIs into the same shape as subset_kpis
+def one_pass_kpis(df):
+    kpis = claims_kpis(df)
+    values = {key: kpis[key] for key in ["claim_amount", "claim_amount_mean", "approved_amount_mean", "clients", "claims"]}
+    for claim_type in CLAIM_TYPES:
+        values[claim_type] = kpis["approved_amount_by_type"].get(claim_type, 0)
+    for status in ["Approved", "Declined"]:
+        values[status + " amount"] = kpis["claim_amount_by_status"].get(status, 0)
+        values[status + " claims"] = kpis["claims_by_status"].get(status, 0)
+    return values
+
+
+if __name__ == "__main__":
+    for rows in [int(arg) for arg in sys.argv[1:]] or [1_000_000, 10_000_000]:
+        df = make_claims(rows)
+        old, new = subset_kpis(df), one_pass_kpis(df)
+        assert all(np.isclose(old[key], new[key]) for key in old), "metric cards disagree"
+
+        old_s = min(timeit.repeat(lambda: subset_kpis(df), number=1, repeat=3))
+        new_s = min(timeit.repeat(lambda: one_pass_kpis(df), number=1, repeat=3))
+        print(f"rows: {rows:,}")
+        print(f"  subset per card: {old_s * 1000:8.1f} ms")
+        print(f"  one pass:        {new_s * 1000:8.1f} ms  ({old_s / new_s:.1f}x faster)")
+        del df
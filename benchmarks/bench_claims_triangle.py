@@ -0,0 +1,62 @@
+# Cumulative claims development triangle of synthetic claims: a pandas
+# groupby / pivot over dates against triangle.claims_triangle over month
+# numbers, then the chain ladder on top. Both must give the same triangle.
+# Run from the repository root:
+#
+#     python benchmarks/bench_claims_triangle.py [claims]
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+
+from triangle import chain_ladder, claims_triangle, month_number
+
+GRAIN = 3
+
+
+# Function to make claims of policies starting over three years, reported up to two years later
+def make_claims(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    starts = pd.Timestamp("2022-01-01") + pd.to_timedelta(rng.integers(0, 1095, rows), unit="D")
+    reported = starts + pd.to_timedelta(rng.integers(0, 730, rows), unit="D")
+    return pd.DataFrame({"Start Date": starts, "Claim Created Date": reported,
+                         "Approved Claim Amount": rng.integers(0, 100_000, rows).astype(float)})
+
+
+# Function to build the same triangle with a pandas groupby and pivot
+def pandas_triangle(df, as_of):
+    df = df[df["Claim Created Date"] <= as_of]
+    origin = df["Start Date"].dt.to_period("Q")
+    lag = (df["Claim Created Date"].dt.to_period("Q") - origin).apply(lambda offset: offset.n)
+    incremental = df.groupby([origin, lag])["Approved Claim Amount"].sum().unstack(fill_value=0.0)
+    origins = pd.period_range(incremental.index.min(), as_of.to_period("Q"), freq="Q")
+    incremental = incremental.reindex(index=origins, columns=range(len(origins)), fill_value=0.0)
+    cumulative = incremental.cumsum(axis=1)
+    for row, origin in enumerate(origins):
+        cumulative.iloc[row, len(origins) - row:] = np.nan
+    return cumulative
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+    df = make_claims(rows)
+    as_of = pd.Timestamp("2024-09-30")
+
+    start = time.perf_counter()
+    expected = pandas_triangle(df, as_of)
+    pandas_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    triangle = claims_triangle(month_number(df["Start Date"]), month_number(df["Claim Created Date"]),
+                               df["Approved Claim Amount"], month_number([as_of])[0], grain=GRAIN)
+    factors, projection = chain_ladder(triangle)
+    triangle_s = time.perf_counter() - start
+    np.testing.assert_allclose(triangle.to_numpy(), expected.to_numpy(), rtol=1e-9)
+
+    print(f"{rows:,} claims, {len(triangle)} origin quarters")
+    print(f"pandas groupby / pivot:        {pandas_s:8.2f} s")
+    print(f"triangle + chain ladder:       {triangle_s:8.2f} s  ({pandas_s / triangle_s:.1f}x faster)")
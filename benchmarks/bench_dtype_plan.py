@@ -0,0 +1,37 @@
+# Compare memory and the page groupby / isin work on a claims-like frame as
+# read (object strings, int64) and after the ingest-time dtype plan.
+# Run from the repository root:
+#
+#     python benchmarks/bench_dtype_plan.py [rows]
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.getcwd())
+sys.path.insert(0, os.path.join(os.getcwd(), "benchmarks"))
+
+from bench_filter_index import make_claims
+from dtype_plan import compact, memory_report
+
+
+# Function to run the kind of grouping and filtering the claims page does
+def page_work(df):
+    df.groupby(["Employer Name", "Claim Type"], observed=True)["Claim Amount"].sum().nlargest(15)
+    df.groupby("Provider Name", observed=True)["Claim Amount"].sum()
+    df[df["ICD-10 Code"].isin([f"J{i}" for i in range(0, 5000, 3)])]
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    df = make_claims(rows)
+    df["Claim ID"] = df.index.to_numpy()
+    df["Claim Amount"] = df["Claim Amount"].round().astype("int64")
+    for column in ["Claim Type", "Claim Status", "Source", "ICD-10 Code", "Employer Name", "Provider Name"]:
+        df[column] = df[column].astype(object)
+    compacted = compact(df)
+    print(memory_report("claims", df, compacted))
+
+    old_s = min(timeit.repeat(lambda: page_work(df), number=1, repeat=3))
+    new_s = min(timeit.repeat(lambda: page_work(compacted), number=1, repeat=3))
+    print(f"groupby / isin as read:   {old_s * 1000:8.1f} ms")
+    print(f"groupby / isin compacted: {new_s * 1000:8.1f} ms  ({old_s / new_s:.1f}x faster)")
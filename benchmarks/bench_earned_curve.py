@@ -0,0 +1,43 @@
+# Daily earned premium curve of a synthetic book of policies: summing the
+# per-policy earned premium once per day against the difference-array curve.
+# Both must give the same values. Run from the repository root:
+#
+#     python benchmarks/bench_earned_curve.py [policies] [days]
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+
+from earned import earned_premium_curve, policy_earned_premium
+
+
+# Function to make policies starting over two years with up to 13 months of cover
+def make_policies(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    starts = pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 730, rows), unit="D")
+    ends = starts + pd.to_timedelta(rng.integers(0, 396, rows), unit="D")
+    return rng.random(rows) * 1e6, pd.Series(starts), pd.Series(ends)
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    n_days = int(sys.argv[2]) if len(sys.argv) > 2 else 365
+    premiums, starts, ends = make_policies(rows)
+    days = pd.date_range("2023-07-01", periods=n_days, freq="D")
+
+    start = time.perf_counter()
+    per_day = np.array([np.nansum(policy_earned_premium(premiums, starts, ends, day)) for day in days])
+    per_day_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    curve = earned_premium_curve(premiums, starts, ends, days[0], days[-1])
+    curve_s = time.perf_counter() - start
+    np.testing.assert_allclose(curve.to_numpy(), per_day, rtol=1e-9)
+
+    print(f"{rows:,} policies x {n_days:,} days")
+    print(f"per-day sums:    {per_day_s * 1000:8.1f} ms")
+    print(f"curve:           {curve_s * 1000:8.1f} ms  ({per_day_s / curve_s:.0f}x faster)")
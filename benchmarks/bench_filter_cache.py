@@ -0,0 +1,40 @@
+# Flip back and forth between two sidebar filter states, re-applying the
+# filters every rerun against the memoized filtered-frame cache.
+# Run from the repository root:
+#
+#     python benchmarks/bench_filter_cache.py [rows]
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.getcwd())
+sys.path.insert(0, os.path.join(os.getcwd(), "benchmarks"))
+
+from bench_filter_index import make_claims
+from data_store import get_derived, get_filtered
+from filter_index import apply_filters, build_filter_index
+
+COLUMNS = ["Claim Type", "Claim Status", "Source", "ICD-10 Code", "Employer Name", "Provider Name"]
+
+
+# Function to build the frame and filter index the way a page's load_data does
+def load_data(rows):
+    df = make_claims(rows)
+    return df, build_filter_index(df, COLUMNS)
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    df, index = get_derived("bench", load_data, sources=(), params=(rows,))
+    states = [
+        {"Claim Type": ["Inpatient"], "Employer Name": [f"EMPLOYER {i}" for i in range(0, 2000, 2)]},
+        {"Claim Type": ["Outpatient", "Dental"], "Claim Status": ["Approved"]},
+    ]
+
+    # Ten reruns alternating between the two states
+    flips = [states[i % 2] for i in range(10)]
+    uncached_s = min(timeit.repeat(lambda: [apply_filters(df, index, state) for state in flips], number=1, repeat=3)) / len(flips)
+    cached_s = min(timeit.repeat(lambda: [get_filtered("bench", state, lambda: apply_filters(df, index, state), params=(rows,)) for state in flips], number=1, repeat=3)) / len(flips)
+    print(f"rows: {rows:,}")
+    print(f"re-apply filters per rerun: {uncached_s * 1000:8.2f} ms")
+    print(f"filtered-frame cache:       {cached_s * 1000:8.2f} ms  ({uncached_s / cached_s:,.0f}x faster)")
@@ -0,0 +1,71 @@
+# Compare the sidebar filters applied as sequential isin masks (one copy of the
+# frame per filter) with the precomputed filter index (one take at the end).
+# Run from the repository root:
+#
+#     python benchmarks/bench_filter_index.py [rows]
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+
+from filter_index import apply_filters, build_filter_index, select_rows
+
+
+# Function to build a claims-like frame with the claims page filter and date columns
+def make_claims(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "Claim Type": rng.choice(["Inpatient", "Outpatient", "Dental", "Optical"], rows),
+        "Claim Status": rng.choice(["Approved", "Declined", "Pending"], rows),
+        "Source": rng.choice(["Portal", "Email", "Provider"], rows),
+        "ICD-10 Code": np.char.add("J", rng.integers(0, 5000, rows).astype(str)),
+        "Employer Name": np.char.add("EMPLOYER ", rng.integers(0, 2000, rows).astype(str)),
+        "Provider Name": np.char.add("PROVIDER ", rng.integers(0, 800, rows).astype(str)),
+        "Claim Created Date": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 700 * 24, rows), unit="h"),
+        "Claim Amount": rng.gamma(2, 5e4, rows),
+    })
+
+
+# The previous filters, one isin mask and one copy per selected column
+def sequential_isin(df, selections):
+    for column, chosen in selections.items():
+        if column in df.columns and chosen:
+            df = df[df[column].isin(chosen)]
+    return df
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    df = make_claims(rows)
+    selections = {
+        "Claim Type": ["Inpatient", "Outpatient", "Dental"],
+        "Claim Status": ["Approved", "Pending"],
+        "Source": ["Portal", "Provider"],
+        "ICD-10 Code": [f"J{i}" for i in range(0, 5000, 3)],
+        "Employer Name": [f"EMPLOYER {i}" for i in range(0, 2000, 2)],
+        "Provider Name": [f"PROVIDER {i}" for i in range(0, 800, 2)],
+    }
+
+    build_s = min(timeit.repeat(lambda: build_filter_index(df, list(selections), "Claim Created Date"), number=1, repeat=1))
+    index = build_filter_index(df, list(selections), "Claim Created Date")
+    assert sequential_isin(df, selections).index.equals(apply_filters(df, index, selections).index), "filters disagree"
+
+    old_s = min(timeit.repeat(lambda: sequential_isin(df, selections), number=1, repeat=3))
+    new_s = min(timeit.repeat(lambda: apply_filters(df, index, selections), number=1, repeat=3))
+    print(f"rows: {rows:,}  kept: {len(apply_filters(df, index, selections)):,}")
+    print(f"index build (once per load): {build_s * 1000:8.1f} ms")
+    print(f"sequential isin:             {old_s * 1000:8.1f} ms")
+    print(f"filter index:                {new_s * 1000:8.1f} ms  ({old_s / new_s:.1f}x faster)")
+
+    # Date inputs alone, finding the rows (the take that follows is the same):
+    # a between mask over every row against two binary searches
+    date_range = (pd.Timestamp("2023-06-01"), pd.Timestamp("2023-08-31"))
+    dates = df["Claim Created Date"]
+    between_s = min(timeit.repeat(lambda: np.flatnonzero(dates.between(date_range[0], date_range[1] + pd.Timedelta("1D"), inclusive="left")), number=1, repeat=3))
+    dated_s = min(timeit.repeat(lambda: select_rows(index, {}, date_range), number=1, repeat=3))
+    print(f"date rows, between mask:     {between_s * 1000:8.1f} ms")
+    print(f"date rows, sorted index:     {dated_s * 1000:8.1f} ms  ({between_s / dated_s:.1f}x faster)")
@@ -0,0 +1,78 @@
+# Refresh a claims workbook after rows were appended to its current-year
+# sheet: a full parse of both sheets against the incremental refresh, which
+# parses only the appended rows and keeps the untouched sheet's cached copy.
+# Both must give the same frames, and neither sheet may be parsed in full.
+# The rows are appended either by writing the whole workbook again with
+# pandas ('pandas') or by opening it in openpyxl, appending to the sheet and
+# saving it ('openpyxl'), which renumbers and adds cell styles. Run from the
+# repository root:
+#
+#     python benchmarks/bench_incremental_ingest.py [rows per sheet] [appended rows] [pandas|openpyxl]
+import os
+import sys
+import tempfile
+import time
+
+import openpyxl
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+sys.path.insert(0, os.path.join(os.getcwd(), "benchmarks"))
+workdir = tempfile.mkdtemp()
+os.environ["LOSS_RATIO_CACHE_DIR"] = os.path.join(workdir, "cache")
+
+from bench_filter_index import make_claims
+from excel_cache import clear_cache, iter_sheets_cached, sheet_manifest
+
+SHEETS = ["2023 claims", "2024 claims"]
+APPEND_KEY = "Claim ID"
+
+
+# Function to write the workbook with the first rows of the 2024 sheet
+def write_workbook(path, df_2023, df_2024, rows):
+    with pd.ExcelWriter(path) as writer:
+        df_2023.to_excel(writer, sheet_name=SHEETS[0], index=False)
+        df_2024.iloc[:rows].to_excel(writer, sheet_name=SHEETS[1], index=False)
+
+
+# Function to append rows to the 2024 sheet in openpyxl and save the workbook
+def append_openpyxl(path, rows):
+    book = openpyxl.load_workbook(path)
+    sheet = book[SHEETS[1]]
+    for row in rows.itertuples(index=False):
+        sheet.append([value.to_pydatetime() if isinstance(value, pd.Timestamp) else value for value in row])
+    book.save(path)
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    appended = int(sys.argv[2]) if len(sys.argv) > 2 else 1_000
+    mode = sys.argv[3] if len(sys.argv) > 3 else "pandas"
+    df_2023, df_2024 = make_claims(rows, seed=0), make_claims(rows + appended, seed=1)
+    df_2023.insert(0, "Claim ID", range(rows))
+    df_2024.insert(0, "Claim ID", range(rows, 2 * rows + appended))
+    path = os.path.join(workdir, "Claims.xlsx")
+
+    write_workbook(path, df_2023, df_2024, rows)
+    list(iter_sheets_cached(path, SHEETS, append_key=APPEND_KEY))
+    if mode == "openpyxl":
+        append_openpyxl(path, df_2024.iloc[rows:])
+    else:
+        write_workbook(path, df_2023, df_2024, rows + appended)
+
+    start = time.perf_counter()
+    incremental = list(iter_sheets_cached(path, SHEETS, append_key=APPEND_KEY))
+    incremental_s = time.perf_counter() - start
+    for sheet in SHEETS:
+        assert sheet_manifest(path, sheet)["appended"], f"{sheet} was parsed in full"
+
+    clear_cache()
+    start = time.perf_counter()
+    full = list(iter_sheets_cached(path, SHEETS))
+    full_s = time.perf_counter() - start
+    for a, b in zip(incremental, full):
+        pd.testing.assert_frame_equal(a, b)
+
+    print(f"2 sheets x {rows:,} rows, {appended:,} rows appended ({mode})")
+    print(f"full parse:          {full_s:8.2f} s")
+    print(f"incremental refresh: {incremental_s:8.2f} s  ({full_s / incremental_s:.1f}x faster)")
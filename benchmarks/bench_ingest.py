@@ -0,0 +1,61 @@
+# Parse four workbook sheets (two workbooks, two sheets each, like the
+# premium and claims datasets) one after another and in the process pool.
+# The columnar cache is cleared before every run so each sheet is parsed.
+# Run from the repository root:
+#
+#     python benchmarks/bench_ingest.py [rows per sheet] [workers]
+import os
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+workdir = tempfile.mkdtemp()
+os.environ["LOSS_RATIO_CACHE_DIR"] = os.path.join(workdir, "cache")
+
+from excel_cache import clear_cache
+from ingest import INGEST_WORKERS, read_sheets, timing_report
+
+
+# Function to write a workbook with a claims-like sheet per year
+def make_workbook(path, sheets, rows, seed=0):
+    rng = np.random.default_rng(seed)
+    with pd.ExcelWriter(path) as writer:
+        for sheet in sheets:
+            pd.DataFrame({
+                "Claim ID": np.arange(rows),
+                "Employer Name": np.char.add("EMPLOYER ", rng.integers(0, 500, rows).astype(str)),
+                "Claim Created Date": pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 700, rows), unit="D"),
+                "Claim Amount": rng.integers(1_000, 1_000_000, rows),
+                "Claim Type": rng.choice(["Inpatient", "Outpatient", "Dental"], rows),
+            }).to_excel(writer, sheet_name=sheet, index=False)
+
+
+# Function to time one cold read of every job
+def timed_read(jobs, workers):
+    clear_cache()
+    start = time.perf_counter()
+    frames, timings = read_sheets(jobs, workers=workers)
+    return time.perf_counter() - start, frames, timings
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 50_000
+    workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(INGEST_WORKERS, 2)
+    premiums, claims = os.path.join(workdir, "premiums.xlsx"), os.path.join(workdir, "claims.xlsx")
+    make_workbook(premiums, ["2023", "2024"], rows)
+    make_workbook(claims, ["2023 claims", "2024 claims"], rows, seed=1)
+    jobs = [(premiums, "2023", None), (premiums, "2024", None), (claims, "2023 claims", None), (claims, "2024 claims", None)]
+
+    serial_s, serial_frames, _ = timed_read(jobs, 1)
+    pool_s, pool_frames, timings = timed_read(jobs, workers)
+    assert all(a.equals(b) for a, b in zip(serial_frames, pool_frames)), "frames differ"
+
+    print(f"rows per sheet: {rows:,}  workers: {workers}")
+    for timing in timings:
+        print("  " + timing_report(timing))
+    print(f"one after another: {serial_s:8.2f} s")
+    print(f"process pool:      {pool_s:8.2f} s  ({serial_s / pool_s:.1f}x faster)")
@@ -0,0 +1,87 @@
+# Loss ratio series per client from synthetic policies and claims: a pandas
+# rolling sum per client and window, over claims grouped by the month of
+# their date and premium earned per month (policy_earned_premium at every
+# month start, one month at a time), against trends.loss_ratio_series. Both
+# must give the same ratios. Run from the repository root:
+#
+#     python benchmarks/bench_loss_ratio_series.py [clients] [months]
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+
+from earned import policy_earned_premium
+from trends import WINDOWS, loss_ratio_series
+
+FIRST = pd.Timestamp("2020-01-01")
+
+
+# Function to make yearly policies back to back per client over the months,
+# and claims dated within them
+def make_data(clients, months, seed=0):
+    rng = np.random.default_rng(seed)
+    years = -(-months // 12)
+    client = np.repeat(np.arange(clients), years)
+    starts = FIRST + pd.to_timedelta(rng.integers(0, 28, clients * years), unit="D") + pd.to_timedelta(
+        np.tile(np.arange(years) * 365, clients), unit="D")
+    policies = pd.DataFrame({
+        "client_id": client,
+        "Client Name": [f"Client {i}" for i in client],
+        "Start Date": starts,
+        "End Date": starts + pd.Timedelta(days=364),
+        "Total": rng.random(clients * years) * 1e6,
+    })
+    n_claims = clients * months
+    claims = pd.DataFrame({
+        "client_id": rng.integers(0, clients, n_claims),
+        "Claim Created Date": FIRST + pd.to_timedelta(rng.integers(0, months * 30, n_claims), unit="D"),
+        "Claim Amount": rng.random(n_claims) * 5e4,
+    })
+    return policies, claims
+
+
+# Function to compute the same series with pandas, per client and window
+def rolling_series(policies, claims, as_of):
+    months = pd.period_range(policies["Start Date"].min(), as_of, freq="M")
+    bounds = list(months[1:].start_time) + [as_of]
+    earned = pd.DataFrame({month: policy_earned_premium(policies["Total"], policies["Start Date"], policies["End Date"], bound)
+                           for month, bound in zip(months, bounds)})
+    earned = earned.diff(axis=1).fillna(earned).groupby(policies["Client Name"].to_numpy()).sum()
+
+    claims = claims[claims["Claim Created Date"] <= as_of].merge(policies, on="client_id")
+    claims = claims[claims["Claim Created Date"].between(claims["Start Date"], claims["End Date"])]
+    claims = claims.groupby(["Client Name", claims["Claim Created Date"].dt.to_period("M")])["Claim Amount"].sum()
+    ratios = {}
+    for name, width in WINDOWS.items():
+        for client, premium in earned.iterrows():
+            amounts = claims.get(client, pd.Series(dtype=float)).reindex(months, fill_value=0)
+            window_premium = premium.rolling(width).sum().to_numpy()
+            window_claims = amounts.rolling(width).sum().to_numpy()
+            ratios[(name, client)] = np.where(window_premium > 0, window_claims / window_premium, np.nan)
+    return ratios
+
+
+if __name__ == "__main__":
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000
+    months = int(sys.argv[2]) if len(sys.argv) > 2 else 60
+    policies, claims = make_data(clients, months)
+    as_of = FIRST + pd.DateOffset(months=months) - pd.Timedelta(days=1)
+
+    start = time.perf_counter()
+    expected = rolling_series(policies, claims, as_of)
+    rolling_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    series = loss_ratio_series(claims, "Claim Amount", "Claim Created Date", policies, as_of, by="Client Name")
+    prefix_s = time.perf_counter() - start
+    computed = {key: rows.to_numpy() for key, rows in series.groupby(["Window", "Client Name"], sort=False)["Loss Ratio"]}
+    for key, ratios in expected.items():
+        np.testing.assert_allclose(computed[key], ratios, equal_nan=True)
+
+    print(f"{clients:,} clients x {months} months, {len(WINDOWS)} windows")
+    print(f"pandas rolling per client: {rolling_s * 1000:9.1f} ms")
+    print(f"prefix sums:               {prefix_s * 1000:9.1f} ms  ({rolling_s / prefix_s:.0f}x faster)")
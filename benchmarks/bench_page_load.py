@@ -0,0 +1,38 @@
+# Compare per-rerun page loading: the old exec(open(page).read()) routing
+# against importable page modules. Run from the repository root:
+#
+#     python benchmarks/bench_page_load.py
+import importlib
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.getcwd())
+
+from loss_ratio import PAGES
+
+REPEAT = 50
+
+
+# Function to time one call in milliseconds (best of REPEAT)
+def best_ms(func, number=1):
+    return min(timeit.repeat(func, number=number, repeat=REPEAT)) / number * 1000
+
+
+print(f"{'page':<18}{'exec: read+compile':>20}{'import (cold)':>16}{'import (rerun)':>16}")
+for module_name in PAGES.values():
+    path = module_name + ".py"
+
+    # Before: every rerun re-read and re-compiled the whole script
+    compile_ms = best_ms(lambda: compile(open(path).read(), path, "exec"))
+
+    # After: the first import loads bytecode from __pycache__ ...
+    def cold_import():
+        sys.modules.pop(module_name, None)
+        importlib.import_module(module_name)
+    cold_ms = best_ms(cold_import)
+
+    # ... and every later rerun is a sys.modules lookup
+    warm_ms = best_ms(lambda: importlib.import_module(module_name), number=1000)
+
+    print(f"{module_name:<18}{compile_ms:>18.2f}ms{cold_ms:>14.2f}ms{warm_ms:>14.4f}ms")
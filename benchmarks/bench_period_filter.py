@@ -0,0 +1,50 @@
+# Compare the old Month-Year range filter (split every label per row) with a
+# binary-search slice over the integer period key. Run from the repository root:
+#
+#     python benchmarks/bench_period_filter.py [rows]
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+
+from periods import MONTHS, add_period, period_slice
+
+month_order = {name: number for number, name in enumerate(MONTHS, 1)}
+
+
+# Function to build a claims-like frame with Year and Month columns
+def make_claims(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.Timestamp("2023-01-01") + pd.to_timedelta(rng.integers(0, 700, rows), unit="D")
+    return pd.DataFrame({
+        "Year": dates.year,
+        "Month": dates.strftime("%B"),
+        "Claim Amount": rng.gamma(2, 5e4, rows),
+    })
+
+
+# The previous filter, copied from the page scripts
+def month_year_filter(df, start_index, end_index):
+    return df[
+        df['Month-Year'].apply(lambda x: (int(x.split()[1]), month_order.get(x.split()[0], 0))).between(start_index, end_index)
+    ]
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    df = add_period(make_claims(rows))
+    start, end = (2023, 4), (2024, 3)
+
+    expected = month_year_filter(df, start, end)
+    result = period_slice(df, start[0] * 100 + start[1], end[0] * 100 + end[1])
+    assert expected.index.equals(result.index), "filters disagree"
+
+    old_s = min(timeit.repeat(lambda: month_year_filter(df, start, end), number=1, repeat=1))
+    new_s = min(timeit.repeat(lambda: period_slice(df, start[0] * 100 + start[1], end[0] * 100 + end[1]), number=10, repeat=5)) / 10
+    print(f"rows: {rows:,}  kept: {len(result):,}")
+    print(f"Month-Year apply: {old_s * 1000:10.1f} ms")
+    print(f"period slice:     {new_s * 1000:10.3f} ms  ({old_s / new_s:,.0f}x faster)")
@@ -0,0 +1,54 @@
+# Compare policies.prioritize_renewal with the version the pages used to carry.
+# Run from the repository root:
+#
+#     python benchmarks/bench_prioritize_renewal.py [rows]
+import os
+import sys
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+
+from policies import prioritize_renewal
+
+
+# The previous implementation, copied from the page scripts
+def prioritize_renewal_legacy(df):
+    clients_with_both = df.groupby('Client Name')['Cover Type'].nunique()
+    clients_with_both = clients_with_both[clients_with_both == 2].index
+    df_clients_with_both = df[df['Client Name'].isin(clients_with_both)]
+    df_other_clients = df[~df['Client Name'].isin(clients_with_both)]
+    df_clients_with_both_sorted = df_clients_with_both.sort_values(by=['Client Name', 'Cover Type'], ascending=[True, False])
+    df_clients_with_both_deduped = df_clients_with_both_sorted.drop_duplicates(subset=['Client Name'], keep='first')
+    return pd.concat([df_clients_with_both_deduped, df_other_clients])
+
+
+# Function to build a policy frame shaped like the non-endorsement premium rows
+def make_policies(rows, seed=0):
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp("2020-01-01") + pd.to_timedelta(rng.integers(0, 1500, rows), unit="D")
+    return pd.DataFrame({
+        "Client Name": np.char.add("CLIENT ", rng.integers(0, rows // 4, rows).astype(str)),
+        "Cover Type": rng.choice(["New", "Renewal"], rows, p=[0.7, 0.3]),
+        "Product": rng.choice(["Health", "ProActiv", "Fund"], rows),
+        "Start Date": start,
+        "End Date": start + pd.Timedelta(days=364),
+        "Total": rng.gamma(2, 1e6, rows),
+    })
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    df = make_policies(rows)
+
+    expected = prioritize_renewal_legacy(df)
+    result = prioritize_renewal(df)
+    assert expected.index.equals(result.index), "implementations disagree"
+
+    legacy_s = min(timeit.repeat(lambda: prioritize_renewal_legacy(df), number=1, repeat=5))
+    new_s = min(timeit.repeat(lambda: prioritize_renewal(df), number=1, repeat=5))
+    print(f"rows: {rows:,}  kept: {len(result):,}")
+    print(f"legacy: {legacy_s * 1000:8.1f} ms")
+    print(f"shared: {new_s * 1000:8.1f} ms  ({legacy_s / new_s:.1f}x faster)")
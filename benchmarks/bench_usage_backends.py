@@ -0,0 +1,64 @@
+# Summarise a claims-like dataset per client within its premium periods with
+# the pandas backend and with the DuckDB backend (first call loads the table
+# into the DuckDB file, later calls only run the query) and check that both
+# return the same frame. Run from the repository root:
+#
+#     python benchmarks/bench_usage_backends.py [rows]
+import os
+import sys
+import tempfile
+import timeit
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+sys.path.insert(0, os.path.join(os.getcwd(), "benchmarks"))
+workdir = tempfile.mkdtemp()
+os.environ["LOSS_RATIO_DUCKDB_PATH"] = os.path.join(workdir, "bench.duckdb")
+
+import duckdb_backend
+import usage
+from bench_filter_index import make_claims
+from dtype_plan import compact
+
+COLUMNS = ["Claim ID", "Employer Name", "Claim Created Date", "Claim Amount", "Approved Claim Amount"]
+
+
+# Function to build a registry and two yearly premium periods per employer
+def make_premiums(clients):
+    spellings = pd.Index([f"EMPLOYER {i}" for i in range(clients)])
+    registry = {"names": spellings, "spellings": spellings, "ids": np.arange(clients), "datasets": {}}
+    df_premiums = pd.DataFrame({
+        "client_id": np.tile(np.arange(clients), 2),
+        "Start Date": pd.to_datetime(np.repeat(["2023-01-01", "2024-01-01"], clients)),
+        "End Date": pd.to_datetime(np.repeat(["2023-12-31", "2024-12-31"], clients)),
+    })
+    return df_premiums, registry
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 2_000_000
+    df = make_claims(rows)
+    df["Claim ID"] = df.index.to_numpy()
+    df["Claim Amount"] = df["Claim Amount"].round().astype("int64")
+    df["Approved Claim Amount"] = (df["Claim Amount"] * 0.8).round().astype("int64")
+    df = compact(df[COLUMNS])
+    df_premiums, registry = make_premiums(2000)
+
+    # Serve the synthetic frame instead of the workbook datasets
+    usage.get_dataset = lambda name, columns=None: df.copy()
+    duckdb_backend.read_dataset = lambda name, columns=None: df.copy()
+    duckdb_backend.dataset_version = lambda name: rows
+
+    run_pandas = lambda: usage._usage_pandas("claims", COLUMNS, df_premiums, registry)
+    run_duckdb = lambda: duckdb_backend.usage_duckdb("claims", *usage.USAGE["claims"], df_premiums, registry)
+    load_s = timeit.timeit(run_duckdb, number=1)
+    pd.testing.assert_frame_equal(run_pandas(), run_duckdb())
+
+    pandas_s = min(timeit.repeat(run_pandas, number=1, repeat=3))
+    duckdb_s = min(timeit.repeat(run_duckdb, number=1, repeat=3))
+    print(f"rows: {rows:,}  result rows: {len(run_pandas()):,}")
+    print(f"pandas join + groupby:       {pandas_s * 1000:8.1f} ms")
+    print(f"duckdb first call (load):    {load_s * 1000:8.1f} ms")
+    print(f"duckdb query (table loaded): {duckdb_s * 1000:8.1f} ms  ({pandas_s / duckdb_s:.1f}x faster)")
@@ -0,0 +1,47 @@
+# Parse every sheet of a multi-sheet workbook with one pd.read_excel call per
+# sheet (the workbook is opened again each time) and through the cache loader,
+# which opens it once for all of them. The cache is cleared before each run.
+# Run from the repository root:
+#
+#     python benchmarks/bench_workbook_open.py [rows per sheet] [sheets]
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.getcwd())
+sys.path.insert(0, os.path.join(os.getcwd(), "benchmarks"))
+workdir = tempfile.mkdtemp()
+os.environ["LOSS_RATIO_CACHE_DIR"] = os.path.join(workdir, "cache")
+
+from bench_ingest import make_workbook
+from excel_cache import clear_cache, iter_sheets_cached
+
+
+if __name__ == "__main__":
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    sheets = [f"{2020 + i} claims" for i in range(int(sys.argv[2]) if len(sys.argv) > 2 else 4)]
+    path = os.path.join(workdir, "claims.xlsx")
+    make_workbook(path, sheets, rows)
+
+    start = time.perf_counter()
+    per_sheet = [pd.read_excel(path, sheet_name=sheet) for sheet in sheets]
+    per_sheet_s = time.perf_counter() - start
+
+    clear_cache()
+    start = time.perf_counter()
+    opened_once = list(iter_sheets_cached(path, sheets))
+    opened_once_s = time.perf_counter() - start
+    assert all(len(a) == len(b) for a, b in zip(per_sheet, opened_once)), "sheets differ"
+
+    # Projection is served from the cached copy
+    start = time.perf_counter()
+    projected = list(iter_sheets_cached(path, sheets, [["Claim ID", "Claim Amount"]] * len(sheets)))
+    projected_s = time.perf_counter() - start
+
+    print(f"{len(sheets)} sheets x {rows:,} rows")
+    print(f"read_excel per sheet:       {per_sheet_s:8.2f} s")
+    print(f"workbook opened once:       {opened_once_s:8.2f} s  ({per_sheet_s / opened_once_s:.2f}x)")
+    print(f"cached, two columns a sheet: {projected_s * 1000:7.1f} ms  ({projected[0].shape[1]} columns)")
@@ -0,0 +1,121 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from data_store import DATASETS, get_datasets, get_derived
+
+
+# Column holding the client name in each dataset that refers to clients
+CLIENT_COLUMNS = {"premiums": "Client Name", "visits": "Client Name", "claims": "Employer Name"}
+
+# Optional JSON file with the name rules:
+#   {"normalization": ["strip", "collapse_spaces", "upper"],
+#    "aliases": {"CANONICAL NAME": ["other spelling", ...]}}
+CLIENT_RULES_FILE = os.environ.get("LOSS_RATIO_CLIENT_RULES", "client_rules.json")
+
+# Normalization steps applied, in order, when the rules file does not list any
+DEFAULT_NORMALIZATION = ["strip", "collapse_spaces", "upper"]
+
+# Available normalization steps, each applied to a Series of spellings
+NORMALIZERS = {
+    "strip": lambda names: names.str.strip(),
+    "collapse_spaces": lambda names: names.str.replace(r"\s+", " ", regex=True),
+    "upper": lambda names: names.str.upper(),
+    "lower": lambda names: names.str.lower(),
+    "drop_punctuation": lambda names: names.str.replace(r"[^\w\s&]", "", regex=True),
+}
+
+
+# Function to read the normalization steps and aliases from the rules file
+def load_client_rules(path=CLIENT_RULES_FILE):
+    rules = {}
+    if os.path.exists(path):
+        with open(path) as fh:
+            rules = json.load(fh)
+    return rules.get("normalization", DEFAULT_NORMALIZATION), rules.get("aliases", {})
+
+
+# Function to normalize a Series of client spellings with the given steps
+def normalize_names(names, steps):
+    names = names.astype(str)
+    for step in steps:
+        names = NORMALIZERS[step](names)
+    return names
+
+
+# Function to build the client registry from every raw spelling in the source
+# datasets: each normalized name (after aliases) gets an integer client_id, in
+# name order. The registry holds the canonical names by id, the raw spellings
+# with their ids, and the ids seen in each dataset. Missing or blank names get
+# no id (-1).
+def build_client_registry(sources, rules_version=None):
+    steps, aliases = load_client_rules()
+    frames = dict(zip(sources, get_datasets(*sources, columns={name: [CLIENT_COLUMNS[name]] for name in sources})))
+    spellings = {name: pd.unique(frames[name][CLIENT_COLUMNS[name]].dropna().astype(object)) for name in sources}
+    raw = pd.Index(pd.unique(np.concatenate([np.asarray(values, dtype=object) for values in spellings.values()] or [np.array([], dtype=object)])))
+
+    normalized = normalize_names(pd.Series(raw, dtype=object), steps)
+    alias_names = {}
+    for canonical, others in aliases.items():
+        target = normalize_names(pd.Series([canonical]), steps).iloc[0]
+        for spelling in normalize_names(pd.Series(others, dtype=object), steps):
+            alias_names[spelling] = target
+    normalized = normalized.map(alias_names).fillna(normalized)
+    normalized = normalized.where(normalized != "")
+
+    ids, names = pd.factorize(normalized, sort=True)
+    registry = {"names": pd.Index(names), "spellings": raw, "ids": ids, "datasets": {}}
+    for name, values in spellings.items():
+        present = client_ids(registry, values)
+        registry["datasets"][name] = np.unique(present[present >= 0])
+    return registry
+
+
+# Function to get what the client registry is built from: the source
+# datasets present and the version of the rules file. A derived value holding
+# client_ids is kept on the same sources and rules version, so it is rebuilt
+# whenever the registry is.
+def registry_inputs():
+    sources = tuple(name for name in CLIENT_COLUMNS if os.path.exists(DATASETS[name][0]))
+    rules_version = os.stat(CLIENT_RULES_FILE).st_mtime_ns if os.path.exists(CLIENT_RULES_FILE) else None
+    return sources, rules_version
+
+
+# Function to get the client registry of the current data, rebuilt once per
+# refresh of any source dataset or of the rules file
+def get_client_registry():
+    sources, rules_version = registry_inputs()
+    return get_derived("client_registry", build_client_registry, sources=sources, params=(sources, rules_version))
+
+
+# Function to map raw client spellings to their client_id (-1 when missing or
+# unknown). Categorical columns are looked up once per category.
+def client_ids(registry, values):
+    values = pd.Series(values)
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        category_ids = client_ids(registry, values.cat.categories)
+        codes = values.cat.codes.to_numpy()
+        return np.where(codes >= 0, category_ids[codes], -1)
+    positions = registry["spellings"].get_indexer(values.astype(object))
+    return np.where(positions >= 0, registry["ids"][positions], -1)
+
+
+# Function to get the canonical client names of client ids (NaN for -1)
+def canonical_names(registry, ids):
+    ids = np.asarray(ids)
+    names = registry["names"].to_numpy(dtype=object)
+    return np.where(ids >= 0, names[np.maximum(ids, 0)] if len(names) else np.nan, np.nan)
+
+
+# Function to list the clients of a dataset that have no record in the
+# reference dataset, with the raw spellings they were seen under
+def unmatched_clients(registry, dataset, reference="premiums"):
+    seen = registry["datasets"].get(dataset, np.array([], dtype=np.int64))
+    missing = np.setdiff1d(seen, registry["datasets"].get(reference, np.array([], dtype=np.int64)))
+    spellings = pd.Series(registry["spellings"], dtype=object).groupby(registry["ids"]).agg(lambda names: ", ".join(map(str, names)))
+    return pd.DataFrame({
+        "Client Name": canonical_names(registry, missing),
+        "Spellings": spellings.reindex(missing).to_numpy(),
+    })
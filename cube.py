@@ -0,0 +1,55 @@
+import numpy as np
+import pandas as pd
+
+
+# Keys of the aggregate cube: the grain every KPI card and Year / Month / Cover Type
+# chart on the loss pages is answered at
+CUBE_KEYS = ["Client Name", "Year", "Month", "Cover Type", "Product"]
+
+# Measures that are also averaged, so the cube keeps how many rows had a value
+AVERAGED = ["Total", "Days Since Start"]
+
+
+# Function to build the aggregate cube of a page frame: one row per client,
+# year, month, cover type and product with the summed measures, the number of
+# rows ('Rows') and the number of non-missing values of each averaged measure.
+# Year and Month are normalised the way the pages label them (0 / 'Unknown');
+# the frame must already carry its 'Period' key (see periods.add_period).
+def build_cube(df, measures):
+    frame = pd.DataFrame({
+        "Client Name": df["Client Name"].to_numpy(),
+        "Year": df["Year"].fillna(0).astype(int).to_numpy(),
+        "Month": df["Month"].fillna("Unknown").to_numpy(),
+        "Cover Type": df["Cover Type"].to_numpy(),
+        "Product": df["Product"].to_numpy() if "Product" in df.columns else np.nan,
+        "Period": df["Period"].to_numpy(),
+        "Rows": df["Client Name"].notna().to_numpy().astype(np.int64),
+    })
+    for measure in measures:
+        frame[measure] = df[measure].to_numpy()
+    for measure in AVERAGED:
+        frame[measure + " count"] = df[measure].notna().to_numpy().astype(np.int64)
+
+    # Period follows from Year and Month, so grouping on it as well adds no rows
+    return frame.groupby(CUBE_KEYS + ["Period"], dropna=False, sort=False).sum().reset_index()
+
+
+# Function to slice the cube with the page filters. month_range is the pair of
+# period keys picked on the Month-Year slider, both inclusive.
+def slice_cube(cube, cover=None, product=None, client_name=None, month_range=None):
+    keep = np.ones(len(cube), dtype=bool)
+    if cover:
+        keep &= cube["Cover Type"].isin(cover).to_numpy()
+    if product:
+        keep &= cube["Product"].isin(product).to_numpy()
+    if client_name:
+        keep &= cube["Client Name"].isin(client_name).to_numpy()
+    if month_range:
+        keep &= cube["Period"].between(*month_range).to_numpy()
+    return cube[keep]
+
+
+# Function to get the mean of a measure over the rows summarised by a cube slice
+def cube_mean(cube, measure):
+    count = cube[measure + " count"].sum()
+    return cube[measure].sum() / count if count else np.nan
@@ -0,0 +1,313 @@
+import hashlib
+import logging
+import os
+import threading
+from collections import OrderedDict
+from datetime import date
+
+import numpy as np
+import pandas as pd
+
+from dtype_plan import compact, memory_report
+from excel_cache import sheet_manifest
+from ingest import read_sheets, timing_report
+
+logger = logging.getLogger(__name__)
+
+
+# Frames handed out by the store are shallow copies of one shared frame. With
+# copy-on-write a page that assigns or drops columns only changes its own copy.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+
+# Source workbooks and the sheets that make up each dataset
+DATASETS = {
+    "premiums": ("JAN-NOV 2024 GWP.xlsx", ["2023", "2024"]),
+    "visits": ("VisitLogs_25Oct2024 (1).xlsx", [0]),
+    "claims": ("Claims.xlsx", ["2023 claims", "2024 claims"]),
+    "written_premium": ("WRITTEN PREMIUM 2024 (1).xlsx", [0]),
+}
+
+# Datasets whose sheets only ever get rows appended, with the ID column new
+# rows are recognised by (IDs above every one already read): a refresh parses
+# only the appended rows (see excel_cache). LOSS_RATIO_INCREMENTAL_INGEST=0
+# always parses sheets in full.
+APPEND_KEYS = {"claims": "Claim ID"}
+INCREMENTAL_INGEST = os.environ.get("LOSS_RATIO_INCREMENTAL_INGEST", "1") != "0"
+
+# Memory budget of the filtered-frame cache shared by all sessions
+FILTER_CACHE_BYTES = int(os.environ.get("LOSS_RATIO_FILTER_CACHE_MB", "256")) * 1024 * 1024
+
+# Values kept per derived name (one per source versions and parameters, such
+# as the default as-of date and others picked), least recently used dropped first
+DERIVED_ENTRIES = int(os.environ.get("LOSS_RATIO_DERIVED_ENTRIES", "4"))
+
+_frames = {}
+_derived = OrderedDict()
+_derived_sources = {}
+_filtered = OrderedDict()
+_filtered_bytes = 0
+_locks = {name: threading.Lock() for name in DATASETS}
+_derived_lock = threading.RLock()
+_derived_entries_lock = threading.Lock()
+_filtered_lock = threading.Lock()
+_generations = dict.fromkeys(DATASETS, 0)
+
+
+# Function to describe the current version of a dataset
+def dataset_version(name):
+    filepath, _ = DATASETS[name]
+    stat = os.stat(filepath)
+    return (_generations[name], stat.st_size, stat.st_mtime_ns)
+
+
+# Function to get the date of the last data refresh: the day the most
+# recently written source workbook was saved. Pages count their measures to
+# it unless another as-of date is picked.
+def refresh_date():
+    mtimes = [os.stat(filepath).st_mtime for filepath, _ in DATASETS.values() if os.path.exists(filepath)]
+    return pd.Timestamp(date.fromtimestamp(max(mtimes)) if mtimes else date.today())
+
+
+# Function to read every sheet of the given (dataset, columns) keys (in
+# parallel, see ingest.read_sheets), stack each dataset's sheets and store the
+# result with compact dtypes (see dtype_plan), logging the memory it took
+# before and after
+def _load_many(keys):
+    jobs = [(DATASETS[name][0], sheet, columns and list(columns)) for name, columns in keys for sheet in DATASETS[name][1]]
+    append_keys = {DATASETS[name][0]: APPEND_KEYS[name] for name, _ in keys if INCREMENTAL_INGEST and name in APPEND_KEYS}
+    frames, timings = read_sheets(jobs, append_keys=append_keys)
+    for timing in timings:
+        logger.info(timing_report(timing))
+
+    loaded = {}
+    for name, columns in keys:
+        sheets = [frames.pop(0) for _ in DATASETS[name][1]]
+        df = sheets[0] if len(sheets) == 1 else pd.concat(sheets)
+        loaded[(name, columns)] = compact(df)
+        logger.info(memory_report(name, df, loaded[(name, columns)]))
+    return loaded
+
+
+# Function to describe the last refresh of a dataset whose sheets only had
+# rows appended: the workbook digest before ('from') and now ('to'), its row
+# count and the positions of the appended rows in the stacked dataset. None
+# when a sheet was parsed in full or is not cached yet.
+def dataset_delta(name):
+    filepath, sheets = DATASETS[name]
+    manifests = [sheet_manifest(filepath, sheet) for sheet in sheets]
+    if any(manifest is None or not manifest.get("appended") for manifest in manifests):
+        return None
+    if len({(manifest["appended"]["from_sha256"], manifest["sha256"]) for manifest in manifests}) != 1:
+        return None
+    offsets = np.cumsum([0] + [manifest["rows"] for manifest in manifests])
+    positions = np.concatenate([np.arange(offset + manifest["appended"]["rows_before"], offset + manifest["rows"])
+                                for offset, manifest in zip(offsets, manifests)])
+    return {"from": manifests[0]["appended"]["from_sha256"], "to": manifests[0]["sha256"],
+            "rows": int(offsets[-1]), "positions": positions}
+
+
+# Function to get the digest of the workbook a dataset was last read from
+# (None when it is not cached yet)
+def dataset_digest(name):
+    filepath, sheets = DATASETS[name]
+    manifest = sheet_manifest(filepath, sheets[0])
+    return manifest and manifest["sha256"]
+
+
+# Function to hand out a shared value without letting callers modify it
+def _share(value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=False)
+    if isinstance(value, tuple):
+        return tuple(_share(item) for item in value)
+    return value
+
+
+# Function to check whether the stored entry of a dataset can serve a request
+# for the given columns (None for all of them) at the given version
+def _serves(entry, version, columns):
+    if entry is None or entry[0] != version:
+        return False
+    return entry[1] is None or (columns is not None and columns <= entry[1])
+
+
+# Function to get the columns to load a dataset with: those of its stored
+# entry together with the requested ones, so callers asking for different
+# columns do not push each other out (None for all of them)
+def _widened(entry, columns):
+    if entry is None:
+        return columns
+    if entry[1] is None or columns is None:
+        return None
+    return entry[1] | columns
+
+
+# Function to keep the requested columns of a stored frame, in sheet order. A
+# column the dataset does not have fails, as it does when loading.
+def _project(name, df, columns):
+    if columns is None or len(columns) == len(df.columns):
+        return df
+    missing = sorted(columns.difference(df.columns))
+    if missing:
+        raise ValueError(f"{name} has no column(s) {missing}; it has {list(df.columns)}")
+    return df[[column for column in df.columns if column in columns]]
+
+
+# Function to get several datasets, loading each at most once per server
+# process. columns optionally maps a dataset to the columns the caller needs:
+# only those are read (in sheet order), and a sheet without one of them fails
+# the load. The store holds one frame per dataset with every column asked for
+# so far and hands out the requested ones; asking for a column it does not
+# hold reloads the dataset with it added. Datasets that are missing or out of
+# date are loaded together, so all of their sheets are parsed at the same time.
+def get_datasets(*names, columns=None):
+    wanted = {name: frozenset(columns[name]) if columns and name in columns else None for name in names}
+    versions = {name: dataset_version(name) for name in wanted}
+    entries = {name: _frames.get(name) for name in wanted}
+    stale = sorted(name for name in wanted if not _serves(entries[name], versions[name], wanted[name]))
+    if stale:
+        locks = [_locks[name] for name in stale]
+        for lock in locks:
+            lock.acquire()
+        try:
+            entries.update((name, _frames.get(name)) for name in stale)
+            stale = [name for name in stale if not _serves(entries[name], versions[name], wanted[name])]
+            if stale:
+                loading = {name: _widened(entries[name], wanted[name]) for name in stale}
+                keys = [(name, loading[name] and tuple(sorted(loading[name]))) for name in stale]
+                for (name, _), df in _load_many(keys).items():
+                    entries[name] = _frames[name] = (versions[name], loading[name], df)
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+    return tuple(_share(_project(name, entries[name][2], wanted[name])) for name in names)
+
+
+# Function to get a dataset, loading it at most once per server process
+def get_dataset(name, columns=None):
+    return get_datasets(name, columns=columns and {name: columns})[0]
+
+
+# Function to read a dataset without keeping it in the store, for callers
+# that keep their own copy of the data (such as the DuckDB backend)
+def read_dataset(name, columns=None):
+    key = (name, tuple(sorted(columns)) if columns else None)
+    with _locks[name]:
+        return _load_many([key])[key]
+
+
+# Function to build the key a derived value is kept under: its name, the
+# versions of the datasets it is computed from and its parameters
+def _derived_key(name, sources, params):
+    return (name, tuple(dataset_version(source) for source in sources), params)
+
+
+# Function to get a value computed from datasets, rebuilt only when a source
+# dataset or one of the parameters changes. The DERIVED_ENTRIES most recently
+# used values of every name are kept, so a session picking other parameters
+# does not push out the value the other sessions use.
+def get_derived(name, build, sources, params=()):
+    key = _derived_key(name, sources, params)
+    _derived_sources[name] = sources
+    with _derived_entries_lock:
+        found = key in _derived
+        if found:
+            _derived.move_to_end(key)
+            value = _derived[key]
+    if not found:
+        with _derived_lock:
+            with _derived_entries_lock:
+                found = key in _derived
+                value = _derived.get(key)
+            if not found:
+                value = build(*params)
+                with _derived_entries_lock:
+                    _derived[key] = value
+                    for evicted in [other for other in _derived if other[0] == name][:-DERIVED_ENTRIES]:
+                        del _derived[evicted]
+    return _share(value)
+
+
+# Function to put a filter state in canonical form: the order in which values
+# were picked in a multiselect does not change the filter, dates compare by day
+def _canonical(value):
+    if isinstance(value, dict):
+        return tuple(sorted((str(key), _canonical(item)) for key, item in value.items()))
+    if isinstance(value, (list, set, frozenset)):
+        return tuple(sorted((_canonical(item) for item in value), key=repr))
+    if isinstance(value, tuple):
+        return tuple(_canonical(item) for item in value)
+    if isinstance(value, (pd.Timestamp, date)):
+        return pd.Timestamp(value).isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+# Function to hash a filter state
+def filter_state_key(state):
+    return hashlib.sha1(repr(_canonical(state)).encode()).hexdigest()
+
+
+# Function to estimate the memory held by a cached value. Object columns are
+# counted by their pointers only: a filtered frame shares its strings with the
+# frame it was taken from.
+def _nbytes(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=False).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=False))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, tuple):
+        return sum(_nbytes(item) for item in value)
+    return 0
+
+
+# Function to get a filtered view of a derived value, memoized per filter state.
+# params are those the derived value was got with (see get_derived). The key
+# combines the derived value's own key (source dataset versions and
+# parameters) with a hash of the filter state, so a data refresh never serves
+# stale rows. Least recently used entries are evicted beyond FILTER_CACHE_BYTES.
+def get_filtered(name, state, build, params=()):
+    global _filtered_bytes
+    sources = _derived_sources.get(name)
+    if sources is None:
+        return build()
+    derived = _derived_key(name, sources, params)
+    with _derived_entries_lock:
+        if derived not in _derived:
+            return build()
+    key = (derived, filter_state_key(state))
+    with _filtered_lock:
+        entry = _filtered.get(key)
+        if entry is not None:
+            _filtered.move_to_end(key)
+            return _share(entry[1])
+
+    value = build()
+    size = _nbytes(value)
+    if size <= FILTER_CACHE_BYTES:
+        with _filtered_lock:
+            if key not in _filtered:
+                _filtered[key] = (size, value)
+                _filtered_bytes += size
+            while _filtered_bytes > FILTER_CACHE_BYTES:
+                _, (evicted, _) = _filtered.popitem(last=False)
+                _filtered_bytes -= evicted
+    return _share(value)
+
+
+# Function to drop loaded datasets so the next request reads them again
+def invalidate(name=None):
+    global _filtered_bytes
+    for dataset in ([name] if name else list(DATASETS)):
+        _generations[dataset] += 1
+        _frames.pop(dataset, None)
+    with _derived_entries_lock:
+        _derived.clear()
+    with _filtered_lock:
+        _filtered.clear()
+        _filtered_bytes = 0
@@ -0,0 +1,53 @@
+import numpy as np
+import pandas as pd
+
+
+# Text columns with few distinct values repeated over many rows, stored as
+# categoricals (integer codes plus one copy of each distinct string)
+CATEGORICAL_COLUMNS = ["Client Name", "Employer Name", "Provider Name", "Diagnosis", "ICD-10 Code",
+                       "Cover Type", "Product", "Visit Type", "Visit Status", "Claim Type",
+                       "Claim Status", "Source"]
+
+# Integer identifier columns, only ever compared and matched, never added up or
+# multiplied, so they can be stored in the smallest integer type holding them
+ID_COLUMNS = ["Claim ID", "Visit ID"]
+
+# Smallest integer types tried, in order
+INTEGER_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+
+# Function to work out the compact dtype of every column of a freshly read
+# dataset: listed text columns become categoricals and listed identifier
+# columns the smallest integer type holding their range. Amounts, counts and
+# calendar fields keep int64 / float64, so page arithmetic on them (year * 100,
+# premium * days) cannot overflow and float sums do not lose precision.
+def dtype_plan(df):
+    plan = {}
+    for column in df.columns:
+        values = df[column]
+        numpy_integer = pd.api.types.is_integer_dtype(values.dtype) and not pd.api.types.is_extension_array_dtype(values.dtype)
+        if column in CATEGORICAL_COLUMNS and values.dtype == object:
+            plan[column] = "category"
+        elif column in ID_COLUMNS and numpy_integer:
+            low, high = (values.min(), values.max()) if len(values) else (0, 0)
+            for integer_type in INTEGER_TYPES:
+                info = np.iinfo(integer_type)
+                if info.min <= low and high <= info.max:
+                    if integer_type != values.dtype:
+                        plan[column] = integer_type
+                    break
+    return plan
+
+
+# Function to apply the dtype plan to a dataset
+def compact(df):
+    plan = dtype_plan(df)
+    return df.astype(plan) if plan else df
+
+
+# Function to describe the memory of a dataset before and after compacting it
+def memory_report(name, before, after):
+    before_bytes = before.memory_usage(index=True, deep=True).sum()
+    after_bytes = after.memory_usage(index=True, deep=True).sum()
+    return (f"{name}: {len(after):,} rows, {before_bytes / 2**20:.1f} MB -> {after_bytes / 2**20:.1f} MB"
+            f" ({1 - after_bytes / max(before_bytes, 1):.0%} smaller)")
@@ -0,0 +1,124 @@
+import json
+import logging
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+
+# Optional backend for the visit / claim joins (see usage.BACKEND): install
+# it with pip install duckdb (commented out in requirements.txt) and turn it
+# on with LOSS_RATIO_BACKEND=duckdb. Without it the pandas backend runs them.
+try:
+    import duckdb
+except ImportError:
+    duckdb = None
+
+from data_store import dataset_delta, dataset_digest, dataset_version, read_dataset
+
+logger = logging.getLogger(__name__)
+
+
+# Local DuckDB file holding the usage datasets
+DUCKDB_PATH = os.environ.get("LOSS_RATIO_DUCKDB_PATH", ".loss_ratio.duckdb")
+
+_connection = None
+_lock = threading.Lock()
+
+
+# Function to open the DuckDB file once per server process
+def _connect():
+    global _connection
+    if duckdb is None:
+        raise ImportError("LOSS_RATIO_BACKEND=duckdb needs the duckdb package (pip install duckdb)")
+    if _connection is None:
+        _connection = duckdb.connect(DUCKDB_PATH)
+        _connection.execute("CREATE TABLE IF NOT EXISTS loaded_versions (name VARCHAR PRIMARY KEY, version VARCHAR)")
+    return _connection
+
+
+# Function to (re)load a dataset into its DuckDB table when the workbook
+# changed since it was last loaded. The table holds the columns the backend
+# queries (the same for every caller), so the dataset passes through pandas
+# once per version; the store does not keep it. When the
+# workbook's last refresh only appended rows to the version in the table
+# (see data_store.dataset_delta), only those rows are inserted. Category
+# columns are stored as text so appended rows can bring new values.
+def _sync_table(con, name, columns, date_column):
+    version = repr(dataset_version(name))
+    loaded = con.execute("SELECT version FROM loaded_versions WHERE name = ?", [name]).fetchone()
+    try:
+        loaded = json.loads(loaded[0]) if loaded is not None else None
+    except ValueError:
+        loaded = None
+    if loaded is not None and loaded["version"] == version:
+        return
+    df = read_dataset(name, columns=columns)
+    df[date_column] = pd.to_datetime(df[date_column], errors='coerce')
+    delta = dataset_delta(name)
+    as_text = [f'CAST("{column}" AS VARCHAR) AS "{column}"' for column in df.columns if isinstance(df[column].dtype, pd.CategoricalDtype)]
+    select = f"SELECT * REPLACE ({', '.join(as_text)}) FROM incoming" if as_text else "SELECT * FROM incoming"
+
+    append = (delta is not None and loaded is not None and loaded["columns"] == sorted(columns)
+              and loaded["sha256"] == delta["from"] and len(df) == delta["rows"]
+              and con.execute(f'SELECT count(*) FROM "{name}"').fetchone()[0] == delta["rows"] - len(delta["positions"]))
+    con.register("incoming", df.iloc[delta["positions"]] if append else df)
+    if append:
+        con.execute(f'INSERT INTO "{name}" {select}')
+    else:
+        con.execute(f'CREATE OR REPLACE TABLE "{name}" AS {select}')
+    con.unregister("incoming")
+    logger.info("%s: %s DuckDB table", name, f"{len(delta['positions'])} rows appended to the" if append else "reloaded the")
+    loaded = {"version": version, "columns": sorted(columns), "sha256": delta["to"] if append else dataset_digest(name)}
+    con.execute("INSERT OR REPLACE INTO loaded_versions VALUES (?, ?)", [name, json.dumps(loaded)])
+
+
+# Function to summarise a usage dataset per client in DuckDB: the same result
+# as the pandas backend (usage._usage_pandas), computed by one SQL join of the
+# events to the client registry spellings and to the premium periods that
+# cover each event date, grouped per client_id. Only the per-client result
+# comes back.
+def usage_duckdb(name, client_column, date_column, measures, df_premiums, registry):
+    columns = [client_column, date_column] + [column for column, _ in measures]
+    spellings = pd.DataFrame({"spelling": pd.Index(registry["spellings"]).astype(str), "client_id": registry["ids"]})
+    periods = pd.DataFrame({
+        "client_id": df_premiums["client_id"].to_numpy(),
+        "start_date": pd.to_datetime(df_premiums["Start Date"]).to_numpy(),
+        "end_date": pd.to_datetime(df_premiums["End Date"]).to_numpy(),
+    })
+    selects = [f'{aggregation}(e."{column}") AS "{column} {aggregation}"' for column, aggregation in measures]
+    query = f'''
+        SELECT s.client_id, {", ".join(selects)},
+               min(e."{date_column}") AS "{date_column} min", max(e."{date_column}") AS "{date_column} max"
+        FROM "{name}" e
+        JOIN spellings s ON CAST(e."{client_column}" AS VARCHAR) = s.spelling
+        JOIN periods p ON p.client_id = s.client_id
+             AND e."{date_column}" BETWEEN p.start_date AND p.end_date
+        WHERE s.client_id >= 0
+        GROUP BY s.client_id
+        ORDER BY s.client_id
+    '''
+
+    with _lock:
+        con = _connect()
+        _sync_table(con, name, columns, date_column)
+        types = dict(con.execute(f'SELECT column_name, column_type FROM (DESCRIBE "{name}")').fetchall())
+        con.register("spellings", spellings)
+        con.register("periods", periods)
+        try:
+            df_usage = con.execute(query).fetchdf()
+        finally:
+            con.unregister("spellings")
+            con.unregister("periods")
+
+    # Same dtypes as pandas: integer sums stay integers, dates are ns datetimes
+    for column, aggregation in measures:
+        if aggregation == "sum":
+            is_integer = types[column] in ("TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT")
+            df_usage[f"{column} sum"] = df_usage[f"{column} sum"].fillna(0).astype(np.int64 if is_integer else np.float64)
+        else:
+            df_usage[f"{column} {aggregation}"] = df_usage[f"{column} {aggregation}"].astype(np.int64)
+    for suffix in ("min", "max"):
+        df_usage[f"{date_column} {suffix}"] = pd.to_datetime(df_usage[f"{date_column} {suffix}"]).astype("datetime64[ns]")
+    df_usage["client_id"] = df_usage["client_id"].astype(registry["ids"].dtype)
+    return df_usage
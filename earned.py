@@ -0,0 +1,91 @@
+import numpy as np
+import pandas as pd
+
+
+# Function to get dates as whole days since the epoch (float, NaN where the
+# date is missing or not a date)
+def _days(values):
+    days = pd.to_datetime(pd.Series(values), errors="coerce").to_numpy(dtype="datetime64[ns]").astype("datetime64[D]")
+    result = days.astype(np.int64).astype(float)
+    result[np.isnat(days)] = np.nan
+    return result
+
+
+# Function to compute the share of its premium a policy covering start to end
+# (whole days) has earned by day: the days of cover gone by over the days of
+# cover, nothing before the start and all of it from the end on. With
+# days a row of several days, gives a row of shares per policy.
+def _earned_share(start, end, days):
+    elapsed = days - start
+    cover = end - start
+    with np.errstate(invalid="ignore", divide="ignore"):
+        share = np.where(cover > 0, np.clip(elapsed / cover, 0.0, 1.0), (elapsed >= 0).astype(float))
+    share[np.isnan(elapsed) | np.isnan(cover)] = np.nan
+    return share
+
+
+# Function to compute the premium each policy has earned by as_of, pro rata to
+# the days of its cover gone by: premium * (as_of - start) / (end - start),
+# nothing before the start and the full premium from the end on. A policy
+# whose end is not after its start is earned in full on its start day.
+# Policies missing a date or a premium give NaN.
+def policy_earned_premium(premiums, starts, ends, as_of):
+    premiums = np.asarray(premiums, dtype=float)
+    return premiums * _earned_share(_days(starts), _days(ends), _days([as_of])[0])
+
+
+# Function to compute the premium each policy earns in every month from the
+# month of first to the month of as_of: what it has earned by the start of the
+# next month (as policy_earned_premium counts it) less what it had earned by
+# the start of the month, the last month counted to as_of. Whatever was
+# earned before the second month counts in the first, so a policy's months
+# add up to what it has earned by as_of. Policies missing a date or a premium
+# earn NaN. Returns an array of policies x months.
+def monthly_earned_premium(premiums, starts, ends, first, as_of):
+    premiums = np.asarray(premiums, dtype=float)
+    months = pd.period_range(pd.Timestamp(first), pd.Timestamp(as_of), freq="M")
+    if not len(months):
+        return np.zeros((len(premiums), 0))
+    days = np.append(_days(months[1:].start_time), _days([as_of]))
+    earned = premiums[:, None] * _earned_share(_days(starts)[:, None], _days(ends)[:, None], days[None, :])
+    return np.diff(earned, axis=1, prepend=0.0)
+
+
+# Function to compute the premium earned by all policies together on every
+# day from first to last (both included), each day as policy_earned_premium
+# sums it for that as-of date. Every policy adds its daily rate to a
+# difference array on its start day and takes it off on its end day (policies
+# earned in one go add a step instead), so two cumulative sums give the whole
+# curve without a pass over the days; what was earned before first is the
+# starting value. Policies missing a date or a premium are left out.
+# Returns a Series of earned premium indexed by day.
+def earned_premium_curve(premiums, starts, ends, first, last):
+    days = pd.date_range(pd.Timestamp(first).normalize(), pd.Timestamp(last).normalize(), freq="D", name="Date")
+    n = len(days)
+    premiums = np.asarray(premiums, dtype=float)
+    origin = _days([days[0]])[0] if n else 0.0
+    start, end = _days(starts) - origin, _days(ends) - origin
+    known = ~(np.isnan(premiums) | np.isnan(start) | np.isnan(end))
+    premiums, start, end = premiums[known], start[known], end[known]
+    cover = end - start
+    spread = cover > 0
+
+    # Earned by day 0: policies started before first, as far as they got
+    earned_before = (np.sum(premiums[spread] * np.clip(-start[spread] / cover[spread], 0.0, 1.0))
+                     + premiums[~spread & (start <= 0)].sum())
+
+    # Daily rate switched on at the start day and off at the end day (both
+    # clipped to the range); one-go policies step up on their start day
+    rates = premiums[spread] / cover[spread]
+    switch_on = np.clip(start[spread], 0, n).astype(np.int64)
+    switch_off = np.clip(end[spread], 0, n).astype(np.int64)
+    slope = (np.bincount(switch_on, weights=rates, minlength=n + 1)
+             - np.bincount(switch_off, weights=rates, minlength=n + 1))[:n]
+    steps = ~spread & (start > 0) & (start < n)
+    jumps = np.bincount(start[steps].astype(np.int64), weights=premiums[steps], minlength=n)[:n]
+
+    # Earning over day d shows from day d + 1 on
+    earned = np.full(n, earned_before)
+    earned[1:] += np.cumsum(np.cumsum(slope))[:-1]
+    earned += np.cumsum(jumps)
+    return pd.Series(earned, index=days, name="Earned Premium")
@@ -0,0 +1,266 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+from sheet_append import append_mark, read_appended_rows
+
+
+# Directory holding the columnar copies of the Excel workbooks
+CACHE_DIR = os.environ.get("LOSS_RATIO_CACHE_DIR", ".excel_cache")
+
+# Bump when the on-disk layout changes so old copies are rebuilt
+CACHE_FORMAT = 2
+
+
+# Function to compute the content hash of a workbook
+def file_digest(filepath, chunk_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(filepath, "rb") as fh:
+        for chunk in iter(lambda: fh.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# Function to build the cache file paths for one workbook sheet
+def _cache_paths(filepath, sheet_name):
+    key = f"{os.path.abspath(filepath)}::{sheet_name}"
+    stem = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    base = os.path.join(CACHE_DIR, stem)
+    return base + ".arrow", base + ".json"
+
+
+# Function to load the manifest describing a cached sheet
+def _read_manifest(manifest_path):
+    try:
+        with open(manifest_path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return None
+
+
+# Function to write a file atomically so readers never see a partial copy
+def _write_atomic(path, write):
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+# Function to store the manifest next to the cached sheet
+def _write_manifest(manifest_path, manifest):
+    def write(path):
+        with open(path, "w") as fh:
+            json.dump(manifest, fh, indent=2)
+    _write_atomic(manifest_path, write)
+
+
+# Function to render a mixed-type cell as text Arrow can store
+def _to_text(value):
+    if pd.isna(value):
+        return None
+    if isinstance(value, pd.Timestamp) or hasattr(value, "isoformat"):
+        value = pd.Timestamp(value)
+        if value == value.normalize():
+            return value.strftime("%Y-%m-%d")
+        return value.isoformat(sep=" ")
+    return str(value)
+
+
+# Function to make object columns storable in Arrow
+def _arrow_safe(df):
+    # Excel columns often mix dates, numbers and text in one column. Arrow needs
+    # a single type per column, so such columns are stored as text; the pages
+    # already run pd.to_datetime / pd.to_numeric on them after loading.
+    df = df.copy()
+    df.columns = [str(col) for col in df.columns]
+    for col in df.columns:
+        if df[col].dtype != object:
+            continue
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            df[col] = df[col].map(_to_text).astype(object)
+    return df
+
+
+# Function to check whether a cached copy still matches its workbook. digest
+# is the workbook's content hash when already computed, so the sheets of one
+# workbook hash it once between them. Returns whether the copy is fresh and
+# the content hash (None when size and mtime were enough to tell).
+def _is_fresh(manifest, stat, filepath, digest=None):
+    if manifest is None or manifest.get("format") != CACHE_FORMAT:
+        return False, None
+    if manifest["size"] == stat.st_size and manifest["mtime_ns"] == stat.st_mtime_ns:
+        return True, None
+    # Size or mtime moved (copy, touch, re-download): only the content hash decides
+    digest = digest or file_digest(filepath)
+    return manifest["sha256"] == digest, digest
+
+
+# Function to get the manifest of a sheet's cached copy (None when there is
+# none): the workbook digest it was read from, its row count and, when its
+# last refresh only appended rows, the digest and row count it had before
+# ('appended')
+def sheet_manifest(filepath, sheet_name=0):
+    return _read_manifest(_cache_paths(filepath, sheet_name)[1])
+
+
+# Function to check whether a sheet can be served from the columnar cache
+def is_cached(filepath, sheet_name=0):
+    data_path, manifest_path = _cache_paths(filepath, sheet_name)
+    fresh, _ = _is_fresh(_read_manifest(manifest_path), os.stat(filepath), filepath)
+    return fresh and os.path.exists(data_path)
+
+
+# Function to read a cached sheet, keeping only the given columns (None keeps
+# them all) in the order they have in the sheet. A column the sheet does not
+# have is an error, raised before any data is read.
+def _read_cached(data_path, filepath, sheet_name, columns):
+    if columns is not None:
+        with pa.memory_map(data_path) as source:
+            available = pa.ipc.open_file(source).schema.names
+        missing = [column for column in columns if column not in available]
+        if missing:
+            raise ValueError(f"{os.path.basename(filepath)} [{sheet_name}] has no column(s) {missing}; "
+                             f"it has {available}")
+        columns = [column for column in available if column in columns]
+    return pd.read_feather(data_path, columns=columns)
+
+
+# Function to check that rows appended to a cached column keep its kind of
+# values (numbers, dates, text...), so stacking them gives what parsing the
+# whole column would
+def _same_kind(cached, appended):
+    if cached.isna().all() or appended.isna().all():
+        return True
+    kinds = {cached.dtype.kind, appended.dtype.kind}
+    return len(kinds) == 1 or kinds <= set("iuf")
+
+
+# Function to describe how far an append-only sheet has been read: its
+# append mark (see sheet_append) and the highest ID seen. append_key is the
+# ID column; None when the sheet lacks it or its IDs cannot be ordered.
+def _append_state(df, filepath, sheet_name, append_key, mark=None):
+    if append_key not in df.columns:
+        return None
+    try:
+        id_max = df[append_key].max()
+    except TypeError:
+        return None
+    mark = mark or append_mark(filepath, sheet_name)
+    if mark is None:
+        return None
+    return {
+        "mark": mark,
+        "id_max": None if pd.isna(id_max) else (id_max.item() if hasattr(id_max, "item") else id_max),
+    }
+
+
+# Function to bring the cached copy of an append-only sheet up to date by
+# parsing only the rows appended to it since it was cached. Every appended
+# row must have an ID above the highest one already read. Returns the whole
+# sheet and its new append state, or None when the sheet changed in any other
+# way (edited or deleted rows, rows out of ID order, new columns...) and has
+# to be parsed in full.
+def _read_appended(filepath, sheet_name, data_path, manifest, append_key):
+    state = manifest.get("append")
+    if state is None:
+        return None
+    result = read_appended_rows(filepath, sheet_name, state["mark"])
+    if result is None:
+        return None
+    appended, mark = result
+    df = pd.read_feather(data_path)
+    if len(appended):
+        appended.columns = [str(col) for col in appended.columns]
+        if list(appended.columns) != list(df.columns):
+            return None
+        try:
+            in_order = state["id_max"] is None or bool((appended[append_key] > state["id_max"]).all())
+        except TypeError:
+            in_order = False
+        if not in_order or not all(_same_kind(df[col], appended[col]) for col in df.columns):
+            return None
+        df = pd.concat([df, appended], ignore_index=True)
+    return df, _append_state(df, filepath, sheet_name, append_key, mark)
+
+
+# Function to read sheets of one workbook through the columnar cache, one
+# frame per sheet in order. Sheets with a fresh cached copy are read from it;
+# the others are parsed from a single opening of the workbook, however many
+# there are. columns optionally lists, per sheet, the columns to keep (None
+# keeps them all); they are projected when reading the cached copy, which
+# always holds the whole sheet, and a missing one fails the read.
+# append_key, the ID column of sheets that only ever get rows appended, turns
+# on incremental refresh: a changed sheet whose cached rows still read the
+# same only has its new rows parsed and appended to its copy (see
+# sheet_append.read_appended_rows for the saves this holds across).
+def iter_sheets_cached(filepath, sheet_names, columns=None, append_key=None):
+    stat = os.stat(filepath)
+    columns = columns or [None] * len(sheet_names)
+    book, digest = None, None
+    try:
+        for sheet_name, usecols in zip(sheet_names, columns):
+            data_path, manifest_path = _cache_paths(filepath, sheet_name)
+            manifest = _read_manifest(manifest_path)
+
+            fresh, sheet_digest = _is_fresh(manifest, stat, filepath, digest)
+            digest = digest or sheet_digest
+            if fresh and os.path.exists(data_path):
+                if sheet_digest is not None:
+                    # Same content under a new mtime: refresh the manifest, keep the copy
+                    manifest.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+                    _write_manifest(manifest_path, manifest)
+                yield _read_cached(data_path, filepath, sheet_name, usecols)
+                continue
+
+            incremental = None
+            if append_key is not None and manifest is not None and manifest.get("format") == CACHE_FORMAT and os.path.exists(data_path):
+                incremental = _read_appended(filepath, sheet_name, data_path, manifest, append_key)
+            if incremental is not None:
+                df, append = incremental
+                appended = {"from_sha256": manifest["sha256"], "rows_before": manifest["rows"]}
+            else:
+                if book is None:
+                    book = pd.ExcelFile(filepath)
+                df = book.parse(sheet_name)
+                append = append_key and _append_state(df, filepath, sheet_name, append_key)
+                appended = None
+            os.makedirs(CACHE_DIR, exist_ok=True)
+            _write_atomic(data_path, lambda path: _arrow_safe(df).to_feather(path))
+            digest = digest or file_digest(filepath)
+            _write_manifest(manifest_path, {
+                "format": CACHE_FORMAT,
+                "source": os.path.abspath(filepath),
+                "sheet_name": sheet_name,
+                "size": stat.st_size,
+                "mtime_ns": stat.st_mtime_ns,
+                "sha256": digest,
+                "rows": len(df),
+                "append": append or None,
+                "appended": appended,
+            })
+            yield _read_cached(data_path, filepath, sheet_name, usecols)
+    finally:
+        if book is not None:
+            book.close()
+
+
+# Function to read one workbook sheet through the columnar cache
+def read_excel_cached(filepath, sheet_name=0, columns=None):
+    return next(iter_sheets_cached(filepath, [sheet_name], [columns]))
+
+
+# Function to drop every cached copy (forces a re-parse on next load)
+def clear_cache():
+    if not os.path.isdir(CACHE_DIR):
+        return
+    for name in os.listdir(CACHE_DIR):
+        if name.endswith((".arrow", ".json")):
+            os.remove(os.path.join(CACHE_DIR, name))
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+
+
+# Function to build the filter index of a frame: for every filterable column,
+# its distinct values and the row positions holding each value. Positions are
+# kept as one stable argsort of the value codes plus per-value bounds (a
+# posting list per value rather than a full-length bitmap), so even
+# high-cardinality columns such as ICD-10 Code cost one int array. Missing
+# values keep their own positions and raw values, because Series.isin tells
+# None and NaN apart. With a date_column the index also keeps that column's
+# dates sorted (missing dates first) with their row positions.
+def build_filter_index(df, columns, date_column=None):
+    index = {"rows": len(df)}
+    if date_column is not None:
+        dates = pd.to_datetime(df[date_column]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        order = np.argsort(dates, kind="stable")
+        index["dates"] = (dates[order], order)
+    for column in columns:
+        if column not in df.columns:
+            continue
+        codes, values = pd.factorize(df[column])
+        order = np.argsort(codes, kind="stable")
+        bounds = np.searchsorted(codes[order], np.arange(len(values) + 1))
+        missing = np.flatnonzero(codes < 0)
+        index[column] = (pd.Index(values), order, bounds, missing, df[column].iloc[missing].reset_index(drop=True))
+    return index
+
+
+# Function to get the row positions matching the sidebar selections, a
+# mapping of column to the chosen values. Values chosen in one column are
+# ORed together, columns are ANDed; empty selections and columns that are not
+# indexed do not filter. date_range is the (first, last) day picked on the
+# date inputs: two binary searches over the sorted dates, keeping rows that
+# have no date. Returns None when nothing filters.
+def select_rows(index, selections, date_range=None):
+    mask = None
+    if date_range is not None and "dates" in index and not any(pd.isna(value) for value in date_range):
+        dates, order = index["dates"]
+        undated = np.searchsorted(dates, np.iinfo(np.int64).min, side="right")
+        first = np.searchsorted(dates, pd.Timestamp(date_range[0]).normalize().value, side="left")
+        last = np.searchsorted(dates, (pd.Timestamp(date_range[1]).normalize() + pd.Timedelta(days=1)).value, side="left")
+        if first > undated or last < len(dates):
+            mask = np.zeros(index["rows"], dtype=bool)
+            mask[order[:undated]] = True
+            mask[order[first:last]] = True
+    for column, chosen in selections.items():
+        if not chosen or column not in index:
+            continue
+        values, order, bounds, missing, missing_values = index[column]
+        column_mask = np.zeros(index["rows"], dtype=bool)
+        codes = values.get_indexer(chosen)
+        for code in codes[codes >= 0]:
+            column_mask[order[bounds[code]:bounds[code + 1]]] = True
+        if len(missing) and any(pd.isna(value) for value in chosen):
+            column_mask[missing[missing_values.isin(chosen).to_numpy()]] = True
+        mask = column_mask if mask is None else mask & column_mask
+    return None if mask is None else np.flatnonzero(mask)
+
+
+# Function to apply the sidebar selections (and date range) to the frame the
+# index was built on with a single take
+def apply_filters(df, index, selections, date_range=None):
+    rows = select_rows(index, selections, date_range)
+    return df if rows is None else df.take(rows)
@@ -0,0 +1,102 @@
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pyarrow as pa
+
+from excel_cache import is_cached, iter_sheets_cached, sheet_manifest
+
+
+# Worker processes parsing workbook sheets at the same time; 1 parses them in turn
+INGEST_WORKERS = int(os.environ.get("LOSS_RATIO_INGEST_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+
+# Function to read sheets of one workbook through the columnar cache (one
+# opening of the workbook for all of them) and hand each back as an Arrow IPC
+# buffer with the seconds spent reading it; the first sheet's time includes
+# opening the workbook. Run in a worker process: each buffer crosses the
+# process boundary as one block of bytes instead of a pickled frame.
+def _read_workbook(filepath, sheet_names, columns, append_key=None):
+    results = []
+    start = time.perf_counter()
+    for df in iter_sheets_cached(filepath, sheet_names, columns, append_key):
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        results.append((sink.getvalue().to_pybytes(), time.perf_counter() - start))
+        start = time.perf_counter()
+    return results
+
+
+# Function to turn an Arrow IPC buffer back into a frame
+def _to_frame(buffer):
+    return pa.ipc.open_stream(pa.py_buffer(buffer)).read_all().to_pandas()
+
+
+# Function to read (filepath, sheet_name, columns) jobs, columns being the
+# columns to keep or None for all. Every workbook is opened once for all of
+# its sheets that need parsing, and workbooks that need parsing are parsed at
+# the same time in a process pool; sheets already in the columnar cache are
+# read here, which is quicker than starting a worker. append_keys optionally
+# maps a workbook to the ID column of its append-only sheets, whose changes
+# are read incrementally (see excel_cache). Returns the frames in job order
+# and a timing row per sheet: whether it was parsed, how many rows were
+# appended when only new rows were parsed, the seconds spent reading it and
+# the seconds spent bringing it back from its worker.
+def read_sheets(jobs, workers=None, append_keys=None):
+    workers = INGEST_WORKERS if workers is None else workers
+    append_keys = append_keys or {}
+    books = {}
+    for position, (filepath, _, _) in enumerate(jobs):
+        books.setdefault(filepath, []).append(position)
+    stale = {position for position, (filepath, sheet_name, _) in enumerate(jobs) if not is_cached(filepath, sheet_name)}
+    pooled = {filepath: [position for position in positions if position in stale] for filepath, positions in books.items()}
+    pooled = {filepath: positions for filepath, positions in pooled.items() if positions}
+
+    results = {}
+    if workers > 1 and len(pooled) > 1:
+        # spawn: forking a threaded server process is not safe
+        with ProcessPoolExecutor(max_workers=min(workers, len(pooled)), mp_context=multiprocessing.get_context("spawn")) as pool:
+            futures = {filepath: pool.submit(_read_workbook, filepath, [jobs[position][1] for position in positions],
+                                             [jobs[position][2] for position in positions], append_keys.get(filepath))
+                       for filepath, positions in pooled.items()}
+            for filepath, future in futures.items():
+                for position, (buffer, read_s) in zip(pooled[filepath], future.result()):
+                    start = time.perf_counter()
+                    results[position] = (_to_frame(buffer), read_s, time.perf_counter() - start)
+
+    for filepath, positions in books.items():
+        positions = [position for position in positions if position not in results]
+        start = time.perf_counter()
+        sheets = iter_sheets_cached(filepath, [jobs[position][1] for position in positions], [jobs[position][2] for position in positions],
+                                    append_keys.get(filepath))
+        for position, df in zip(positions, sheets):
+            results[position] = (df, time.perf_counter() - start, 0.0)
+            start = time.perf_counter()
+
+    frames = [results[position][0] for position in range(len(jobs))]
+    timings = [{"file": os.path.basename(filepath), "sheet": sheet_name, "parsed": position in stale,
+                "appended": _appended_rows(filepath, sheet_name) if position in stale else None,
+                "read_s": results[position][1], "transfer_s": results[position][2]}
+               for position, (filepath, sheet_name, _) in enumerate(jobs)]
+    return frames, timings
+
+
+# Function to get how many rows the last refresh of a sheet appended, or None
+# when it was parsed in full
+def _appended_rows(filepath, sheet_name):
+    manifest = sheet_manifest(filepath, sheet_name)
+    if manifest is None or not manifest.get("appended"):
+        return None
+    return manifest["rows"] - manifest["appended"]["rows_before"]
+
+
+# Function to describe one timing row of read_sheets
+def timing_report(timing):
+    source = "parsed" if timing["parsed"] else "cached"
+    if timing.get("appended") is not None:
+        source = f"{timing['appended']} rows appended"
+    return (f"{timing['file']} [{timing['sheet']}]: {source}, read {timing['read_s'] * 1000:.1f} ms,"
+            f" transfer {timing['transfer_s'] * 1000:.1f} ms")
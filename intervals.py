@@ -0,0 +1,101 @@
+import numpy as np
+import pandas as pd
+
+
+# Function to get datetime values as int64 nanoseconds (NaT becomes the int64 minimum)
+def _as_ns(values):
+    return pd.to_datetime(values).to_numpy(dtype="datetime64[ns]").astype(np.int64)
+
+
+# Function to encode (client, date) pairs as sortable integers. Clients are
+# factorized together so equal names share a code (missing names match each
+# other, as they do in pd.merge) and all dates are ranked together so that
+# code * width + rank never overflows.
+def _encode(event_keys, event_dates, period_keys, period_dates):
+    keys, _ = pd.factorize(pd.concat([pd.Series(event_keys), pd.Series(period_keys)], ignore_index=True),
+                           use_na_sentinel=False)
+    event_keys, period_keys = keys[:len(event_keys)], keys[len(event_keys):]
+
+    _, ranks = np.unique(np.concatenate([event_dates] + period_dates), return_inverse=True)
+    width = ranks.max() + 2 if len(ranks) else 1
+    event_ranks = ranks[:len(event_dates)]
+    period_ranks = np.split(ranks[len(event_dates):], len(period_dates))
+    return event_keys.astype(np.int64), period_keys.astype(np.int64), event_ranks, period_ranks, width
+
+
+# Function to count, for every event, how many periods of the same client
+# contain the event date (start <= date <= end). Periods are sorted per client
+# by start and by end, so the count is "started by date" minus "ended before
+# date": two binary searches per event instead of a client-wide cross product.
+def covering_counts(events, periods, on, date_col, start_col="Start Date", end_col="End Date"):
+    event_dates = _as_ns(events[date_col])
+    starts = _as_ns(periods[start_col])
+    ends = _as_ns(periods[end_col])
+    nat = np.iinfo(np.int64).min
+
+    # A period with a missing or inverted range never covers anything
+    valid = (starts != nat) & (ends != nat) & (starts <= ends)
+    event_keys, period_keys, event_ranks, (start_ranks, end_ranks), width = _encode(
+        events[on].to_numpy(), event_dates, periods[on].to_numpy()[valid], [starts[valid], ends[valid]])
+
+    event_codes = event_keys * width + event_ranks
+    client_base = event_keys * width
+    start_codes = np.sort(period_keys * width + start_ranks)
+    end_codes = np.sort(period_keys * width + end_ranks)
+
+    started = np.searchsorted(start_codes, event_codes, side="right") - np.searchsorted(start_codes, client_base)
+    ended = np.searchsorted(end_codes, event_codes, side="left") - np.searchsorted(end_codes, client_base)
+    counts = started - ended
+    counts[event_dates == nat] = 0
+    return counts
+
+
+# Function to keep each event once for every period of its client covering the
+# event date. Gives the same rows as merging events with periods on the client
+# and filtering start <= date <= end, without building the cross product.
+def join_within_periods(events, periods, on, date_col, start_col="Start Date", end_col="End Date"):
+    counts = covering_counts(events, periods, on, date_col, start_col, end_col)
+    return events.iloc[np.repeat(np.arange(len(events)), counts)]
+
+
+# Function to find, for every event, the period of the same client that covers
+# the event date, or -1 when none does. When several periods cover the date the
+# one running longest wins (latest end date, then latest start). Periods are
+# sorted per client by start, and a running maximum of the end date lets one
+# binary search per event decide the match.
+def assign_period(events, periods, on, date_col, start_col="Start Date", end_col="End Date"):
+    event_dates = _as_ns(events[date_col])
+    starts = _as_ns(periods[start_col])
+    ends = _as_ns(periods[end_col])
+    nat = np.iinfo(np.int64).min
+
+    candidates = np.flatnonzero((starts != nat) & (ends != nat) & (starts <= ends))
+    event_keys, period_keys, event_ranks, (start_ranks, end_ranks), width = _encode(
+        events[on].to_numpy(), event_dates, periods[on].to_numpy()[candidates],
+        [starts[candidates], ends[candidates]])
+
+    order = np.argsort(period_keys * width + start_ranks, kind="stable")
+    sorted_keys = period_keys[order]
+    start_codes = sorted_keys * width + start_ranks[order]
+
+    # Running best (end rank, sorted position) per client in start order
+    n = max(len(order), 1)
+    best = pd.Series(end_ranks[order] * n + np.arange(len(order))).groupby(sorted_keys).cummax().to_numpy()
+
+    last_started = np.searchsorted(start_codes, event_keys * width + event_ranks, side="right") - 1
+    found = last_started >= 0
+    found[found] = sorted_keys[last_started[found]] == event_keys[found]
+    found &= event_dates != nat
+
+    result = np.full(len(events), -1, dtype=np.int64)
+    best_found = best[last_started[found]]
+    covers = best_found // n >= event_ranks[found]
+    result[np.flatnonzero(found)[covers]] = candidates[order[best_found[covers] % n]]
+    return result
+
+
+# Function to split events into those attached to a covering period and those
+# that fall outside every period of their client
+def attach_to_periods(events, periods, on, date_col, start_col="Start Date", end_col="End Date"):
+    parent = assign_period(events, periods, on, date_col, start_col, end_col)
+    return events[parent >= 0], events[parent < 0]
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+
+# Function to divide a sum by its count of values, NaN when there are none
+def _mean(total, count):
+    return total / count if count else np.nan
+
+
+# Function to sum a measure and count its non-missing values per group code
+def _sum_count(values, codes, groups):
+    values = values.to_numpy(dtype=float)
+    known = ~np.isnan(values)
+    sums = np.bincount(codes, weights=np.where(known, values, 0.0), minlength=groups)
+    return sums, np.bincount(codes, weights=known, minlength=groups)
+
+
+# Function to compute the values behind the claims page metric cards in one
+# pass: Claim Type and Claim Status are factorized once, every amount figure
+# is a weighted bincount over the type x status cells (rolled up for the
+# per-type, per-status and overall figures), and the claim numbers come from
+# one bitmap of the (status, claim) pairs present.
+def claims_kpis(df):
+    type_codes, types = pd.factorize(df["Claim Type"])
+    status_codes, statuses = pd.factorize(df["Claim Status"])
+    # Missing types / statuses take cell 0 of their axis so the codes stay non-negative
+    cells = (type_codes.astype(np.int64) + 1) * (len(statuses) + 1) + status_codes + 1
+    shape = (len(types) + 1, len(statuses) + 1)
+    claim_sums, claim_counts = _sum_count(df["Claim Amount"], cells, shape[0] * shape[1])
+    approved_sums, approved_counts = _sum_count(df["Approved Claim Amount"], cells, shape[0] * shape[1])
+    claim_sums = claim_sums.reshape(shape)
+    approved_sums = approved_sums.reshape(shape)
+
+    # Claims are counted once per status, however many rows they have: mark
+    # each (status, claim) pair seen in a statuses x claims bitmap
+    claim_codes, claim_ids = pd.factorize(df["Claim ID"])
+    known = claim_codes >= 0
+    seen = np.zeros((len(statuses) + 1, len(claim_ids)), dtype=bool)
+    seen[status_codes[known] + 1, claim_codes[known]] = True
+    per_status = seen.sum(axis=1)[1:]
+
+    return {
+        "claim_amount": claim_sums.sum(),
+        "claim_amount_mean": _mean(claim_sums.sum(), claim_counts.sum()),
+        "approved_amount_mean": _mean(approved_sums.sum(), approved_counts.sum()),
+        "approved_amount_by_type": pd.Series(approved_sums.sum(axis=1)[1:], index=types),
+        "claim_amount_by_status": pd.Series(claim_sums.sum(axis=0)[1:], index=statuses),
+        "clients": df["Employer Name"].nunique(),
+        "claims": len(claim_ids),
+        "claims_by_status": pd.Series(per_status, index=statuses),
+    }
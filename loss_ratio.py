@@ -5,8 +5,35 @@ from PIL import Image
 import plotly.express as px
 import plotly.graph_objects as go
 from datetime import datetime
+import importlib
+import logging
+import time
+from data_store import invalidate, refresh_date
+from page_context import PageContext
 
 
+logger = logging.getLogger(__name__)
+
+# Dashboard pages and the modules whose render(ctx) draws them
+PAGES = {
+    "Overview for Expected Claims": "overview",
+    "Overview for Actual Claims": "overview_c",
+    "Loss Ratio View (Expected Claims)": "loss_ratio_view",
+    "Loss Ratio View (Actual Claims)": "loss",
+    "Expected Claims View": "visit",
+    "Actual Claims View": "claims",
+}
+
+
+# Function to render a page module as of a date; after the first import the
+# module is reused from sys.modules, so reruns skip reading and compiling the source
+def render_page(page, as_of):
+    start = time.perf_counter()
+    module = importlib.import_module(PAGES[page])
+    imported = time.perf_counter()
+    module.render(PageContext(page=page, as_of=as_of))
+    logger.info("%s: import %.1f ms, render %.1f ms", page,
+                (imported - start) * 1000, (time.perf_counter() - imported) * 1000)
 
 
 # Function to render the dashboard
@@ -24,7 +51,14 @@ def dashboard_page():
     logo_url = 'EC_logo.png'  
     st.sidebar.image(logo_url, use_column_width=True)
 
-    page = st.sidebar.selectbox("Choose a dashboard", ["Home", "Overview for Expected Claims","Overview for Actual Claims", "Loss Ratio View (Expected Claims)","Loss Ratio View (Actual Claims)", "Expected Claims View", "Actual Claims View"])
+    page = st.sidebar.selectbox("Choose a dashboard", ["Home"] + list(PAGES))
+
+    # Data is loaded once per server process; reload it after the quarterly refresh
+    if st.sidebar.button("Reload data"):
+        invalidate()
+
+    # Date the measures are counted to: the last data refresh unless another day is picked
+    as_of = st.sidebar.date_input("As at", refresh_date(), key="as_of")
 
     st.markdown(
         """
@@ -100,20 +134,8 @@ def dashboard_page():
         st.markdown('<div class="text">4. <strong>Refresh Data:</strong> The data will be manually refreshed on the last week of every quarter. </div>', unsafe_allow_html=True)
         st.markdown('<div class="separator"></div>', unsafe_allow_html=True)
 
-    elif page == "Overview for Expected Claims":
-        exec(open("overview.py").read())
-    elif page == "Overview for Actual Claims":
-        exec(open("overview_c.py").read())
-    elif page == "Loss Ratio View (Expected Claims)":
-        exec(open("loss_ratio_view.py").read())
-    elif page == "Expected Claims View":
-        exec(open("visit.py").read())
-    elif page == "Actual Claims View":
-        exec(open("claims.py").read())
-    elif page == "Loss Ratio View (Actual Claims)":
-        exec(open("loss.py").read())
-    elif page == "Premium View":
-        exec(open("premium.py").read())
+    elif page in PAGES:
+        render_page(page, pd.Timestamp(as_of))
 
 if __name__ == "__main__":
     main()
@@ -8,222 +8,18 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from itertools import chain
 from matplotlib.ticker import FuncFormatter
-from datetime import datetime
-
-
-# Centered and styled main title using inline styles
-st.markdown('''
-    <style>
-        .main-title {
-            color: #e66c37; /* Title color */
-            text-align: center; /* Center align the title */
-            font-size: 3rem; /* Title font size */
-            font-weight: bold; /* Title font weight */
-            margin-bottom: .5rem; /* Space below the title */
-            text-shadow: 1px 1px 2px rgba(0, 0, 0, 0.1); /* Subtle text shadow */
-        }
-        div.block-container {
-            padding-top: 2rem; /* Padding for main content */
-        }
-    </style>
-''', unsafe_allow_html=True)
-
-st.markdown('<h1 class="main-title">LOSS RATIO VIEW WITH EXPECTED CLAIM AMOUNT</h1>', unsafe_allow_html=True)
-
-
-
-# Filepaths and sheet names
-filepath_premiums = "JAN-NOV 2024 GWP.xlsx"
-sheet_name_new_business = "2023"
-sheet_name_endorsements = "2024"
-filepath_visits = "VisitLogs_25Oct2024 (1).xlsx"
-
-# Read the premium data
-df_2023 = pd.read_excel(filepath_premiums, sheet_name=sheet_name_new_business)
-df_2024 = pd.read_excel(filepath_premiums, sheet_name=sheet_name_endorsements)
-
-# Read the visit logs
-df_visits = pd.read_excel(filepath_visits)
-
-df_premiums = pd.concat([df_2023, df_2024])
-
-drop_cols=['Amount Received - Jan _ march', 'MONTH', 'Contract days', 'Cover days', 'Amount Received - April', 'Amount Received - May', 'Amount Received - June', 'Amount Received - JULY','Unnamed: 27', 'Unnamed: 25', 'Unnamed: 26']
-
-df_premiums.drop(columns=drop_cols, inplace = True)
-
-df_premiums["Start Date"] = pd.to_datetime(df_premiums["Start Date"])
-df_premiums["Month"] = df_premiums["Start Date"].dt.strftime("%B")
-df_premiums["Year"] = df_premiums["Start Date"].dt.year
-
-
-# Split the DataFrame into two: one with endorsements and one without
-df_endorsements = df_premiums[df_premiums['Cover Type'].str.contains('Endorsement', case=False, na=False)]
-df_non_endorsements = df_premiums[~df_premiums['Cover Type'].str.contains('Endorsement', case=False, na=False)]
-
-# Calculate 'Days Since Start' and 'days_on_cover' for non-endorsement rows
-current_date = datetime.now()
-df_non_endorsements['Days Since Start'] = (current_date - df_non_endorsements['Start Date']).dt.days
-df_non_endorsements['days_on_cover'] = (df_non_endorsements['End Date'] - df_non_endorsements['Start Date']).dt.days
-
-
-# Prioritize 'renewed' cover type values
-def prioritize_renewal(df):
-    # Identify clients with both 'new' and 'renewal' cover types
-    clients_with_both = df.groupby('Client Name')['Cover Type'].nunique()
-    clients_with_both = clients_with_both[clients_with_both == 2].index
-    
-    # Separate clients with both cover types from others
-    df_clients_with_both = df[df['Client Name'].isin(clients_with_both)]
-    df_other_clients = df[~df['Client Name'].isin(clients_with_both)]
-    
-    # Sort and deduplicate clients with both cover types, prioritizing 'renewal'
-    df_clients_with_both_sorted = df_clients_with_both.sort_values(by=['Client Name', 'Cover Type'], ascending=[True, False])
-    df_clients_with_both_deduped = df_clients_with_both_sorted.drop_duplicates(subset=['Client Name'], keep='first')
-    
-    # Combine the deduplicated clients with both cover types and the other clients
-    df_result = pd.concat([df_clients_with_both_deduped, df_other_clients])
-    
-    return df_result
-
-df_prioritized = prioritize_renewal(df_non_endorsements)
-
-# Merge endorsements with premiums on Client Name
-df_merged_endorsements = pd.merge(df_endorsements, df_prioritized[['Client Name', 'Start Date', 'End Date']], on='Client Name', suffixes=('_endorsement', '_premium'))
-
-# Filter endorsements to include only those within the start and end date range of the premiums
-df_filtered_endorsements = df_merged_endorsements[
-    (df_merged_endorsements['Start Date_endorsement'] >= df_merged_endorsements['Start Date_premium']) & 
-    (df_merged_endorsements['Start Date_endorsement'] <= df_merged_endorsements['End Date_premium'])
-]
-
-# Drop the additional date columns used for filtering
-df_filtered_endorsements = df_filtered_endorsements.drop(columns=['Start Date_premium', 'End Date_premium'])
-
-# Rename the date columns back to their original names
-df_filtered_endorsements = df_filtered_endorsements.rename(columns={'Start Date_endorsement': 'Start Date', 'End Date_endorsement': 'End Date'})
-
-# Combine the processed non-endorsement DataFrame with the filtered endorsements DataFrame
-df_premiums = pd.concat([df_prioritized, df_filtered_endorsements])
-
-# Reset the index of the resulting DataFrame
-df_premiums.reset_index(drop=True, inplace=True)
-
-
-
-
-df_visits['Visit Date'] = pd.to_datetime(df_visits['Visit Date'])
-df_premiums['Start Date'] = pd.to_datetime(df_premiums['Start Date'])
-df_premiums['End Date'] = pd.to_datetime(df_premiums['End Date'])
-
-# Merge new business data with visit data on Client Name
-df_merged = pd.merge(df_visits, df_premiums[['Client Name', 'Start Date', 'End Date']], on='Client Name', how='outer')
-
-
-# Filter visits to include only those within the start and end date range
-df_filtered_visits = df_merged[
-    (df_merged['Visit Date'] >= df_merged['Start Date']) & 
-    (df_merged['Visit Date'] <= df_merged['End Date'])
-]
-
-
-# Aggregate visit data by 'Client Name'
-df_visits_agg = df_filtered_visits.groupby('Client Name').agg({
-    'Visit ID': 'count',  # Count of visits
-    'Total Amount': 'sum',  # Sum of visit close amounts
-    'Pharmacy Claim Amount': 'sum',  # Sum of pharmacy claim amounts
-    'Total Amount': 'sum',  # Sum of total amounts
-    'Visit Date': ['min', 'max'] 
-}).reset_index()
-
-
-# Flatten the column names after aggregation
-df_visits_agg.columns = [' '.join(col).strip() if isinstance(col, tuple) else col for col in df_visits_agg.columns]
-
-df_visits_agg['Visit Date min'] = pd.to_datetime(df_visits_agg['Visit Date min'], errors='coerce')
-
-# Extract 'Month' and 'Year' from the minimum visit date
-df_visits_agg['Month'] = df_visits_agg['Visit Date min'].dt.strftime('%B')
-df_visits_agg['Year'] = df_visits_agg['Visit Date min'].dt.year
-
-# Clean Client Name columns to ensure consistency
-df_visits_agg['Client Name'] = df_visits_agg['Client Name'].str.strip().str.lower()
-df_premiums['Client Name'] = df_premiums['Client Name'].str.strip().str.lower()
-
-# Ensure Client Name columns are of the same data type
-df_visits_agg['Client Name'] = df_visits_agg['Client Name'].astype(str)
-df_premiums['Client Name'] = df_premiums['Client Name'].astype(str)
-
-# Merge the aggregated visit data with the premium data on Client Name
-df_combined = pd.merge(df_visits_agg, df_premiums, on='Client Name', how='outer')
-
-
-
-# Merge the aggregated visit data with the premium data
-df_combined = pd.concat([df_visits_agg, df_premiums])
-
-
-# Convert 'Start Date' to datetime
-df_combined["Start Date"] = pd.to_datetime(df_combined["Start Date"])
-df_combined["End Date"] = pd.to_datetime(df_combined["End Date"])
-
-df = df_combined
-
-df["Client Name"] = df["Client Name"].str.upper()
-
-
-
-# Inspect the merged DataFrame
-
-# Sidebar styling and logo
-st.markdown("""
-    <style>
-    .sidebar .sidebar-content {
-        background-color: #f0f2f6;
-        padding: 20px;
-        border-radius: 10px;
-        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
-    }
-    .sidebar .sidebar-content h2 {
-        color: #007BFF; /* Change this color to your preferred title color */
-        font-size: 1.5em;
-        margin-bottom: 20px;
-        text-align: center;
-    }
-    .sidebar .sidebar-content .filter-title {
-        color: #e66c37;
-        font-size: 1.2em;
-        font-weight: bold;
-        margin-top: 20px;
-        margin-bottom: 10px;
-        text-align: center;
-    }
-    .sidebar .sidebar-content .filter-header {
-        color: #e66c37; /* Change this color to your preferred header color */
-        font-size: 2.5em;
-        font-weight: bold;
-        margin-top: 20px;
-        margin-bottom: 20px;
-        text-align: center;
-    }
-    .sidebar .sidebar-content .filter-multiselect {
-        margin-bottom: 15px;
-    }
-    .sidebar .sidebar-content .logo {
-        text-align: center;
-        margin-bottom: 20px;
-    }
-    .sidebar .sidebar-content .logo img {
-        max-width: 80%;
-        height: auto;
-        border-radius: 50%;
-    }
-            
-    </style>
-    """, unsafe_allow_html=True)
-
-
-
-
+from cube import build_cube, cube_mean, slice_cube
+from clients import canonical_names, client_ids, get_client_registry, registry_inputs, unmatched_clients
+from data_store import get_dataset, get_derived, get_filtered
+from earned import earned_premium_curve, policy_earned_premium
+from filter_index import apply_filters, build_filter_index
+from periods import add_period, period_label, period_slice
+from intervals import attach_to_periods
+from pipeline import read_artifacts
+from policies import prioritize_renewal
+from table import paged_table
+from trends import WINDOWS, loss_ratio_series
+from usage import usage_by_client, usage_events
 
 
 # Dictionary to map month names to their order
@@ -233,68 +29,21 @@ month_order = {
     "September": 9, "October": 10, "November": 11, "December": 12
 }
 
-# Sort months based on their order
-sorted_months = sorted(df['Month'].dropna().unique(), key=lambda x: month_order[x])
-
-
-# Sidebar for filters
-st.sidebar.header("Filters")
-year = st.sidebar.multiselect("Select Year", options=sorted(df['Year'].dropna().unique()))
-month = st.sidebar.multiselect("Select Month", options=sorted_months)
-cover = st.sidebar.multiselect("Select Cover Type", options=df['Cover Type'].unique())
-# segment = st.sidebar.multiselect("Select Client Segment", options=df['Client Segment'].unique())
-client_names = sorted(df['Client Name'].unique())
-client_name = st.sidebar.multiselect("Select Client Name", options=client_names)
-
-# Apply filters to the DataFrame
-if 'Start Year' in df.columns and year:
-    df = df[df['Start Year'].isin(year)]
-if 'Start Month' in df.columns and month:
-    df = df[df['Start Month'].isin(month)]
-if 'Cover Type' in df.columns and cover:
-    df = df[df['Cover Type'].isin(cover)]
-# if 'Client Segment' in df.columns and segment:
-#     df = df[df['Client Segment'].isin(segment)]
-if 'Client Name' in df.columns and client_name:
-    df = df[df['Client Name'].isin(client_name)]
-
-# Determine the filter description
-filter_description = ""
-if year:
-    filter_description += f"{', '.join(map(str, year))} "
-if cover:
-    filter_description += f"{', '.join(map(str, cover))} "
-if month:
-    filter_description += f"{', '.join(month)} "
-if not filter_description:
-    filter_description = "All data"
-
-
-# Get minimum and maximum dates for the date input
-startDate = df["Start Date"].min()
-endDate = df["End Date"].max()
-
-# Define CSS for the styled date input boxes
-st.markdown("""
-    <style>
-    .date-input-box {
-        border-radius: 10px;
-        text-align: left;
-        margin: 5px;
-        font-size: 1.2em;
-        font-weight: bold;
-    }
-    .date-input-title {
-        font-size: 1.2em;
-        margin-bottom: 5px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+# Measures summed into the aggregate cube
+CUBE_MEASURES = ["Total", "Days Since Start", "days_on_cover", "Earned Premium", "Visit ID count", "Total Amount sum", "Pharmacy Claim Amount sum"]
 
+# Columns behind the sidebar multiselect filters and the date inputs
+DATE_COLUMN = 'Start Date'
+FILTER_COLUMNS = ['Cover Type', 'Client Name']
 
+# Columns the page reads from its datasets (any other column is never loaded)
+DATASET_COLUMNS = {
+    "premiums": ['Cover Type', 'Start Date', 'End Date', 'Client Name', 'Total'],
+    "visits": ['Visit ID', 'Client Name', 'Visit Date', 'Total Amount', 'Pharmacy Claim Amount'],
+}
 
-# Create 2-column layout for date inputs
-col1, col2 = st.columns(2)
+# Columns the data table shows until others are picked
+TABLE_COLUMNS = ['Client Name', 'Cover Type', 'Start Date', 'End Date', 'Total', 'Earned Premium', 'Visit ID count', 'Total Amount sum']
 
 
 # Function to display date input in styled boxes
@@ -306,199 +55,151 @@ def display_date_input(col, title, default_date, min_date, max_date):
         """, unsafe_allow_html=True)
     return col.date_input("", default_date, min_value=min_date, max_value=max_date)
 
-# Display date inputs
-with col1:
-    date1 = pd.to_datetime(display_date_input(col1, "Start Date", startDate, startDate, endDate))
 
-with col2:
-    date2 = pd.to_datetime(display_date_input(col2, "End Date", endDate, startDate, endDate))
+# Function to display metrics in styled boxes with tooltips
+def display_metric(col, title, value):
+    col.markdown(f"""
+        <div class="metric-box">
+            <div class="metric-title">{title}</div>
+            <div class="metric-value">{value}</div>
+        </div>
+        """, unsafe_allow_html=True)
 
 
+# Function to load and join the premium and visit data (cached per data version and as-of date)
+def load_data(as_of):
+    # Premium (2023 and 2024 sheets) data from the shared data store
+    df_premiums = get_dataset("premiums", columns=DATASET_COLUMNS["premiums"])
 
+    # Integer client keys and canonical client names from the shared client registry
+    registry = get_client_registry()
+    df_premiums['client_id'] = client_ids(registry, df_premiums['Client Name'])
+    df_premiums['Client Name'] = canonical_names(registry, df_premiums['client_id'])
 
-# Handle non-finite values in 'Start Year' column
-df['Year'] = df['Year'].fillna(0).astype(int)  # Replace NaN with 0 or any specific value
+    df_premiums["Start Date"] = pd.to_datetime(df_premiums["Start Date"])
+    df_premiums["Month"] = df_premiums["Start Date"].dt.strftime("%B")
+    df_premiums["Year"] = df_premiums["Start Date"].dt.year
 
-# Handle non-finite values in 'Start Month' column
-df['Month'] = df['Month'].fillna('Unknown')
 
-# Create a 'Month-Year' column
-df['Month-Year'] = df['Month'] + ' ' + df['Year'].astype(str)
+    # Split the DataFrame into two: one with endorsements and one without
+    df_endorsements = df_premiums[df_premiums['Cover Type'].str.contains('Endorsement', case=False, na=False)]
+    df_non_endorsements = df_premiums[~df_premiums['Cover Type'].str.contains('Endorsement', case=False, na=False)]
 
-# Function to sort month-year combinations
-def sort_key(month_year):
-    month, year = month_year.split()
-    return (int(year), month_order.get(month, 0))  # Use .get() to handle 'Unknown' month
+    # Calculate 'Days Since Start' and 'days_on_cover' for non-endorsement rows
+    df_non_endorsements['Days Since Start'] = (as_of - df_non_endorsements['Start Date']).dt.days
+    df_non_endorsements['days_on_cover'] = (df_non_endorsements['End Date'] - df_non_endorsements['Start Date']).dt.days
 
-# Extract unique month-year combinations and sort them
-month_years = sorted(df['Month-Year'].unique(), key=sort_key)
 
-# Select slider for month-year range
-selected_month_year_range = st.select_slider(
-    "Select Month-Year Range",
-    options=month_years,
-    value=(month_years[0], month_years[-1])
-)
+    # Renewals are prioritized per registry client, so a client spelled differently
+    # in the 2023 and 2024 sheets keeps only its renewal (python reconcile.py
+    # shows what this moves against prioritizing per spelling)
+    df_prioritized = prioritize_renewal(df_non_endorsements)
 
-# Filter DataFrame based on selected month-year range
-start_month_year, end_month_year = selected_month_year_range
-start_month, start_year = start_month_year.split()
-end_month, end_year = end_month_year.split()
+    # Attach each endorsement to the prioritized policy whose cover contains its start date.
+    # Endorsements outside every policy window are returned separately for reporting.
+    df_filtered_endorsements, df_unmatched_endorsements = attach_to_periods(df_endorsements, df_prioritized, on='client_id', date_col='Start Date')
 
-start_index = (int(start_year), month_order.get(start_month, 0))
-end_index = (int(end_year), month_order.get(end_month, 0))
+    # Combine the processed non-endorsement DataFrame with the filtered endorsements DataFrame
+    df_premiums = pd.concat([df_prioritized, df_filtered_endorsements])
 
-# Filter DataFrame based on month-year order indices
-df = df[
-    df['Month-Year'].apply(lambda x: (int(x.split()[1]), month_order.get(x.split()[0], 0))).between(start_index, end_index)
-]
+    # Reset the index of the resulting DataFrame
+    df_premiums.reset_index(drop=True, inplace=True)
 
 
 
+    df_premiums['Start Date'] = pd.to_datetime(df_premiums['Start Date'])
+    df_premiums['End Date'] = pd.to_datetime(df_premiums['End Date'])
 
-# # Filter the concatenated DataFrame to include only endorsements
-# df_hares = df[df['Client Segment'] == 'Hares']
-# df_elephants = df[df['Client Segment'] == 'Elephant']
-# df_tiger = df[df['Client Segment'] == 'Tigers']
-# df_whale = df[df['Client Segment'] == 'Whale']
+    # Premium each policy and endorsement has earned by the as-of date, pro rata to its days on cover
+    df_premiums['Earned Premium'] = policy_earned_premium(df_premiums['Total'], df_premiums['Start Date'], df_premiums['End Date'], as_of)
 
+    # Visits per client within its premium periods (interval join and
+    # aggregation run by the configured backend; visits without a client name are left out)
+    # A visit counts once per premium row covering it, attached endorsements
+    # included, so each endorsement being attached once keeps its visits single
+    df_visits_agg = usage_by_client("visits", DATASET_COLUMNS["visits"], df_premiums, registry)
+    df_visits_agg.insert(0, 'Client Name', canonical_names(registry, df_visits_agg['client_id']))
 
-df_new = df[df['Cover Type'] == 'New']
-df_renew = df[df['Cover Type'] == 'Renewal']
-df_combined = df[df['Cover Type'].isin(['New', 'Renewal'])]
+    df_visits_agg['Visit Date min'] = pd.to_datetime(df_visits_agg['Visit Date min'], errors='coerce')
 
-df_endorsements = df[df['Cover Type'] == 'Endorsement']
+    # Extract 'Month' and 'Year' from the minimum visit date
+    df_visits_agg['Month'] = df_visits_agg['Visit Date min'].dt.strftime('%B')
+    df_visits_agg['Year'] = df_visits_agg['Visit Date min'].dt.year
 
-if not df.empty:
+    # Merge the aggregated visit data with the premium data
+    df_combined = pd.concat([df_visits_agg, df_premiums])
 
-    scale=1_000_000  # For millions
 
+    # Convert 'Start Date' to datetime
+    df_combined["Start Date"] = pd.to_datetime(df_combined["Start Date"])
+    df_combined["End Date"] = pd.to_datetime(df_combined["End Date"])
 
-    # Scale the sums
+    df = df_combined
 
-    # total_hares = (df_hares['Total Premium'].sum())/scale
-    # total_tiger = (df_tiger['Total Premium'].sum())/scale
-    # total_elephant = (df_elephants['Total Premium'].sum())/scale
-    # total_whale = (df_whale['Total Premium'].sum())/scale
+    # Integer month-year period key; rows sorted by it for range slicing
+    df = add_period(df)
 
-    total_new = (df_new["Total"].sum())/scale
-    total_renew = (df_renew["Total"].sum())/scale
-    total_pre = total_new +total_renew
-    total_endorsements_amount = df_endorsements["Total"].sum()/scale
-    total_pharm = df["Pharmacy Claim Amount sum"].sum()/scale
+    # Aggregate cube the KPI cards and charts are answered from
+    df_cube = build_cube(df, CUBE_MEASURES)
 
-    total_clients = df["Client Name"].nunique()
-    total_endorsements = df_endorsements["Client Name"].count()
-    num_new = df_new["Client Name"].nunique()
-    num_renew = df_renew["Client Name"].nunique()
-    num_visits = df["Visit ID count"].sum()
+    # Row positions of every sidebar filter value, and the rows in date order
+    filter_index = build_filter_index(df, FILTER_COLUMNS, date_column=DATE_COLUMN)
 
+    return df, df_cube, filter_index, df_unmatched_endorsements
 
-    # total_new_premium = (df["Total Premium_new"].sum())/scale
-    # total_endorsement = (df["Total Premium_endorsements"].sum())/scale
-    total_premium = (df["Total"].sum())/scale
-    total_days = df["Days Since Start"].sum()
-    total_days_on_cover = df['days_on_cover'].sum()
-    total_amount = (df["Total Amount sum"].sum())/scale
-    average_pre = (df["Total"].mean())/scale
-    average_days = df["Days Since Start"].mean()
 
-    earned_premium = (total_premium * total_days)/total_days_on_cover
-    loss_ratio_amount = total_amount / earned_premium
-    loss_ratio= (total_amount / earned_premium) *100
+# Function to load the page data: the prebuilt data of the current sources
+# when there is a build of them (python pipeline.py), else built by load_data
+def load_page_data(as_of):
+    prebuilt = read_artifacts("loss_ratio_view", as_of)
+    if prebuilt is None:
+        return load_data(as_of)
+    df, df_cube, df_unmatched_endorsements = prebuilt
+    if df_cube is None:
+        df_cube = build_cube(df, CUBE_MEASURES)
+    filter_index = build_filter_index(df, FILTER_COLUMNS, date_column=DATE_COLUMN)
+    return df, df_cube, filter_index, df_unmatched_endorsements
 
-    # Create 4-column layout for metric cards# Define CSS for the styled boxes and tooltips
-    st.markdown("""
-        <style>
-        .custom-subheader {
-            color: #e66c37;
-            text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.2);
-            padding: 10px;
-            border-radius: 5px;
-            display: inline-block;
-        }
-        .metric-box {
-            padding: 10px;
-            border-radius: 10px;
-            text-align: center;
-            margin: 10px;
-            font-size: 1.2em;
-            font-weight: bold;
-            box-shadow: 2px 2px 10px rgba(0, 0, 0, 0.1);
-            border: 1px solid #ddd;
-            position: relative;
-        }
-        .metric-title {
-            color: #e66c37; /* Change this color to your preferred title color */
-            font-size: 0.9em;
-            margin-bottom: 10px;
-        }
-        .metric-value {
-            color: #009DAE;
-            font-size: 1em;
-        }
 
+# Function to render the page
+def render(ctx):
+    # Centered and styled main title using inline styles
+    st.markdown('''
+        <style>
+            .main-title {
+                color: #e66c37; /* Title color */
+                text-align: center; /* Center align the title */
+                font-size: 3rem; /* Title font size */
+                font-weight: bold; /* Title font weight */
+                margin-bottom: .5rem; /* Space below the title */
+                text-shadow: 1px 1px 2px rgba(0, 0, 0, 0.1); /* Subtle text shadow */
+            }
+            div.block-container {
+                padding-top: 2rem; /* Padding for main content */
+            }
         </style>
-        """, unsafe_allow_html=True)
-
-    st.dataframe(df)
-
-    # Function to display metrics in styled boxes with tooltips
-    def display_metric(col, title, value):
-        col.markdown(f"""
-            <div class="metric-box">
-                <div class="metric-title">{title}</div>
-                <div class="metric-value">{value}</div>
-            </div>
-            """, unsafe_allow_html=True)
-
-
-    # Calculate key metrics
-    st.markdown('<h2 class="custom-subheader">For all Sales in Numbers</h2>', unsafe_allow_html=True)    
-
-    cols1,cols2, cols3 = st.columns(3)
+    ''', unsafe_allow_html=True)
 
-    display_metric(cols1, "Number of Clients", total_clients)
-    display_metric(cols2, "Number of New Business", num_new)
-    display_metric(cols3, "Number of Renewals", num_renew)
-    display_metric(cols1, "Number of Endorsements",total_endorsements)
-    display_metric(cols2, "Number of Visits", f"{num_visits:,.0f}")
+    st.markdown('<h1 class="main-title">LOSS RATIO VIEW WITH EXPECTED CLAIM AMOUNT</h1>', unsafe_allow_html=True)
+    st.caption(f"As at {ctx.as_of:%d %B %Y}")
 
-    # Calculate key metrics
-    st.markdown('<h2 class="custom-subheader">For all Sales Amount</h2>', unsafe_allow_html=True)    
+    df, df_cube, filter_index, df_unmatched_endorsements = get_derived("loss_ratio_view", load_page_data, sources=("premiums", "visits"), params=(ctx.as_of,))
 
-    cols1,cols2, cols3 = st.columns(3)
+    # Endorsements that could not be attached to any policy period of their client
+    if not df_unmatched_endorsements.empty:
+        with st.expander(f"{len(df_unmatched_endorsements)} endorsements outside every policy period"):
+            st.dataframe(df_unmatched_endorsements)
 
-    display_metric(cols1, "Total Premium", f"{total_premium:,.0f} M")
-    display_metric(cols2, "Total New Business Premium", f"{total_new:,.0f} M")
-    display_metric(cols3, "Total Renewal Premium", f"{total_renew:,.0f} M")
-    display_metric(cols1, "Total Endorsement Premium", f"{total_endorsements_amount:,.0f} M")
-    display_metric(cols2, "Total Expected Pharmacy Amount", f"{total_pharm:,.0f} M")
-    display_metric(cols3, "Total Expected Claim Amount", f"{total_amount:,.0f} M")
-    display_metric(cols1, "Average Premium per Client", f"{average_pre:,.0f} M")
+    # Clients with visits but no premium record under any spelling
+    df_unmatched_clients = unmatched_clients(get_client_registry(), "visits")
+    if not df_unmatched_clients.empty:
+        with st.expander(f"{len(df_unmatched_clients)} clients with visits but no premium record"):
+            st.dataframe(df_unmatched_clients)
 
-    st.markdown('<h2 class="custom-subheader">For Loss Ratio</h2>', unsafe_allow_html=True)    
-  
-    cols1,cols2, cols3 = st.columns(3)
 
-    display_metric(cols1, "Days Since  Premium Start", f"{total_days:,.0f} days")
-    display_metric(cols2, "Premium Duration (Days)", f"{total_days_on_cover:,.0f} days")
-    display_metric(cols3, "Average Days Since  Premium Start per Client", f"{average_days:,.0f} days")
-    display_metric(cols1, "Earned Premium", f"{earned_premium:,.0f} M")
-    display_metric(cols2, "Loss Ratio", f"{loss_ratio_amount:,.0f} M")
-    display_metric(cols3, "Percentage Loss Ratio", f"{loss_ratio: .0f} %")
 
+    # Inspect the merged DataFrame
 
-
-    # Ensure 'Start Date' is in datetime format
-    df['Start Date'] = pd.to_datetime(df['Start Date'], errors='coerce')
-
-
-    df['earned_premium'] = (total_premium * df["Days Since Start"].sum()) / total_days_on_cover
-
-    df['Loss Ratio'] = (total_amount / earned_premium)
-
- 
     # Sidebar styling and logo
     st.markdown("""
         <style>
@@ -508,7 +209,7 @@ if not df.empty:
             border-radius: 10px;
             box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
         }
-        .sidebar .sidebar-content h3 {
+        .sidebar .sidebar-content h2 {
             color: #007BFF; /* Change this color to your preferred title color */
             font-size: 1.5em;
             margin-bottom: 20px;
@@ -542,356 +243,757 @@ if not df.empty:
             height: auto;
             border-radius: 50%;
         }
-                
+
         </style>
         """, unsafe_allow_html=True)
 
-    cols1, cols2 = st.columns(2)
-
-    custom_colors = ["#009DAE", "#e66c37", "#461b09", "#f8a785", "#CC3636"]
-
-
-
-    # Group by day and sum the totals for combined new and renewals, and endorsements
-    area_chart_combined = df_combined.groupby(df_combined["Start Date"].dt.strftime("%Y-%m-%d"))['Total'].sum().reset_index(name='Total Combined')
-    area_chart_endorsement = df_endorsements.groupby(df_endorsements["Start Date"].dt.strftime("%Y-%m-%d"))['Total'].sum().reset_index(name='Total Endorsements')
-
-    with cols1:
-        # Merge the data frames on the 'Start Date'
-        area_chart = pd.merge(area_chart_combined, area_chart_endorsement, on='Start Date', how='outer')
-
-        # Fill NaN values with 0
-        area_chart = area_chart.fillna(0)
-
-        # Create the time series chart using Plotly
-        fig = go.Figure()
-
-        # Add Total Combined trace
-        fig.add_trace(go.Scatter(
-            x=area_chart['Start Date'],
-            y=area_chart['Total Combined'],
-            mode='lines',
-            name='Total Premium (New & Renewals)',
-            line=dict(color='#009DAE', width=2),
-            fill='tozeroy',
-            fillcolor='rgba(0, 157, 174, 0.5)'
-        ))
-
-        # Add Total Endorsements trace
-        fig.add_trace(go.Scatter(
-            x=area_chart['Start Date'],
-            y=area_chart['Total Endorsements'],
-            mode='lines',
-            name='Total Endorsements',
-            line=dict(color='#e66c37', width=2),
-            fill='tozeroy',
-            fillcolor='rgba(230, 108, 55, 0.5)'
-        ))
-
-        # Update layout
-        fig.update_layout(
-            xaxis_title='Date',
-            yaxis_title='Amount',
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), type='category'),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height=450
-        )
-
-        # Rotate x-axis labels for better readability
-        fig.update_xaxes(tickangle=45)
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Total Combined Premium and Total Endorsements Over Time</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig, use_container_width=True)
-
-
-
-    # Group data by 'Year' and calculate the sum of Total Premium and Total Endorsements
-    yearly_data_combined = df_combined.groupby('Year')['Total'].sum().reset_index(name='Total Premium')
-    yearly_data_endorsements = df_endorsements.groupby('Year')['Total'].sum().reset_index(name='Total Endorsements')
-
-    # Merge the data frames on the 'Year'
-    yearly_data = pd.merge(yearly_data_combined, yearly_data_endorsements, on='Year', how='outer')
-
-    with cols2:
-        # Fill NaN values with 0
-        yearly_data = yearly_data.fillna(0)
-
-        # Define custom colors
-        custom_colors = ['#009DAE', '#e66c37']
-
-        # Create the grouped bar chart for Total Premium and Endorsements
-        fig_yearly_avg_premium = go.Figure()
-
-        # Add Total Premium bar trace
-        fig_yearly_avg_premium.add_trace(go.Bar(
-            x=yearly_data['Year'],
-            y=yearly_data['Total Premium'],
-            name='Total Premium',
-            textposition='inside',
-            textfont=dict(color='white'),
-            hoverinfo='x+y+name',
-            marker_color=custom_colors[0]
-        ))
-
-        # Add Total Endorsements bar trace
-        fig_yearly_avg_premium.add_trace(go.Bar(
-            x=yearly_data['Year'],
-            y=yearly_data['Total Endorsements'],
-            name='Total Endorsements',
-            textposition='inside',
-            textfont=dict(color='white'),
-            hoverinfo='x+y+name',
-            marker_color=custom_colors[1]
-        ))
-
-        fig_yearly_avg_premium.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Year",
-            yaxis_title="Total Amount",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), type='category'),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height=450
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Yearly Distribution of Total Premium and Endorsements</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
-
-
-    cols1, cols2 = st.columns(2)
-
-    # Group data by 'Year' and calculate the sum of Total Premium and Loss Ratio
-    yearly_data = df.groupby('Year')[['Total', 'Total Amount sum']].sum().reset_index()
-
-    with cols1:
-        # Create the grouped bar chart for Total Premium and Loss Ratio
-        fig_yearly_avg_premium = go.Figure()
-
-        # Add Total Premium bar trace
-        fig_yearly_avg_premium.add_trace(go.Bar(
-            x=yearly_data['Year'],
-            y=yearly_data['Total'],
-            name='Total Premium',
-            textposition='inside',
-            textfont=dict(color='white'),
-            hoverinfo='x+y+name',
-            marker_color=custom_colors[0]
-        ))
-
-        # Add Loss Ratio bar trace
-        fig_yearly_avg_premium.add_trace(go.Bar(
-            x=yearly_data['Year'],
-            y=yearly_data['Total Amount sum'],
-            name='Expected Claim Amount',
-            textposition='inside',
-            textfont=dict(color='white'),
-            hoverinfo='x+y+name',
-            marker_color=custom_colors[1]
-        ))
-
-        fig_yearly_avg_premium.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Year",
-            yaxis_title="Expected Claim Amount",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), type='category'),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height=450
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Yearly Distribution of Total Premium and Expected Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
-
-
-
-    # Group data by 'Year' and calculate the sum of Total Premium and Loss Ratio
-    yearly_data = df.groupby('Month')[['Total', 'Total Amount sum']].sum().reset_index()
-
-
-
-    with cols2:
-        # Create the grouped bar chart for Total Premium and Loss Ratio
-        fig_yearly_avg_premium = go.Figure()
-
-        # Add Total Premium bar trace
-        fig_yearly_avg_premium.add_trace(go.Bar(
-            x=yearly_data['Month'],
-            y=yearly_data['Total'],
-            name='Total Premium',
-            textposition='inside',
-            textfont=dict(color='white'),
-            hoverinfo='x+y+name',
-            marker_color=custom_colors[0]
-        ))
-
-        # Add Loss Ratio bar trace
-        fig_yearly_avg_premium.add_trace(go.Bar(
-            x=yearly_data['Month'],
-            y=yearly_data['Total Amount sum'],
-            name='Expected Claim Amount',
-            textposition='inside',
-            textfont=dict(color='white'),
-            hoverinfo='x+y+name',
-            marker_color=custom_colors[1]
-        ))
-
-        fig_yearly_avg_premium.update_layout(
-            barmode='group',  # Grouped bar chart
-            xaxis_title="Month",
-            yaxis_title="Expected Claim Amount",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), type='category'),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50),
-            height=450
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Monthly Distribution of Total Premium and Expected Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
-
-
-    cols1, cols2 = st.columns(2)
-
-    # Sort the DataFrame by Loss Ratio in descending order and select the top 10 clients
-    top_10_clients = df.sort_values(by='Loss Ratio', ascending=False).head(10)
-
-    # Convert Loss Ratio to percentage
-    top_10_clients['Loss Ratio (%)'] = top_10_clients['Loss Ratio'] * 100
-
-    # Define a single color for all bars
-    single_color = '#009DAE'
-
-    with cols1:
-        # Create the bar chart for Loss Ratio by Client Name
-        fig = go.Figure()
-
-        # Add bars for each Client Name
-        fig.add_trace(go.Bar(
-            x=top_10_clients['Client Name'],
-            y=top_10_clients['Loss Ratio (%)'],
-            name='Loss Ratio (%)',
-            text=[f'{value:.1f}%' for value in top_10_clients['Loss Ratio (%)']],
-            textposition='auto',
-            marker_color=single_color  # Use a single color for all bars
-        ))
-
-        fig.update_layout(
-            barmode='group',
-            yaxis_title="Loss Ratio (%)",
-            xaxis_title="Client Name",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50)
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 10 Clients by Loss Ratio (%)</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig, use_container_width=True)
-
-
-
-
-    # Sort the DataFrame by Loss Ratio in descending order and select the top 10 clients
-    top_10_clients = df.sort_values(by='Total Amount sum', ascending=False).head(10)
-
-    # Define a single color for all bars
-    single_color = '#009DAE'
-
-    with cols2:
-        # Create the bar chart for Loss Ratio by Client Name
-        fig = go.Figure()
-
-        # Add bars for each Client Name
-        fig.add_trace(go.Bar(
-            x=top_10_clients['Client Name'],
-            y=top_10_clients['Total Amount sum'],
-            name='Visit amount',
-            text=[f'{value:.2f}' for value in top_10_clients['Total Amount sum']],
-            textposition='auto',
-            marker_color=single_color 
-        ))
-
-        fig.update_layout(
-            barmode='group',
-            yaxis_title="Expected Claim Amount",
-            xaxis_title="Client Name",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50)
-        )
-
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 10 Clients by Expected Claim Amount</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig, use_container_width=True)
-
-    cl1, cl2 =st.columns(2)
 
 
-    # Sort the DataFrame by Loss Ratio in descending order and select the top 10 clients
-    top_10_clients = df.sort_values(by='Total', ascending=False).head(10)
+    # Sort months based on their order
+    sorted_months = sorted(df['Month'].dropna().unique(), key=lambda x: month_order[x])
 
-    # Define a single color for all bars
-    single_color = '#009DAE'
 
-    with cl1:
-        # Create the bar chart for Loss Ratio by Client Name
-        fig = go.Figure()
+    # Sidebar for filters
+    st.sidebar.header("Filters")
+    year = st.sidebar.multiselect("Select Year", options=sorted(df['Year'].dropna().unique()))
+    month = st.sidebar.multiselect("Select Month", options=sorted_months)
+    cover = st.sidebar.multiselect("Select Cover Type", options=df['Cover Type'].unique())
+    # segment = st.sidebar.multiselect("Select Client Segment", options=df['Client Segment'].unique())
+    client_names = sorted(df['Client Name'].dropna().unique())
+    client_name = st.sidebar.multiselect("Select Client Name", options=client_names)
 
-        # Add bars for each Client Name
-        fig.add_trace(go.Bar(
-            x=top_10_clients['Client Name'],
-            y=top_10_clients['Total'],
-            name='Premium amount',
-            text=[f'{value:.2f}' for value in top_10_clients['Total']],
-            textposition='auto',
-            marker_color=single_color 
-        ))
-
-        fig.update_layout(
-            barmode='group',
-            yaxis_title="Total Premium",
-            xaxis_title="Client Name",
-            font=dict(color='Black'),
-            xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
-            margin=dict(l=0, r=0, t=30, b=50)
-        )
+    # Apply filters to the DataFrame: one take over the precomputed filter index,
+    # memoized per filter state so switching back to an earlier choice is a lookup
+    selections = {
+        'Start Year': year,
+        'Start Month': month,
+        'Cover Type': cover,
+        'Client Name': client_name,
+    }
+    df_loaded = df
+    df = get_filtered("loss_ratio_view", selections, lambda: apply_filters(df_loaded, filter_index, selections),
+                      params=(ctx.as_of,))
+
+    # Determine the filter description
+    filter_description = ""
+    if year:
+        filter_description += f"{', '.join(map(str, year))} "
+    if cover:
+        filter_description += f"{', '.join(map(str, cover))} "
+    if month:
+        filter_description += f"{', '.join(month)} "
+    if not filter_description:
+        filter_description = "All data"
+
+
+    # Get minimum and maximum dates for the date input
+    startDate = df["Start Date"].min()
+    endDate = df["End Date"].max()
+
+    # Define CSS for the styled date input boxes
+    st.markdown("""
+        <style>
+        .date-input-box {
+            border-radius: 10px;
+            text-align: left;
+            margin: 5px;
+            font-size: 1.2em;
+            font-weight: bold;
+        }
+        .date-input-title {
+            font-size: 1.2em;
+            margin-bottom: 5px;
+        }
+        </style>
+        """, unsafe_allow_html=True)
 
-        # Display the chart in Streamlit
-        st.markdown('<h3 class="custom-subheader">Top 10 Clients by Premium</h3>', unsafe_allow_html=True)
-        st.plotly_chart(fig, use_container_width=True)
 
 
+    # Create 2-column layout for date inputs
+    col1, col2 = st.columns(2)
 
 
- # Calculate the Total Premium by Client Segment
-    int_owner = df.groupby("Cover Type")["Total"].sum().reset_index()
-    int_owner.columns = ["Cover Type", "Total Premium"]    
+    # Display date inputs
+    with col1:
+        date1 = pd.to_datetime(display_date_input(col1, "Start Date", startDate, startDate, endDate))
 
-    with cl2:
-        # Display the header
-        st.markdown('<h3 class="custom-subheader">Total Sales by Cover Type</h3>', unsafe_allow_html=True)
+    with col2:
+        date2 = pd.to_datetime(display_date_input(col2, "End Date", endDate, startDate, endDate))
 
+    # Narrow to the picked dates as well: two binary searches over the sorted
+    # Start Date index and one take (rows without a Start Date are kept)
+    rows_before_dates = len(df)
+    df = get_filtered("loss_ratio_view", (selections, date1, date2),
+                      lambda: apply_filters(df_loaded, filter_index, selections, date_range=(date1, date2)),
+                      params=(ctx.as_of,))
+    dates_narrowed = len(df) < rows_before_dates
 
-        # Create a donut chart
-        fig = px.pie(int_owner, names="Cover Type", values="Total Premium", hole=0.5, template="plotly_dark", color_discrete_sequence=custom_colors)
-        fig.update_traces(textposition='inside', textinfo='value+percent')
-        fig.update_layout(height=450, margin=dict(l=0, r=10, t=30, b=50))
 
-        # Display the chart in Streamlit
-        st.plotly_chart(fig, use_container_width=True)
 
+    # Handle non-finite values in 'Start Year' column
+    df['Year'] = df['Year'].fillna(0).astype(int)  # Replace NaN with 0 or any specific value
 
+    # Handle non-finite values in 'Start Month' column
+    df['Month'] = df['Month'].fillna('Unknown')
 
+    # Month-Year periods present in the data, in order (rows are sorted by period at load)
+    periods = df['Period'].unique().tolist()
+
+    # Select slider for month-year range
+    start_period, end_period = st.select_slider(
+        "Select Month-Year Range",
+        options=periods,
+        value=(periods[0], periods[-1]),
+        format_func=period_label
+    )
+
+    # Filter DataFrame to the selected month-year range
+    df = period_slice(df, start_period, end_period)
+
+
+
+    # # Filter the concatenated DataFrame to include only endorsements
+    # df_hares = df[df['Client Segment'] == 'Hares']
+    # df_elephants = df[df['Client Segment'] == 'Elephant']
+    # df_tiger = df[df['Client Segment'] == 'Tigers']
+    # df_whale = df[df['Client Segment'] == 'Whale']
+
+
+    df_combined = df[df['Cover Type'].isin(['New', 'Renewal'])]
+
+    df_endorsements = df[df['Cover Type'] == 'Endorsement']
+
+    # KPI cards and the Year / Month / Cover Type charts are answered from the aggregate
+    # cube. A narrowed date range is finer than the cube's month grain, so the cube is
+    # then built from the remaining rows instead
+    if dates_narrowed:
+        cube = build_cube(df, CUBE_MEASURES)
+    else:
+        cube = slice_cube(df_cube, cover=cover, client_name=client_name, month_range=(start_period, end_period))
+    cube_new = cube[cube['Cover Type'] == 'New']
+    cube_renew = cube[cube['Cover Type'] == 'Renewal']
+    cube_combined = cube[cube['Cover Type'].isin(['New', 'Renewal'])]
+    cube_endorsements = cube[cube['Cover Type'] == 'Endorsement']
+
+    if not df.empty:
+
+        scale=1_000_000  # For millions
+
+
+        # Scale the sums
+
+        # total_hares = (df_hares['Total Premium'].sum())/scale
+        # total_tiger = (df_tiger['Total Premium'].sum())/scale
+        # total_elephant = (df_elephants['Total Premium'].sum())/scale
+        # total_whale = (df_whale['Total Premium'].sum())/scale
+
+        total_new = (cube_new["Total"].sum())/scale
+        total_renew = (cube_renew["Total"].sum())/scale
+        total_endorsements_amount = cube_endorsements["Total"].sum()/scale
+        total_pharm = cube["Pharmacy Claim Amount sum"].sum()/scale
+
+        total_clients = cube["Client Name"].nunique()
+        total_endorsements = cube_endorsements["Rows"].sum()
+        num_new = cube_new["Client Name"].nunique()
+        num_renew = cube_renew["Client Name"].nunique()
+        num_visits = cube["Visit ID count"].sum()
+
+
+        # total_new_premium = (df["Total Premium_new"].sum())/scale
+        # total_endorsement = (df["Total Premium_endorsements"].sum())/scale
+        total_premium = (cube["Total"].sum())/scale
+        total_days = cube["Days Since Start"].sum()
+        total_days_on_cover = cube['days_on_cover'].sum()
+        total_amount = (cube["Total Amount sum"].sum())/scale
+        average_pre = cube_mean(cube, "Total")/scale
+        average_days = cube_mean(cube, "Days Since Start")
+
+        # Earned premium summed over the policies, each pro rata to its own cover
+        earned_premium = cube["Earned Premium"].sum()/scale
+        loss_ratio_amount = total_amount / earned_premium
+        loss_ratio= (total_amount / earned_premium) *100
+
+        # Create 4-column layout for metric cards# Define CSS for the styled boxes and tooltips
+        st.markdown("""
+            <style>
+            .custom-subheader {
+                color: #e66c37;
+                text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.2);
+                padding: 10px;
+                border-radius: 5px;
+                display: inline-block;
+            }
+            .metric-box {
+                padding: 10px;
+                border-radius: 10px;
+                text-align: center;
+                margin: 10px;
+                font-size: 1.2em;
+                font-weight: bold;
+                box-shadow: 2px 2px 10px rgba(0, 0, 0, 0.1);
+                border: 1px solid #ddd;
+                position: relative;
+            }
+            .metric-title {
+                color: #e66c37; /* Change this color to your preferred title color */
+                font-size: 0.9em;
+                margin-bottom: 10px;
+            }
+            .metric-value {
+                color: #009DAE;
+                font-size: 1em;
+            }
+
+            </style>
+            """, unsafe_allow_html=True)
 
+        # The filtered rows, one page at a time (sorting and search run on the server)
+        paged_table(df, "loss_ratio_view", (selections, date1, date2, start_period, end_period), key="loss_ratio_view_table",
+                    default_columns=TABLE_COLUMNS, params=(ctx.as_of,))
+
+        # Calculate key metrics
+        st.markdown('<h2 class="custom-subheader">For all Sales in Numbers</h2>', unsafe_allow_html=True)    
+
+        cols1,cols2, cols3 = st.columns(3)
+
+        display_metric(cols1, "Number of Clients", total_clients)
+        display_metric(cols2, "Number of New Business", num_new)
+        display_metric(cols3, "Number of Renewals", num_renew)
+        display_metric(cols1, "Number of Endorsements",total_endorsements)
+        display_metric(cols2, "Number of Visits", f"{num_visits:,.0f}")
+
+        # Calculate key metrics
+        st.markdown('<h2 class="custom-subheader">For all Sales Amount</h2>', unsafe_allow_html=True)    
+
+        cols1,cols2, cols3 = st.columns(3)
+
+        display_metric(cols1, "Total Premium", f"{total_premium:,.0f} M")
+        display_metric(cols2, "Total New Business Premium", f"{total_new:,.0f} M")
+        display_metric(cols3, "Total Renewal Premium", f"{total_renew:,.0f} M")
+        display_metric(cols1, "Total Endorsement Premium", f"{total_endorsements_amount:,.0f} M")
+        display_metric(cols2, "Total Expected Pharmacy Amount", f"{total_pharm:,.0f} M")
+        display_metric(cols3, "Total Expected Claim Amount", f"{total_amount:,.0f} M")
+        display_metric(cols1, "Average Premium per Client", f"{average_pre:,.0f} M")
+
+        st.markdown('<h2 class="custom-subheader">For Loss Ratio</h2>', unsafe_allow_html=True)    
+
+        cols1,cols2, cols3 = st.columns(3)
+
+        display_metric(cols1, "Days Since  Premium Start", f"{total_days:,.0f} days")
+        display_metric(cols2, "Premium Duration (Days)", f"{total_days_on_cover:,.0f} days")
+        display_metric(cols3, "Average Days Since  Premium Start per Client", f"{average_days:,.0f} days")
+        display_metric(cols1, "Earned Premium", f"{earned_premium:,.0f} M")
+        display_metric(cols2, "Loss Ratio", f"{loss_ratio_amount:,.0f} M")
+        display_metric(cols3, "Percentage Loss Ratio", f"{loss_ratio: .0f} %")
+
+
+
+        # Ensure 'Start Date' is in datetime format
+        df['Start Date'] = pd.to_datetime(df['Start Date'], errors='coerce')
+
+
+        df['earned_premium'] = earned_premium
+
+        df['Loss Ratio'] = (total_amount / earned_premium)
+
+
+        # Sidebar styling and logo
+        st.markdown("""
+            <style>
+            .sidebar .sidebar-content {
+                background-color: #f0f2f6;
+                padding: 20px;
+                border-radius: 10px;
+                box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+            }
+            .sidebar .sidebar-content h3 {
+                color: #007BFF; /* Change this color to your preferred title color */
+                font-size: 1.5em;
+                margin-bottom: 20px;
+                text-align: center;
+            }
+            .sidebar .sidebar-content .filter-title {
+                color: #e66c37;
+                font-size: 1.2em;
+                font-weight: bold;
+                margin-top: 20px;
+                margin-bottom: 10px;
+                text-align: center;
+            }
+            .sidebar .sidebar-content .filter-header {
+                color: #e66c37; /* Change this color to your preferred header color */
+                font-size: 2.5em;
+                font-weight: bold;
+                margin-top: 20px;
+                margin-bottom: 20px;
+                text-align: center;
+            }
+            .sidebar .sidebar-content .filter-multiselect {
+                margin-bottom: 15px;
+            }
+            .sidebar .sidebar-content .logo {
+                text-align: center;
+                margin-bottom: 20px;
+            }
+            .sidebar .sidebar-content .logo img {
+                max-width: 80%;
+                height: auto;
+                border-radius: 50%;
+            }
+
+            </style>
+            """, unsafe_allow_html=True)
 
+        cols1, cols2 = st.columns(2)
+
+        custom_colors = ["#009DAE", "#e66c37", "#461b09", "#f8a785", "#CC3636"]
+
+
+
+        # Group by day and sum the totals for combined new and renewals, and endorsements
+        area_chart_combined = df_combined.groupby(df_combined["Start Date"].dt.strftime("%Y-%m-%d"))['Total'].sum().reset_index(name='Total Combined')
+        area_chart_endorsement = df_endorsements.groupby(df_endorsements["Start Date"].dt.strftime("%Y-%m-%d"))['Total'].sum().reset_index(name='Total Endorsements')
+
+        with cols1:
+            # Merge the data frames on the 'Start Date'
+            area_chart = pd.merge(area_chart_combined, area_chart_endorsement, on='Start Date', how='outer')
+
+            # Fill NaN values with 0
+            area_chart = area_chart.fillna(0)
+
+            # Create the time series chart using Plotly
+            fig = go.Figure()
+
+            # Add Total Combined trace
+            fig.add_trace(go.Scatter(
+                x=area_chart['Start Date'],
+                y=area_chart['Total Combined'],
+                mode='lines',
+                name='Total Premium (New & Renewals)',
+                line=dict(color='#009DAE', width=2),
+                fill='tozeroy',
+                fillcolor='rgba(0, 157, 174, 0.5)'
+            ))
+
+            # Add Total Endorsements trace
+            fig.add_trace(go.Scatter(
+                x=area_chart['Start Date'],
+                y=area_chart['Total Endorsements'],
+                mode='lines',
+                name='Total Endorsements',
+                line=dict(color='#e66c37', width=2),
+                fill='tozeroy',
+                fillcolor='rgba(230, 108, 55, 0.5)'
+            ))
+
+            # Update layout
+            fig.update_layout(
+                xaxis_title='Date',
+                yaxis_title='Amount',
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), type='category'),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=450
+            )
+
+            # Rotate x-axis labels for better readability
+            fig.update_xaxes(tickangle=45)
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Total Combined Premium and Total Endorsements Over Time</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig, use_container_width=True)
+
+
+
+        # Group data by 'Year' and calculate the sum of Total Premium and Total Endorsements
+        yearly_data_combined = cube_combined.groupby('Year')['Total'].sum().reset_index(name='Total Premium')
+        yearly_data_endorsements = cube_endorsements.groupby('Year')['Total'].sum().reset_index(name='Total Endorsements')
+
+        # Merge the data frames on the 'Year'
+        yearly_data = pd.merge(yearly_data_combined, yearly_data_endorsements, on='Year', how='outer')
+
+        with cols2:
+            # Fill NaN values with 0
+            yearly_data = yearly_data.fillna(0)
+
+            # Define custom colors
+            custom_colors = ['#009DAE', '#e66c37']
+
+            # Create the grouped bar chart for Total Premium and Endorsements
+            fig_yearly_avg_premium = go.Figure()
+
+            # Add Total Premium bar trace
+            fig_yearly_avg_premium.add_trace(go.Bar(
+                x=yearly_data['Year'],
+                y=yearly_data['Total Premium'],
+                name='Total Premium',
+                textposition='inside',
+                textfont=dict(color='white'),
+                hoverinfo='x+y+name',
+                marker_color=custom_colors[0]
+            ))
+
+            # Add Total Endorsements bar trace
+            fig_yearly_avg_premium.add_trace(go.Bar(
+                x=yearly_data['Year'],
+                y=yearly_data['Total Endorsements'],
+                name='Total Endorsements',
+                textposition='inside',
+                textfont=dict(color='white'),
+                hoverinfo='x+y+name',
+                marker_color=custom_colors[1]
+            ))
+
+            fig_yearly_avg_premium.update_layout(
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Year",
+                yaxis_title="Total Amount",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), type='category'),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=450
+            )
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Yearly Distribution of Total Premium and Endorsements</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
+
+
+        # Premium earned by the filtered policies on every day from the first
+        # start to the last end, in one pass (see earned.earned_premium_curve)
+        df_policies = df[df['Start Date'].notna() & df['End Date'].notna()]
+        if not df_policies.empty:
+            earned_curve = earned_premium_curve(df_policies['Total'], df_policies['Start Date'], df_policies['End Date'],
+                                                df_policies['Start Date'].min(), df_policies['End Date'].max())
+
+            fig = go.Figure()
+            fig.add_trace(go.Scatter(
+                x=earned_curve.index,
+                y=earned_curve.values,
+                mode='lines',
+                name='Earned Premium',
+                line=dict(color='#009DAE', width=2),
+                fill='tozeroy',
+                fillcolor='rgba(0, 157, 174, 0.5)'
+            ))
+
+            # Mark the as-of date the KPI cards are counted to
+            fig.add_vline(x=ctx.as_of, line=dict(color='#e66c37', width=2, dash='dash'))
+
+            fig.update_layout(
+                xaxis_title='Date',
+                yaxis_title='Earned Premium',
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=450
+            )
+
+            st.markdown('<h3 class="custom-subheader">Earned Premium Over Time</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig, use_container_width=True)
+
+        # Monthly, rolling 3-month and trailing 12-month loss ratios of the
+        # filtered premium rows, overall and per client: visits in the month of
+        # their own date over the premium earned in each month (see
+        # trends.loss_ratio_series), memoized per filter state
+        # The visits carry registry client_ids, so they are kept on the registry's
+        # sources and rules version as well as on the visits themselves
+        registry_sources, rules_version = registry_inputs()
+        df_events = get_derived("loss_ratio_view_visits", lambda _: usage_events("visits", DATASET_COLUMNS["visits"], get_client_registry()),
+                                sources=tuple(dict.fromkeys(registry_sources + ("visits",))), params=(rules_version,))
+        ratio_series, client_series = get_filtered("loss_ratio_view", ("loss ratio series", selections, date1, date2, start_period, end_period), lambda: (
+            loss_ratio_series(df_events, "Total Amount", "Visit Date", df_policies, ctx.as_of),
+            loss_ratio_series(df_events, "Total Amount", "Visit Date", df_policies, ctx.as_of, by="Client Name"),
+        ), params=(ctx.as_of,))
+        top_premium_clients = cube.groupby("Client Name")["Total"].sum().nlargest(10).index
+        client_series = client_series[(client_series["Window"] == "Trailing 12 Months")
+                                      & client_series["Client Name"].isin(top_premium_clients)]
+
+        if not ratio_series.empty:
+            cols1, cols2 = st.columns(2)
+
+            with cols1:
+                fig = go.Figure()
+
+                # One line per window
+                for window, color in zip(WINDOWS, ["#009DAE", "#e66c37", "#461b09"]):
+                    window_series = ratio_series[ratio_series["Window"] == window]
+                    fig.add_trace(go.Scatter(
+                        x=window_series["Month-Year"],
+                        y=window_series["Loss Ratio"] * 100,
+                        mode='lines+markers',
+                        name=window,
+                        line=dict(color=color, width=2)
+                    ))
+
+                fig.update_layout(
+                    xaxis_title="Month-Year",
+                    yaxis_title="Loss Ratio (%)",
+                    font=dict(color='Black'),
+                    xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), type='category'),
+                    yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                    margin=dict(l=0, r=0, t=30, b=50),
+                    height=450
+                )
+                fig.update_xaxes(tickangle=45)
+
+                st.markdown('<h3 class="custom-subheader">Loss Ratio Over Time</h3>', unsafe_allow_html=True)
+                st.plotly_chart(fig, use_container_width=True)
+
+            with cols2:
+                fig = go.Figure()
+
+                # One line per client, for the 10 clients with the most premium
+                for client in top_premium_clients:
+                    single_client = client_series[client_series["Client Name"] == client]
+                    fig.add_trace(go.Scatter(
+                        x=single_client["Month-Year"],
+                        y=single_client["Loss Ratio"] * 100,
+                        mode='lines',
+                        name=client
+                    ))
+
+                fig.update_layout(
+                    xaxis_title="Month-Year",
+                    yaxis_title="Loss Ratio (%)",
+                    font=dict(color='Black'),
+                    xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), type='category'),
+                    yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                    margin=dict(l=0, r=0, t=30, b=50),
+                    height=450
+                )
+                fig.update_xaxes(tickangle=45)
+
+                st.markdown('<h3 class="custom-subheader">Trailing 12-Month Loss Ratio of the Top 10 Clients by Premium</h3>', unsafe_allow_html=True)
+                st.plotly_chart(fig, use_container_width=True)
+
+
+
+        cols1, cols2 = st.columns(2)
+
+        # Group data by 'Year' and calculate the sum of Total Premium and Loss Ratio
+        yearly_data = cube.groupby('Year')[['Total', 'Total Amount sum']].sum().reset_index()
+
+        with cols1:
+            # Create the grouped bar chart for Total Premium and Loss Ratio
+            fig_yearly_avg_premium = go.Figure()
+
+            # Add Total Premium bar trace
+            fig_yearly_avg_premium.add_trace(go.Bar(
+                x=yearly_data['Year'],
+                y=yearly_data['Total'],
+                name='Total Premium',
+                textposition='inside',
+                textfont=dict(color='white'),
+                hoverinfo='x+y+name',
+                marker_color=custom_colors[0]
+            ))
+
+            # Add Loss Ratio bar trace
+            fig_yearly_avg_premium.add_trace(go.Bar(
+                x=yearly_data['Year'],
+                y=yearly_data['Total Amount sum'],
+                name='Expected Claim Amount',
+                textposition='inside',
+                textfont=dict(color='white'),
+                hoverinfo='x+y+name',
+                marker_color=custom_colors[1]
+            ))
+
+            fig_yearly_avg_premium.update_layout(
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Year",
+                yaxis_title="Expected Claim Amount",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), type='category'),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=450
+            )
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Yearly Distribution of Total Premium and Expected Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
+
+
+
+        # Group data by 'Year' and calculate the sum of Total Premium and Loss Ratio
+        yearly_data = cube.groupby('Month')[['Total', 'Total Amount sum']].sum().reset_index()
+
+
+
+        with cols2:
+            # Create the grouped bar chart for Total Premium and Loss Ratio
+            fig_yearly_avg_premium = go.Figure()
+
+            # Add Total Premium bar trace
+            fig_yearly_avg_premium.add_trace(go.Bar(
+                x=yearly_data['Month'],
+                y=yearly_data['Total'],
+                name='Total Premium',
+                textposition='inside',
+                textfont=dict(color='white'),
+                hoverinfo='x+y+name',
+                marker_color=custom_colors[0]
+            ))
+
+            # Add Loss Ratio bar trace
+            fig_yearly_avg_premium.add_trace(go.Bar(
+                x=yearly_data['Month'],
+                y=yearly_data['Total Amount sum'],
+                name='Expected Claim Amount',
+                textposition='inside',
+                textfont=dict(color='white'),
+                hoverinfo='x+y+name',
+                marker_color=custom_colors[1]
+            ))
+
+            fig_yearly_avg_premium.update_layout(
+                barmode='group',  # Grouped bar chart
+                xaxis_title="Month",
+                yaxis_title="Expected Claim Amount",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12), type='category'),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50),
+                height=450
+            )
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Monthly Distribution of Total Premium and Expected Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig_yearly_avg_premium, use_container_width=True)
+
+
+        cols1, cols2 = st.columns(2)
+
+        # Sort the DataFrame by Loss Ratio in descending order and select the top 10 clients
+        top_10_clients = df.sort_values(by='Loss Ratio', ascending=False).head(10)
+
+        # Convert Loss Ratio to percentage
+        top_10_clients['Loss Ratio (%)'] = top_10_clients['Loss Ratio'] * 100
+
+        # Define a single color for all bars
+        single_color = '#009DAE'
+
+        with cols1:
+            # Create the bar chart for Loss Ratio by Client Name
+            fig = go.Figure()
+
+            # Add bars for each Client Name
+            fig.add_trace(go.Bar(
+                x=top_10_clients['Client Name'],
+                y=top_10_clients['Loss Ratio (%)'],
+                name='Loss Ratio (%)',
+                text=[f'{value:.1f}%' for value in top_10_clients['Loss Ratio (%)']],
+                textposition='auto',
+                marker_color=single_color  # Use a single color for all bars
+            ))
+
+            fig.update_layout(
+                barmode='group',
+                yaxis_title="Loss Ratio (%)",
+                xaxis_title="Client Name",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50)
+            )
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Top 10 Clients by Loss Ratio (%)</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig, use_container_width=True)
+
+
+
+        # Sort the DataFrame by Loss Ratio in descending order and select the top 10 clients
+        top_10_clients = df.sort_values(by='Total Amount sum', ascending=False).head(10)
+
+        # Define a single color for all bars
+        single_color = '#009DAE'
+
+        with cols2:
+            # Create the bar chart for Loss Ratio by Client Name
+            fig = go.Figure()
+
+            # Add bars for each Client Name
+            fig.add_trace(go.Bar(
+                x=top_10_clients['Client Name'],
+                y=top_10_clients['Total Amount sum'],
+                name='Visit amount',
+                text=[f'{value:.2f}' for value in top_10_clients['Total Amount sum']],
+                textposition='auto',
+                marker_color=single_color 
+            ))
+
+            fig.update_layout(
+                barmode='group',
+                yaxis_title="Expected Claim Amount",
+                xaxis_title="Client Name",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50)
+            )
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Top 10 Clients by Expected Claim Amount</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig, use_container_width=True)
+
+        cl1, cl2 =st.columns(2)
+
+
+        # Sort the DataFrame by Loss Ratio in descending order and select the top 10 clients
+        top_10_clients = df.sort_values(by='Total', ascending=False).head(10)
+
+        # Define a single color for all bars
+        single_color = '#009DAE'
+
+        with cl1:
+            # Create the bar chart for Loss Ratio by Client Name
+            fig = go.Figure()
+
+            # Add bars for each Client Name
+            fig.add_trace(go.Bar(
+                x=top_10_clients['Client Name'],
+                y=top_10_clients['Total'],
+                name='Premium amount',
+                text=[f'{value:.2f}' for value in top_10_clients['Total']],
+                textposition='auto',
+                marker_color=single_color 
+            ))
+
+            fig.update_layout(
+                barmode='group',
+                yaxis_title="Total Premium",
+                xaxis_title="Client Name",
+                font=dict(color='Black'),
+                xaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                yaxis=dict(title_font=dict(size=14), tickfont=dict(size=12)),
+                margin=dict(l=0, r=0, t=30, b=50)
+            )
+
+            # Display the chart in Streamlit
+            st.markdown('<h3 class="custom-subheader">Top 10 Clients by Premium</h3>', unsafe_allow_html=True)
+            st.plotly_chart(fig, use_container_width=True)
+
+
+
+     # Calculate the Total Premium by Client Segment
+        int_owner = cube.groupby("Cover Type")["Total"].sum().reset_index()
+        int_owner.columns = ["Cover Type", "Total Premium"]    
+
+        with cl2:
+            # Display the header
+            st.markdown('<h3 class="custom-subheader">Total Sales by Cover Type</h3>', unsafe_allow_html=True)
+
+
+            # Create a donut chart
+            fig = px.pie(int_owner, names="Cover Type", values="Total Premium", hole=0.5, template="plotly_dark", color_discrete_sequence=custom_colors)
+            fig.update_traces(textposition='inside', textinfo='value+percent')
+            fig.update_layout(height=450, margin=dict(l=0, r=10, t=30, b=50))
+
+            # Display the chart in Streamlit
+            st.plotly_chart(fig, use_container_width=True)
@@ -8,500 +8,483 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 from itertools import chain
 from matplotlib.ticker import FuncFormatter
-from datetime import datetime
-
-
-# Centered and styled main title using inline styles
-st.markdown('''
-    <style>
-        .main-title {
-            color: #e66c37; /* Title color */
-            text-align: center; /* Center align the title */
-            font-size: 3rem; /* Title font size */
-            font-weight: bold; /* Title font weight */
-            margin-bottom: .5rem; /* Space below the title */
-            text-shadow: 1px 1px 2px rgba(0, 0, 0, 0.1); /* Subtle text shadow */
-        }
-        div.block-container {
-            padding-top: 2rem; /* Padding for main content */
-        }
-    </style>
-''', unsafe_allow_html=True)
-
-st.markdown('<h2 class="main-title">KPI METRICS VIEW FOR LOSS RATIO WITH ACTUAL CLAIM AMOUNT</h2>', unsafe_allow_html=True)
-
-
-
-# Filepaths and sheet names
-filepath_premiums = "JAN-NOV 2024 GWP.xlsx"
-sheet_name_new_business = "2023"
-sheet_name_endorsements = "2024"
-filepath_visits = "Claims.xlsx"
-sheet_name1 = "2023 claims"
-sheet_name2 = "2024 claims"
-
-# Read the premium data
-df_2023 = pd.read_excel(filepath_premiums, sheet_name=sheet_name_new_business)
-df_2024 = pd.read_excel(filepath_premiums, sheet_name=sheet_name_endorsements)
+from cube import build_cube, cube_mean, slice_cube
+from clients import canonical_names, client_ids, get_client_registry, unmatched_clients
+from data_store import get_dataset, get_derived, get_filtered
+from earned import policy_earned_premium
+from filter_index import apply_filters, build_filter_index
+from periods import add_period, period_label, period_slice
+from intervals import attach_to_periods
+from pipeline import read_artifacts
+from policies import prioritize_renewal
+from table import paged_table
+from usage import usage_by_client
 
-# Read the Claims data
-dfc_2023 = pd.read_excel(filepath_visits, sheet_name=sheet_name1)
-dfc_2024 = pd.read_excel(filepath_visits, sheet_name=sheet_name2)
-
-# Read the visit logs
-df_visits = pd.concat([dfc_2023, dfc_2024])
-
-df_premiums = pd.concat([df_2023, df_2024])
-
-drop_cols=['Amount Received - Jan _ march', 'MONTH', 'Contract days', 'Cover days', 'Amount Received - April', 'Amount Received - May', 'Amount Received - June', 'Amount Received - JULY','Unnamed: 27', 'Unnamed: 25', 'Unnamed: 26']
-
-df_premiums.drop(columns=drop_cols, inplace = True)
-
-df_premiums["Start Date"] = pd.to_datetime(df_premiums["Start Date"])
-df_premiums["Month"] = df_premiums["Start Date"].dt.strftime("%B")
-df_premiums["Year"] = df_premiums["Start Date"].dt.year
 
+# Dictionary to map month names to their order
+month_order = {
+    "January": 1, "February": 2, "March": 3, "April": 4, 
+    "May": 5, "June": 6, "July": 7, "August": 8, 
+    "September": 9, "October": 10, "November": 11, "December": 12
+}
 
-# Split the DataFrame into two: one with endorsements and one without
-df_endorsements = df_premiums[df_premiums['Cover Type'].str.contains('Endorsement', case=False, na=False)]
-df_non_endorsements = df_premiums[~df_premiums['Cover Type'].str.contains('Endorsement', case=False, na=False)]
+# Measures summed into the aggregate cube
+CUBE_MEASURES = ["Total", "Days Since Start", "days_on_cover", "Earned Premium", "Claim ID count", "Claim Amount sum", "Approved Claim Amount sum"]
 
-# Calculate 'Days Since Start' and 'days_on_cover' for non-endorsement rows
-current_date = datetime.now()
-df_non_endorsements['Days Since Start'] = (current_date - df_non_endorsements['Start Date']).dt.days
-df_non_endorsements['days_on_cover'] = (df_non_endorsements['End Date'] - df_non_endorsements['Start Date']).dt.days
+# Columns behind the sidebar multiselect filters and the date inputs
+DATE_COLUMN = 'Start Date'
+FILTER_COLUMNS = ['Cover Type', 'Product', 'Client Name']
 
+# Columns the page reads from its datasets (any other column is never loaded)
+DATASET_COLUMNS = {
+    "premiums": ['Cover Type', 'Start Date', 'End Date', 'Client Name', 'Product', 'Total'],
+    "claims": ['Claim ID', 'Employer Name', 'Claim Created Date', 'Claim Amount', 'Approved Claim Amount'],
+}
 
-# Prioritize 'renewed' cover type values
-def prioritize_renewal(df):
-    # Identify clients with both 'new' and 'renewal' cover types
-    clients_with_both = df.groupby('Client Name')['Cover Type'].nunique()
-    clients_with_both = clients_with_both[clients_with_both == 2].index
-    
-    # Separate clients with both cover types from others
-    df_clients_with_both = df[df['Client Name'].isin(clients_with_both)]
-    df_other_clients = df[~df['Client Name'].isin(clients_with_both)]
-    
-    # Sort and deduplicate clients with both cover types, prioritizing 'renewal'
-    df_clients_with_both_sorted = df_clients_with_both.sort_values(by=['Client Name', 'Cover Type'], ascending=[True, False])
-    df_clients_with_both_deduped = df_clients_with_both_sorted.drop_duplicates(subset=['Client Name'], keep='first')
-    
-    # Combine the deduplicated clients with both cover types and the other clients
-    df_result = pd.concat([df_clients_with_both_deduped, df_other_clients])
-    
-    return df_result
+# Columns the data table shows until others are picked
+TABLE_COLUMNS = ['Client Name', 'Cover Type', 'Product', 'Start Date', 'End Date', 'Total', 'Earned Premium', 'Claim ID count', 'Approved Claim Amount sum']
 
-df_prioritized = prioritize_renewal(df_non_endorsements)
 
-# Merge endorsements with premiums on Client Name
-df_merged_endorsements = pd.merge(df_endorsements, df_prioritized[['Client Name', 'Start Date', 'End Date']], on='Client Name', suffixes=('_endorsement', '_premium'))
+# Function to display date input in styled boxes
+def display_date_input(col, title, default_date, min_date, max_date):
+    col.markdown(f"""
+        <div class="date-input-box">
+            <div class="date-input-title">{title}</div>
+        </div>
+        """, unsafe_allow_html=True)
+    return col.date_input("", default_date, min_value=min_date, max_value=max_date)
 
-# Filter endorsements to include only those within the start and end date range of the premiums
-df_filtered_endorsements = df_merged_endorsements[
-    (df_merged_endorsements['Start Date_endorsement'] >= df_merged_endorsements['Start Date_premium']) & 
-    (df_merged_endorsements['Start Date_endorsement'] <= df_merged_endorsements['End Date_premium'])
-]
 
-# Drop the additional date columns used for filtering
-df_filtered_endorsements = df_filtered_endorsements.drop(columns=['Start Date_premium', 'End Date_premium'])
+# Function to display metrics in styled boxes with tooltips
+def display_metric(col, title, value):
+    col.markdown(f"""
+        <div class="metric-box">
+            <div class="metric-title">{title}</div>
+            <div class="metric-value">{value}</div>
+        </div>
+        """, unsafe_allow_html=True)
 
-# Rename the date columns back to their original names
-df_filtered_endorsements = df_filtered_endorsements.rename(columns={'Start Date_endorsement': 'Start Date', 'End Date_endorsement': 'End Date'})
 
-# Combine the processed non-endorsement DataFrame with the filtered endorsements DataFrame
-df_premiums = pd.concat([df_prioritized, df_filtered_endorsements])
+# Function to load and join the premium and claims data (cached per data version and as-of date)
+def load_data(as_of):
+    # Premium (2023 and 2024 sheets) data from the shared data store
+    df_premiums = get_dataset("premiums", columns=DATASET_COLUMNS["premiums"])
 
-# Reset the index of the resulting DataFrame
-df_premiums.reset_index(drop=True, inplace=True)
+    # Integer client keys and canonical client names from the shared client registry
+    registry = get_client_registry()
+    df_premiums['client_id'] = client_ids(registry, df_premiums['Client Name'])
+    df_premiums['Client Name'] = canonical_names(registry, df_premiums['client_id'])
 
-df_visits["Client Name"] = df_visits["Employer Name"]
+    df_premiums["Start Date"] = pd.to_datetime(df_premiums["Start Date"])
+    df_premiums["Month"] = df_premiums["Start Date"].dt.strftime("%B")
+    df_premiums["Year"] = df_premiums["Start Date"].dt.year
 
 
+    # Split the DataFrame into two: one with endorsements and one without
+    df_endorsements = df_premiums[df_premiums['Cover Type'].str.contains('Endorsement', case=False, na=False)]
+    df_non_endorsements = df_premiums[~df_premiums['Cover Type'].str.contains('Endorsement', case=False, na=False)]
 
-df_visits['Claim Created Date'] = pd.to_datetime(df_visits['Claim Created Date'], errors='coerce')
-df_premiums['Start Date'] = pd.to_datetime(df_premiums['Start Date'])
-df_premiums['End Date'] = pd.to_datetime(df_premiums['End Date'])
+    # Calculate 'Days Since Start' and 'days_on_cover' for non-endorsement rows
+    df_non_endorsements['Days Since Start'] = (as_of - df_non_endorsements['Start Date']).dt.days
+    df_non_endorsements['days_on_cover'] = (df_non_endorsements['End Date'] - df_non_endorsements['Start Date']).dt.days
 
-# Merge new business data with visit data on Client Name
-df_merged = pd.merge(df_visits, df_premiums[['Client Name', 'Start Date', 'End Date']], on='Client Name', how='outer')
 
+    # Renewals are prioritized per registry client, so a client spelled differently
+    # in the 2023 and 2024 sheets keeps only its renewal (python reconcile.py
+    # shows what this moves against prioritizing per spelling)
+    df_prioritized = prioritize_renewal(df_non_endorsements)
 
-# Filter visits to include only those within the start and end date range
-df_filtered_visits = df_merged[
-    (df_merged['Claim Created Date'] >= df_merged['Start Date']) & 
-    (df_merged['Claim Created Date'] <= df_merged['End Date'])
-]
+    # Attach each endorsement to the prioritized policy whose cover contains its start date.
+    # Endorsements outside every policy window are returned separately for reporting.
+    df_filtered_endorsements, df_unmatched_endorsements = attach_to_periods(df_endorsements, df_prioritized, on='client_id', date_col='Start Date')
 
+    # Combine the processed non-endorsement DataFrame with the filtered endorsements DataFrame
+    df_premiums = pd.concat([df_prioritized, df_filtered_endorsements])
 
-# Aggregate visit data by 'Client Name'
-df_visits_agg = df_filtered_visits.groupby('Client Name').agg({
-    'Claim ID': 'count',  # Count of visits
-    'Claim Amount': 'sum',  # Sum of visit close amounts
-    'Approved Claim Amount': 'sum',  # Sum of pharmacy claim amounts
-    'Claim Created Date': ['min', 'max'] 
-}).reset_index()
+    # Reset the index of the resulting DataFrame
+    df_premiums.reset_index(drop=True, inplace=True)
 
-# Flatten the column names after aggregation
-df_visits_agg.columns = [' '.join(col).strip() if isinstance(col, tuple) else col for col in df_visits_agg.columns]
 
-df_visits_agg['Claim Created Date min'] = pd.to_datetime(df_visits_agg['Claim Created Date min'], errors='coerce')
 
-# Extract 'Month' and 'Year' from the minimum Claim Created Date
-df_visits_agg['Month'] = df_visits_agg['Claim Created Date min'].dt.strftime('%B')
-df_visits_agg['Year'] = df_visits_agg['Claim Created Date min'].dt.year
 
-# Clean Client Name columns to ensure consistency
-df_visits_agg['Client Name'] = df_visits_agg['Client Name'].str.strip().str.lower()
-df_premiums['Client Name'] = df_premiums['Client Name'].str.strip().str.lower()
+    df_premiums['Start Date'] = pd.to_datetime(df_premiums['Start Date'])
+    df_premiums['End Date'] = pd.to_datetime(df_premiums['End Date'])
 
-# Ensure Client Name columns are of the same data type
-df_visits_agg['Client Name'] = df_visits_agg['Client Name'].astype(str)
-df_premiums['Client Name'] = df_premiums['Client Name'].astype(str)
+    # Premium each policy and endorsement has earned by the as-of date, pro rata to its days on cover
+    df_premiums['Earned Premium'] = policy_earned_premium(df_premiums['Total'], df_premiums['Start Date'], df_premiums['End Date'], as_of)
 
-# Merge the aggregated visit data with the premium data on Client Name
-df_combined = pd.merge(df_visits_agg, df_premiums, on='Client Name', how='outer')
+    # Claims per client within its premium periods (interval join and
+    # aggregation run by the configured backend; claims without a client name are left out)
+    # A claim counts once per premium row covering it, attached endorsements
+    # included, so each endorsement being attached once keeps its claims single
+    df_visits_agg = usage_by_client("claims", DATASET_COLUMNS["claims"], df_premiums, registry)
+    df_visits_agg.insert(0, 'Client Name', canonical_names(registry, df_visits_agg['client_id']))
 
+    df_visits_agg['Claim Created Date min'] = pd.to_datetime(df_visits_agg['Claim Created Date min'], errors='coerce')
 
+    # Extract 'Month' and 'Year' from the minimum Claim Created Date
+    df_visits_agg['Month'] = df_visits_agg['Claim Created Date min'].dt.strftime('%B')
+    df_visits_agg['Year'] = df_visits_agg['Claim Created Date min'].dt.year
 
-# Merge the aggregated visit data with the premium data
-df_combined = pd.concat([df_visits_agg, df_premiums])
+    # Merge the aggregated visit data with the premium data
+    df_combined = pd.concat([df_visits_agg, df_premiums])
 
 
-# Convert 'Start Date' to datetime
-df_combined["Start Date"] = pd.to_datetime(df_combined["Start Date"])
-df_combined["End Date"] = pd.to_datetime(df_combined["End Date"])
+    # Convert 'Start Date' to datetime
+    df_combined["Start Date"] = pd.to_datetime(df_combined["Start Date"])
+    df_combined["End Date"] = pd.to_datetime(df_combined["End Date"])
 
-df = df_combined
+    df = df_combined
 
-df["Client Name"] = df["Client Name"].str.upper()
+    # Integer month-year period key; rows sorted by it for range slicing
+    df = add_period(df)
 
+    # Aggregate cube the KPI cards and charts are answered from
+    df_cube = build_cube(df, CUBE_MEASURES)
 
+    # Row positions of every sidebar filter value, and the rows in date order
+    filter_index = build_filter_index(df, FILTER_COLUMNS, date_column=DATE_COLUMN)
 
-# Inspect the merged DataFrame
+    return df, df_cube, filter_index, df_unmatched_endorsements
 
-# Sidebar styling and logo
-st.markdown("""
-    <style>
-    .sidebar .sidebar-content {
-        background-color: #f0f2f6;
-        padding: 20px;
-        border-radius: 10px;
-        box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
-    }
-    .sidebar .sidebar-content h2 {
-        color: #007BFF; /* Change this color to your preferred title color */
-        font-size: 1.5em;
-        margin-bottom: 20px;
-        text-align: center;
-    }
-    .sidebar .sidebar-content .filter-title {
-        color: #e66c37;
-        font-size: 1.2em;
-        font-weight: bold;
-        margin-top: 20px;
-        margin-bottom: 10px;
-        text-align: center;
-    }
-    .sidebar .sidebar-content .filter-header {
-        color: #e66c37; /* Change this color to your preferred header color */
-        font-size: 2.5em;
-        font-weight: bold;
-        margin-top: 20px;
-        margin-bottom: 20px;
-        text-align: center;
-    }
-    .sidebar .sidebar-content .filter-multiselect {
-        margin-bottom: 15px;
-    }
-    .sidebar .sidebar-content .logo {
-        text-align: center;
-        margin-bottom: 20px;
-    }
-    .sidebar .sidebar-content .logo img {
-        max-width: 80%;
-        height: auto;
-        border-radius: 50%;
-    }
-            
-    </style>
-    """, unsafe_allow_html=True)
 
+# Function to load the page data: the prebuilt data of the current sources
+# when there is a build of them (python pipeline.py), else built by load_data
+def load_page_data(as_of):
+    prebuilt = read_artifacts("overview_c", as_of)
+    if prebuilt is None:
+        return load_data(as_of)
+    df, df_cube, df_unmatched_endorsements = prebuilt
+    if df_cube is None:
+        df_cube = build_cube(df, CUBE_MEASURES)
+    filter_index = build_filter_index(df, FILTER_COLUMNS, date_column=DATE_COLUMN)
+    return df, df_cube, filter_index, df_unmatched_endorsements
 
 
+# Function to render the page
+def render(ctx):
+    # Centered and styled main title using inline styles
+    st.markdown('''
+        <style>
+            .main-title {
+                color: #e66c37; /* Title color */
+                text-align: center; /* Center align the title */
+                font-size: 3rem; /* Title font size */
+                font-weight: bold; /* Title font weight */
+                margin-bottom: .5rem; /* Space below the title */
+                text-shadow: 1px 1px 2px rgba(0, 0, 0, 0.1); /* Subtle text shadow */
+            }
+            div.block-container {
+                padding-top: 2rem; /* Padding for main content */
+            }
+        </style>
+    ''', unsafe_allow_html=True)
 
+    st.markdown('<h2 class="main-title">KPI METRICS VIEW FOR LOSS RATIO WITH ACTUAL CLAIM AMOUNT</h2>', unsafe_allow_html=True)
+    st.caption(f"As at {ctx.as_of:%d %B %Y}")
 
+    df, df_cube, filter_index, df_unmatched_endorsements = get_derived("overview_c", load_page_data, sources=("premiums", "claims"), params=(ctx.as_of,))
 
-# Dictionary to map month names to their order
-month_order = {
-    "January": 1, "February": 2, "March": 3, "April": 4, 
-    "May": 5, "June": 6, "July": 7, "August": 8, 
-    "September": 9, "October": 10, "November": 11, "December": 12
-}
+    # Endorsements that could not be attached to any policy period of their client
+    if not df_unmatched_endorsements.empty:
+        with st.expander(f"{len(df_unmatched_endorsements)} endorsements outside every policy period"):
+            st.dataframe(df_unmatched_endorsements)
 
-# Sort months based on their order
-sorted_months = sorted(df['Month'].dropna().unique(), key=lambda x: month_order[x])
-
-
-# Sidebar for filters
-st.sidebar.header("Filters")
-year = st.sidebar.multiselect("Select Year", options=sorted(df['Year'].dropna().unique()))
-month = st.sidebar.multiselect("Select Month", options=sorted_months)
-cover = st.sidebar.multiselect("Select Cover Type", options=df['Cover Type'].unique())
-product = st.sidebar.multiselect("Select Product", options=df['Product'].unique())
-client_names = sorted(df['Client Name'].unique())
-client_name = st.sidebar.multiselect("Select Client Name", options=client_names)
-
-# Apply filters to the DataFrame
-if 'Start Year' in df.columns and year:
-    df = df[df['Start Year'].isin(year)]
-if 'Start Month' in df.columns and month:
-    df = df[df['Start Month'].isin(month)]
-if 'Cover Type' in df.columns and cover:
-    df = df[df['Cover Type'].isin(cover)]
-if 'Product' in df.columns and product:
-    df = df[df['Product'].isin(product)]
-if 'Client Name' in df.columns and client_name:
-    df = df[df['Client Name'].isin(client_name)]
-
-# Determine the filter description
-filter_description = ""
-if year:
-    filter_description += f"{', '.join(map(str, year))} "
-if cover:
-    filter_description += f"{', '.join(map(str, cover))} "
-if month:
-    filter_description += f"{', '.join(month)} "
-if product:
-    filter_description += f"{', '.join(product)} "
-if not filter_description:
-    filter_description = "All data"
-
-
-# Get minimum and maximum dates for the date input
-startDate = df["Start Date"].min()
-endDate = df["End Date"].max()
-
-# Define CSS for the styled date input boxes
-st.markdown("""
-    <style>
-    .date-input-box {
-        border-radius: 10px;
-        text-align: left;
-        margin: 5px;
-        font-size: 1.2em;
-        font-weight: bold;
-    }
-    .date-input-title {
-        font-size: 1.2em;
-        margin-bottom: 5px;
-    }
-    </style>
-    """, unsafe_allow_html=True)
+    # Clients with claims but no premium record under any spelling
+    df_unmatched_clients = unmatched_clients(get_client_registry(), "claims")
+    if not df_unmatched_clients.empty:
+        with st.expander(f"{len(df_unmatched_clients)} clients with claims but no premium record"):
+            st.dataframe(df_unmatched_clients)
 
 
 
-# Create 2-column layout for date inputs
-col1, col2 = st.columns(2)
+    # Inspect the merged DataFrame
 
+    # Sidebar styling and logo
+    st.markdown("""
+        <style>
+        .sidebar .sidebar-content {
+            background-color: #f0f2f6;
+            padding: 20px;
+            border-radius: 10px;
+            box-shadow: 0 4px 8px rgba(0, 0, 0, 0.1);
+        }
+        .sidebar .sidebar-content h2 {
+            color: #007BFF; /* Change this color to your preferred title color */
+            font-size: 1.5em;
+            margin-bottom: 20px;
+            text-align: center;
+        }
+        .sidebar .sidebar-content .filter-title {
+            color: #e66c37;
+            font-size: 1.2em;
+            font-weight: bold;
+            margin-top: 20px;
+            margin-bottom: 10px;
+            text-align: center;
+        }
+        .sidebar .sidebar-content .filter-header {
+            color: #e66c37; /* Change this color to your preferred header color */
+            font-size: 2.5em;
+            font-weight: bold;
+            margin-top: 20px;
+            margin-bottom: 20px;
+            text-align: center;
+        }
+        .sidebar .sidebar-content .filter-multiselect {
+            margin-bottom: 15px;
+        }
+        .sidebar .sidebar-content .logo {
+            text-align: center;
+            margin-bottom: 20px;
+        }
+        .sidebar .sidebar-content .logo img {
+            max-width: 80%;
+            height: auto;
+            border-radius: 50%;
+        }
 
-# Function to display date input in styled boxes
-def display_date_input(col, title, default_date, min_date, max_date):
-    col.markdown(f"""
-        <div class="date-input-box">
-            <div class="date-input-title">{title}</div>
-        </div>
+        </style>
         """, unsafe_allow_html=True)
-    return col.date_input("", default_date, min_value=min_date, max_value=max_date)
 
-# Display date inputs
-with col1:
-    date1 = pd.to_datetime(display_date_input(col1, "Start Date", startDate, startDate, endDate))
 
-with col2:
-    date2 = pd.to_datetime(display_date_input(col2, "End Date", endDate, startDate, endDate))
 
+    # Sort months based on their order
+    sorted_months = sorted(df['Month'].dropna().unique(), key=lambda x: month_order[x])
 
 
+    # Sidebar for filters
+    st.sidebar.header("Filters")
+    year = st.sidebar.multiselect("Select Year", options=sorted(df['Year'].dropna().unique()))
+    month = st.sidebar.multiselect("Select Month", options=sorted_months)
+    cover = st.sidebar.multiselect("Select Cover Type", options=df['Cover Type'].unique())
+    product = st.sidebar.multiselect("Select Product", options=df['Product'].unique())
+    client_names = sorted(df['Client Name'].dropna().unique())
+    client_name = st.sidebar.multiselect("Select Client Name", options=client_names)
 
-# Handle non-finite values in 'Start Year' column
-df['Year'] = df['Year'].fillna(0).astype(int)  # Replace NaN with 0 or any specific value
+    # Apply filters to the DataFrame: one take over the precomputed filter index,
+    # memoized per filter state so switching back to an earlier choice is a lookup
+    selections = {
+        'Start Year': year,
+        'Start Month': month,
+        'Cover Type': cover,
+        'Product': product,
+        'Client Name': client_name,
+    }
+    df_loaded = df
+    df = get_filtered("overview_c", selections, lambda: apply_filters(df_loaded, filter_index, selections),
+                      params=(ctx.as_of,))
+
+    # Determine the filter description
+    filter_description = ""
+    if year:
+        filter_description += f"{', '.join(map(str, year))} "
+    if cover:
+        filter_description += f"{', '.join(map(str, cover))} "
+    if month:
+        filter_description += f"{', '.join(month)} "
+    if product:
+        filter_description += f"{', '.join(product)} "
+    if not filter_description:
+        filter_description = "All data"
+
+
+    # Get minimum and maximum dates for the date input
+    startDate = df["Start Date"].min()
+    endDate = df["End Date"].max()
+
+    # Define CSS for the styled date input boxes
+    st.markdown("""
+        <style>
+        .date-input-box {
+            border-radius: 10px;
+            text-align: left;
+            margin: 5px;
+            font-size: 1.2em;
+            font-weight: bold;
+        }
+        .date-input-title {
+            font-size: 1.2em;
+            margin-bottom: 5px;
+        }
+        </style>
+        """, unsafe_allow_html=True)
 
-# Handle non-finite values in 'Start Month' column
-df['Month'] = df['Month'].fillna('Unknown')
 
-# Create a 'Month-Year' column
-df['Month-Year'] = df['Month'] + ' ' + df['Year'].astype(str)
 
-# Function to sort month-year combinations
-def sort_key(month_year):
-    month, year = month_year.split()
-    return (int(year), month_order.get(month, 0))  # Use .get() to handle 'Unknown' month
+    # Create 2-column layout for date inputs
+    col1, col2 = st.columns(2)
 
-# Extract unique month-year combinations and sort them
-month_years = sorted(df['Month-Year'].unique(), key=sort_key)
 
-# Select slider for month-year range
-selected_month_year_range = st.select_slider(
-    "Select Month-Year Range",
-    options=month_years,
-    value=(month_years[0], month_years[-1])
-)
+    # Display date inputs
+    with col1:
+        date1 = pd.to_datetime(display_date_input(col1, "Start Date", startDate, startDate, endDate))
 
-# Filter DataFrame based on selected month-year range
-start_month_year, end_month_year = selected_month_year_range
-start_month, start_year = start_month_year.split()
-end_month, end_year = end_month_year.split()
+    with col2:
+        date2 = pd.to_datetime(display_date_input(col2, "End Date", endDate, startDate, endDate))
 
-start_index = (int(start_year), month_order.get(start_month, 0))
-end_index = (int(end_year), month_order.get(end_month, 0))
+    # Narrow to the picked dates as well: two binary searches over the sorted
+    # Start Date index and one take (rows without a Start Date are kept)
+    rows_before_dates = len(df)
+    df = get_filtered("overview_c", (selections, date1, date2),
+                      lambda: apply_filters(df_loaded, filter_index, selections, date_range=(date1, date2)),
+                      params=(ctx.as_of,))
+    dates_narrowed = len(df) < rows_before_dates
 
-# Filter DataFrame based on month-year order indices
-df = df[
-    df['Month-Year'].apply(lambda x: (int(x.split()[1]), month_order.get(x.split()[0], 0))).between(start_index, end_index)
-]
 
 
+    # Handle non-finite values in 'Start Year' column
+    df['Year'] = df['Year'].fillna(0).astype(int)  # Replace NaN with 0 or any specific value
 
+    # Handle non-finite values in 'Start Month' column
+    df['Month'] = df['Month'].fillna('Unknown')
 
-# # Filter the concatenated DataFrame to include only endorsements
-# df_hares = df[df['Client Segment'] == 'Hares']
-# df_elephants = df[df['Client Segment'] == 'Elephant']
-# df_tiger = df[df['Client Segment'] == 'Tigers']
-# df_whale = df[df['Client Segment'] == 'Whale']
+    # Month-Year periods present in the data, in order (rows are sorted by period at load)
+    periods = df['Period'].unique().tolist()
 
-df_proactiv = df[df["Product"] ==  "ProActiv"]
-df_health = df[df["Product"]== "Health"]
+    # Select slider for month-year range
+    start_period, end_period = st.select_slider(
+        "Select Month-Year Range",
+        options=periods,
+        value=(periods[0], periods[-1]),
+        format_func=period_label
+    )
 
-df_new = df[df['Cover Type'] == 'New']
-df_renew = df[df['Cover Type'] == 'Renewal']
-df_combined = df[df['Cover Type'].isin(['New', 'Renewal'])]
+    # Filter DataFrame to the selected month-year range
+    df = period_slice(df, start_period, end_period)
 
-df_endorsements = df[df['Cover Type'] == 'Endorsement']
 
 
-if not df.empty:
+    # # Filter the concatenated DataFrame to include only endorsements
+    # df_hares = df[df['Client Segment'] == 'Hares']
+    # df_elephants = df[df['Client Segment'] == 'Elephant']
+    # df_tiger = df[df['Client Segment'] == 'Tigers']
+    # df_whale = df[df['Client Segment'] == 'Whale']
 
-    scale=1_000_000  # For millions
 
+    # KPI cards and the Year / Month / Cover Type charts are answered from the aggregate
+    # cube. A narrowed date range is finer than the cube's month grain, so the cube is
+    # then built from the remaining rows instead
+    if dates_narrowed:
+        cube = build_cube(df, CUBE_MEASURES)
+    else:
+        cube = slice_cube(df_cube, cover=cover, product=product, client_name=client_name, month_range=(start_period, end_period))
+    cube_new = cube[cube['Cover Type'] == 'New']
+    cube_renew = cube[cube['Cover Type'] == 'Renewal']
+    cube_endorsements = cube[cube['Cover Type'] == 'Endorsement']
 
-    # Scale the sums
 
-    # total_hares = (df_hares['Total Premium'].sum())/scale
-    # total_tiger = (df_tiger['Total Premium'].sum())/scale
-    # total_elephant = (df_elephants['Total Premium'].sum())/scale
-    # total_whale = (df_whale['Total Premium'].sum())/scale
+    if not df.empty:
 
-    total_pro = (df_proactiv["Total"].sum())/scale
-    total_health = (df_health["Total"].sum())/scale
+        scale=1_000_000  # For millions
 
-    total_new = (df_new["Total"].sum())/scale
-    total_renew = (df_renew["Total"].sum())/scale
-    total_pre = total_new +total_renew
-    total_endorsements_amount = df_endorsements["Total"].sum()/scale
-    total_app_claim_amount= df["Approved Claim Amount sum"].sum()/scale
 
-    total_clients = df["Client Name"].nunique()
-    total_endorsements = df_endorsements["Client Name"].count()
-    num_new = df_new["Client Name"].nunique()
-    num_renew = df_renew["Client Name"].nunique()
-    num_visits = df["Claim ID count"].sum()
+        # Scale the sums
 
+        # total_hares = (df_hares['Total Premium'].sum())/scale
+        # total_tiger = (df_tiger['Total Premium'].sum())/scale
+        # total_elephant = (df_elephants['Total Premium'].sum())/scale
+        # total_whale = (df_whale['Total Premium'].sum())/scale
 
-    # total_new_premium = (df["Total Premium_new"].sum())/scale
-    # total_endorsement = (df["Total Premium_endorsements"].sum())/scale
-    total_premium = (df["Total"].sum())/scale
-    total_days = df["Days Since Start"].sum()
-    total_days_on_cover = df['days_on_cover'].sum()
-    total_claim_amount = (df["Claim Amount sum"].sum())/scale
-    average_pre = (df["Total"].mean())/scale
-    average_days = df["Days Since Start"].mean()
 
-    percent_app = (total_app_claim_amount/total_claim_amount) *100
+        total_new = (cube_new["Total"].sum())/scale
+        total_renew = (cube_renew["Total"].sum())/scale
+        total_endorsements_amount = cube_endorsements["Total"].sum()/scale
+        total_app_claim_amount= cube["Approved Claim Amount sum"].sum()/scale
 
-    earned_premium = (total_premium * total_days)/total_days_on_cover
-    loss_ratio_amount = total_app_claim_amount / earned_premium
-    loss_ratio= (total_app_claim_amount / earned_premium) *100
+        total_clients = cube["Client Name"].nunique()
+        total_endorsements = cube_endorsements["Rows"].sum()
+        num_new = cube_new["Client Name"].nunique()
+        num_renew = cube_renew["Client Name"].nunique()
+        num_visits = cube["Claim ID count"].sum()
 
-    # Create 4-column layout for metric cards# Define CSS for the styled boxes and tooltips
-    st.markdown("""
-        <style>
-        .custom-subheader {
-            color: #e66c37;
-            text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.2);
-            padding: 10px;
-            border-radius: 5px;
-            display: inline-block;
-        }
-        .metric-box {
-            padding: 10px;
-            border-radius: 10px;
-            text-align: center;
-            margin: 10px;
-            font-size: 1.2em;
-            font-weight: bold;
-            box-shadow: 2px 2px 10px rgba(0, 0, 0, 0.1);
-            border: 1px solid #ddd;
-            position: relative;
-        }
-        .metric-title {
-            color: #e66c37; /* Change this color to your preferred title color */
-            font-size: 0.9em;
-            margin-bottom: 10px;
-        }
-        .metric-value {
-            color: #009DAE;
-            font-size: 1em;
-        }
 
-        </style>
-        """, unsafe_allow_html=True)
+        # total_new_premium = (df["Total Premium_new"].sum())/scale
+        # total_endorsement = (df["Total Premium_endorsements"].sum())/scale
+        total_premium = (cube["Total"].sum())/scale
+        total_days = cube["Days Since Start"].sum()
+        total_days_on_cover = cube['days_on_cover'].sum()
+        total_claim_amount = (cube["Claim Amount sum"].sum())/scale
+        average_pre = cube_mean(cube, "Total")/scale
+        average_days = cube_mean(cube, "Days Since Start")
 
-    st.dataframe(df)
+        percent_app = (total_app_claim_amount/total_claim_amount) *100
 
-    # Function to display metrics in styled boxes with tooltips
-    def display_metric(col, title, value):
-        col.markdown(f"""
-            <div class="metric-box">
-                <div class="metric-title">{title}</div>
-                <div class="metric-value">{value}</div>
-            </div>
+        # Earned premium summed over the policies, each pro rata to its own cover
+        earned_premium = cube["Earned Premium"].sum()/scale
+        loss_ratio_amount = total_app_claim_amount / earned_premium
+        loss_ratio= (total_app_claim_amount / earned_premium) *100
+
+        # Create 4-column layout for metric cards# Define CSS for the styled boxes and tooltips
+        st.markdown("""
+            <style>
+            .custom-subheader {
+                color: #e66c37;
+                text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.2);
+                padding: 10px;
+                border-radius: 5px;
+                display: inline-block;
+            }
+            .metric-box {
+                padding: 10px;
+                border-radius: 10px;
+                text-align: center;
+                margin: 10px;
+                font-size: 1.2em;
+                font-weight: bold;
+                box-shadow: 2px 2px 10px rgba(0, 0, 0, 0.1);
+                border: 1px solid #ddd;
+                position: relative;
+            }
+            .metric-title {
+                color: #e66c37; /* Change this color to your preferred title color */
+                font-size: 0.9em;
+                margin-bottom: 10px;
+            }
+            .metric-value {
+                color: #009DAE;
+                font-size: 1em;
+            }
+
+            </style>
             """, unsafe_allow_html=True)
 
+        # The filtered rows, one page at a time (sorting and search run on the server)
+        paged_table(df, "overview_c", (selections, date1, date2, start_period, end_period), key="overview_c_table",
+                    default_columns=TABLE_COLUMNS, params=(ctx.as_of,))
 
-    # Calculate key metrics
-    st.markdown('<h2 class="custom-subheader">For all Sales in Numbers</h2>', unsafe_allow_html=True)    
-
-    cols1,cols2, cols3 = st.columns(3)
+        # Calculate key metrics
+        st.markdown('<h2 class="custom-subheader">For all Sales in Numbers</h2>', unsafe_allow_html=True)    
 
-    display_metric(cols1, "Number of Clients", total_clients)
-    display_metric(cols2, "Number of New Business", num_new)
-    display_metric(cols3, "Number of Renewals", num_renew)
-    display_metric(cols1, "Number of Endorsements",total_endorsements)
-    display_metric(cols2, "Number of Claims", f"{num_visits:,.0f}")
+        cols1,cols2, cols3 = st.columns(3)
 
-    # Calculate key metrics
-    st.markdown('<h2 class="custom-subheader">For all Sales Amount</h2>', unsafe_allow_html=True)    
+        display_metric(cols1, "Number of Clients", total_clients)
+        display_metric(cols2, "Number of New Business", num_new)
+        display_metric(cols3, "Number of Renewals", num_renew)
+        display_metric(cols1, "Number of Endorsements",total_endorsements)
+        display_metric(cols2, "Number of Claims", f"{num_visits:,.0f}")
 
-    cols1,cols2, cols3 = st.columns(3)
+        # Calculate key metrics
+        st.markdown('<h2 class="custom-subheader">For all Sales Amount</h2>', unsafe_allow_html=True)    
 
-    display_metric(cols1, "Total Premium", f"{total_premium:,.0f} M")
-    display_metric(cols2, "Total New Business Premium", f"{total_new:,.0f} M")
-    display_metric(cols3, "Total Renewal Premium", f"{total_renew:,.0f} M")
-    display_metric(cols1, "Total Endorsement Premium", f"{total_endorsements_amount:,.0f} M")
-    display_metric(cols2, "Total Claim Amount", f"{total_claim_amount:,.0f} M")
-    display_metric(cols3, "Total Approved Claim Amount", f"{total_app_claim_amount:,.0f} M")
-    display_metric(cols1, "Average Premium per Client", f"{average_pre:,.0f} M")
-    display_metric(cols2, "Percentage Approved", f"{percent_app:,.0f} %")
+        cols1,cols2, cols3 = st.columns(3)
 
-    st.markdown('<h2 class="custom-subheader">For Loss Ratio</h2>', unsafe_allow_html=True)    
-  
-    cols1,cols2, cols3 = st.columns(3)
+        display_metric(cols1, "Total Premium", f"{total_premium:,.0f} M")
+        display_metric(cols2, "Total New Business Premium", f"{total_new:,.0f} M")
+        display_metric(cols3, "Total Renewal Premium", f"{total_renew:,.0f} M")
+        display_metric(cols1, "Total Endorsement Premium", f"{total_endorsements_amount:,.0f} M")
+        display_metric(cols2, "Total Claim Amount", f"{total_claim_amount:,.0f} M")
+        display_metric(cols3, "Total Approved Claim Amount", f"{total_app_claim_amount:,.0f} M")
+        display_metric(cols1, "Average Premium per Client", f"{average_pre:,.0f} M")
+        display_metric(cols2, "Percentage Approved", f"{percent_app:,.0f} %")
 
-    display_metric(cols1, "Days Since  Premium Start", f"{total_days:,.0f} days")
-    display_metric(cols2, "Premium Duration (Days)", f"{total_days_on_cover:,.0f} days")
-    display_metric(cols3, "Average Days Since  Premium Start per Client", f"{average_days:,.0f} days")
-    display_metric(cols1, "Earned Premium", f"{earned_premium:,.0f} M")
-    display_metric(cols2, "Loss Ratio", f"{loss_ratio_amount:,.1f} M")
-    display_metric(cols3, "Percentage Loss Ratio", f"{loss_ratio: .0f} %")
+        st.markdown('<h2 class="custom-subheader">For Loss Ratio</h2>', unsafe_allow_html=True)    
 
+        cols1,cols2, cols3 = st.columns(3)
 
+        display_metric(cols1, "Days Since  Premium Start", f"{total_days:,.0f} days")
+        display_metric(cols2, "Premium Duration (Days)", f"{total_days_on_cover:,.0f} days")
+        display_metric(cols3, "Average Days Since  Premium Start per Client", f"{average_days:,.0f} days")
+        display_metric(cols1, "Earned Premium", f"{earned_premium:,.0f} M")
+        display_metric(cols2, "Loss Ratio", f"{loss_ratio_amount:,.1f} M")
+        display_metric(cols3, "Percentage Loss Ratio", f"{loss_ratio: .0f} %")
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+
+import pandas as pd
+
+
+# Per-rerun information the router hands to a page's render(ctx)
+@dataclass
+class PageContext:
+    page: str
+    as_of: pd.Timestamp
@@ -0,0 +1,34 @@
+import numpy as np
+
+
+MONTHS = ["January", "February", "March", "April", "May", "June",
+          "July", "August", "September", "October", "November", "December"]
+
+MONTH_NUMBERS = {name: number for number, name in enumerate(MONTHS, 1)}
+
+
+# Function to add the integer 'Period' key and the 'Month-Year' label from the
+# Year and Month columns, and sort the rows by period. The key is
+# year * 100 + month number (202411 for November 2024); a missing year counts
+# as 0 and a missing month as 'Unknown' (month 0), so an unknown month sorts
+# before January of its year like the Month-Year labels always did.
+def add_period(df):
+    year = df["Year"].fillna(0).astype(int)
+    month = df["Month"].fillna("Unknown")
+    df["Period"] = year * 100 + month.map(MONTH_NUMBERS).fillna(0).astype(int)
+    df["Month-Year"] = month + " " + year.astype(str)
+    return df.sort_values("Period", kind="stable")
+
+
+# Function to turn a period key back into its Month-Year label
+def period_label(period):
+    year, month = divmod(int(period), 100)
+    return f"{MONTHS[month - 1] if month else 'Unknown'} {year}"
+
+
+# Function to keep the rows whose period lies between start and end (both
+# inclusive). Rows must still be sorted by 'Period', so the range is two
+# binary searches and a positional slice instead of a comparison per row.
+def period_slice(df, start, end):
+    periods = df["Period"].to_numpy()
+    return df.iloc[np.searchsorted(periods, start, side="left"):np.searchsorted(periods, end, side="right")]
@@ -0,0 +1,158 @@
+import argparse
+import hashlib
+import importlib
+import importlib.util
+import json
+import logging
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from clients import CLIENT_RULES_FILE
+from data_store import DATASETS, refresh_date
+from earned import policy_earned_premium
+from excel_cache import file_digest
+
+logger = logging.getLogger(__name__)
+
+
+# Directory holding the prebuilt page data, one sub-directory per version
+ARTIFACTS_DIR = os.environ.get("LOSS_RATIO_ARTIFACTS_DIR", "artifacts")
+
+# Pages whose joined premium / usage data is built offline, with the datasets it comes from
+ARTIFACT_PAGES = {
+    "overview": ("premiums", "visits"),
+    "overview_c": ("premiums", "claims"),
+    "loss_ratio_view": ("premiums", "visits"),
+    "loss": ("premiums", "claims"),
+}
+
+# Modules the page data is computed by, besides the pages themselves
+PIPELINE_MODULES = ["pipeline", "data_store", "ingest", "excel_cache", "sheet_append", "dtype_plan", "clients",
+                    "intervals", "usage", "duckdb_backend", "periods", "cube", "earned", "policies"]
+
+# Frames written per page: the joined frame, its aggregate cube and the
+# endorsements outside every policy period
+ARTIFACT_FRAMES = ["combined", "cube", "unmatched_endorsements"]
+
+_digests = {}
+
+
+# Function to compute the content hash of a file, remembered while its size
+# and modification time stay the same
+def _digest(filepath):
+    stat = os.stat(filepath)
+    key = (os.path.abspath(filepath), stat.st_size, stat.st_mtime_ns)
+    if key not in _digests:
+        _digests[key] = file_digest(filepath)
+    return _digests[key]
+
+
+# Function to describe what the page data is built from: the content of every
+# source workbook, of the client rules file and of the modules computing it.
+# Any change to one of them makes a new version, so a build never outlives its inputs.
+def artifact_sources():
+    names = sorted({name for datasets in ARTIFACT_PAGES.values() for name in datasets})
+    sources = {name: {"file": DATASETS[name][0], "sha256": _digest(DATASETS[name][0])} for name in names}
+    if os.path.exists(CLIENT_RULES_FILE):
+        sources["client_rules"] = {"file": CLIENT_RULES_FILE, "sha256": _digest(CLIENT_RULES_FILE)}
+    code = hashlib.sha256()
+    for module in sorted(PIPELINE_MODULES + list(ARTIFACT_PAGES)):
+        code.update(module.encode("utf-8") + _digest(importlib.util.find_spec(module).origin).encode("ascii"))
+    sources["code"] = {"sha256": code.hexdigest()}
+    return sources
+
+
+# Function to turn the sources description into the version directory name
+def artifact_version(sources):
+    return hashlib.sha256(json.dumps(sources, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+# Function to write a frame (index included) as an Arrow IPC file
+def _write_frame(df, path):
+    table = pa.Table.from_pandas(df, preserve_index=True)
+    with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+# Function to read a frame written by _write_frame. Arrow gives missing text
+# back as None; the pages built it as NaN, and the sidebar filters (Series.isin)
+# tell the two apart, so NaN is put back.
+def _read_frame(path):
+    with pa.memory_map(path) as source:
+        df = pa.ipc.open_file(source).read_all().to_pandas()
+    for column in df.columns[df.dtypes == object]:
+        df[column] = df[column].where(df[column].notna(), np.nan)
+    return df
+
+
+# Function to build the data of every artifact page as of a date and write it
+# to a new version directory. The directory is written under a temporary name
+# and renamed when complete, so a page never reads a half-written build.
+def build_artifacts(as_of, out_dir=ARTIFACTS_DIR):
+    sources = artifact_sources()
+    version = artifact_version(sources)
+    target = os.path.join(out_dir, version)
+    staging = f"{target}.{os.getpid()}.tmp"
+    os.makedirs(staging)
+    try:
+        pages = {}
+        for page in ARTIFACT_PAGES:
+            start = time.perf_counter()
+            df, df_cube, _, df_unmatched_endorsements = importlib.import_module(page).load_data(as_of)
+            for frame, df_frame in zip(ARTIFACT_FRAMES, [df, df_cube, df_unmatched_endorsements]):
+                _write_frame(df_frame, os.path.join(staging, f"{page}.{frame}.arrow"))
+            pages[page] = {"rows": len(df), "cube_rows": len(df_cube), "build_s": round(time.perf_counter() - start, 3)}
+            logger.info("%s: %d rows, %d cube rows, %.2f s", page, len(df), len(df_cube), pages[page]["build_s"])
+        with open(os.path.join(staging, "manifest.json"), "w") as fh:
+            json.dump({"version": version, "as_of": as_of.strftime("%Y-%m-%d"), "built_at": pd.Timestamp.now().isoformat(),
+                       "sources": sources, "pages": pages}, fh, indent=2)
+        if os.path.isdir(target):
+            shutil.rmtree(target)
+        os.replace(staging, target)
+    finally:
+        if os.path.isdir(staging):
+            shutil.rmtree(staging)
+    return target
+
+
+# Function to read a page's prebuilt data for the current sources, or None
+# when there is no build of them. A build made as of another day has its
+# 'Days Since Start' moved and its 'Earned Premium' counted again to as_of,
+# and no cube (the page rebuilds it, since both measures are summed into it).
+# Returns the joined frame, the cube (or None) and the unmatched endorsements.
+def read_artifacts(page, as_of, out_dir=ARTIFACTS_DIR):
+    version = artifact_version(artifact_sources())
+    directory = os.path.join(out_dir, version)
+    try:
+        with open(os.path.join(directory, "manifest.json")) as fh:
+            manifest = json.load(fh)
+    except (OSError, ValueError):
+        logger.info("%s: no prebuilt data for version %s, building it in the page", page, version)
+        return None
+    df, df_cube, df_unmatched_endorsements = [_read_frame(os.path.join(directory, f"{page}.{frame}.arrow"))
+                                              for frame in ARTIFACT_FRAMES]
+    shift = (as_of - pd.Timestamp(manifest["as_of"])).days
+    if shift:
+        df["Days Since Start"] = df["Days Since Start"] + shift
+        df["Earned Premium"] = policy_earned_premium(df["Total"], df["Start Date"], df["End Date"], as_of)
+        df_cube = None
+    logger.info("%s: prebuilt data version %s (as of %s)", page, version, manifest["as_of"])
+    return df, df_cube, df_unmatched_endorsements
+
+
+# Build the page data offline after a data refresh:
+#
+#     python pipeline.py [--as-of YYYY-MM-DD] [--out DIR]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the joined loss-ratio page data into a versioned artifacts directory.")
+    parser.add_argument("--as-of", default=None, help="date the 'Days Since Start' measure is counted to (default: the last data refresh)")
+    parser.add_argument("--out", default=ARTIFACTS_DIR, help=f"artifacts directory (default: {ARTIFACTS_DIR})")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(message)s")
+    as_of = pd.Timestamp(args.as_of).normalize() if args.as_of else refresh_date()
+    print(build_artifacts(as_of, args.out))
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+
+# Function to prioritize 'renewed' cover type values: a client with two cover
+# types (New and Renewal) keeps the single row with the later cover type,
+# 'Renewal' before 'New'; every other client keeps all its rows. Rows come back
+# with the deduplicated clients first (sorted by name), then the others in
+# input order.
+def prioritize_renewal(df):
+    clients, client_names = pd.factorize(df['Client Name'])
+    covers, cover_types = pd.factorize(df['Cover Type'], sort=True)
+    n_covers = max(len(cover_types), 1)
+
+    # Count distinct cover types per client from a client x cover type presence table
+    known = (clients >= 0) & (covers >= 0)
+    present = np.zeros((len(client_names), n_covers), dtype=bool)
+    present[clients[known], covers[known]] = True
+    types_per_client = present.sum(axis=1)
+    with_both = clients >= 0
+    with_both[with_both] = types_per_client[clients[with_both]] == 2
+
+    # One stable sort by client, cover type descending (missing cover type last)
+    # picks the first row of each client; only those rows are then ordered by name
+    rows = np.flatnonzero(with_both)
+    cover_rank = np.where(covers[rows] >= 0, n_covers - 1 - covers[rows], n_covers)
+    ordered = rows[np.argsort(clients[rows] * (n_covers + 1) + cover_rank, kind="stable")]
+    first = np.ones(len(ordered), dtype=bool)
+    first[1:] = clients[ordered[1:]] != clients[ordered[:-1]]
+    picked = ordered[first]
+    picked = picked[np.argsort(client_names.take(clients[picked]), kind="stable")]
+
+    return df.iloc[np.concatenate([picked, np.flatnonzero(~with_both)])]
@@ -0,0 +1,171 @@
+import argparse
+import importlib
+
+import pandas as pd
+
+from clients import canonical_names, client_ids, get_client_registry
+from data_store import get_dataset, refresh_date
+from intervals import attach_to_periods, join_within_periods
+from policies import prioritize_renewal
+
+
+# Ways of telling clients apart, in the order the client registry changed
+# them: (renewals prioritized per, endorsements and claims joined per), either
+# the name as spelled in each workbook or the registry client. The last step
+# is what the pages do.
+STEPS = {
+    "As spelled": ("spelled", "spelled"),
+    "Renewals per client": ("client", "spelled"),
+    "Joins per client": ("client", "client"),
+}
+
+# Headline measures of the premium pages, in card order
+KPIS = ["Clients", "New Business", "Renewals", "Endorsements", "Total Premium", "Endorsement Premium",
+        "Claims", "Claim Amount"]
+
+
+# Function to load the premium and claim rows with the raw spelling, the
+# registry client and its canonical name of every row
+def load_rows():
+    registry = get_client_registry()
+    df_premiums = get_dataset("premiums", columns=['Cover Type', 'Start Date', 'End Date', 'Client Name', 'Total'])
+    df_premiums['Start Date'] = pd.to_datetime(df_premiums['Start Date'])
+    df_premiums['End Date'] = pd.to_datetime(df_premiums['End Date'])
+    df_premiums['Spelled'] = df_premiums['Client Name'].astype(object)
+    df_premiums['client_id'] = client_ids(registry, df_premiums['Client Name'])
+    df_premiums['Canonical'] = canonical_names(registry, df_premiums['client_id'])
+    df_premiums = df_premiums.reset_index(drop=True)
+
+    df_claims = get_dataset("claims", columns=['Claim ID', 'Employer Name', 'Claim Created Date', 'Claim Amount'])
+    df_claims['Claim Created Date'] = pd.to_datetime(df_claims['Claim Created Date'], errors='coerce')
+    df_claims['Spelled'] = df_claims['Employer Name'].astype(object)
+    df_claims['client_id'] = client_ids(registry, df_claims['Employer Name'])
+    df_claims['Canonical'] = canonical_names(registry, df_claims['client_id'])
+    return df_premiums, df_claims.reset_index(drop=True)
+
+
+# Function to build the premium rows a page keeps (prioritized policies and
+# the endorsements attached to them) and the claims joined to those rows, with
+# renewals prioritized and rows joined per spelling or per registry client
+def page_rows(df_premiums, df_claims, prioritize_on, join_on):
+    name = 'Spelled' if prioritize_on == "spelled" else 'Canonical'
+    key = 'Spelled' if join_on == "spelled" else 'client_id'
+    df_premiums = df_premiums.assign(**{'Client Name': df_premiums[name]})
+    endorsement = df_premiums['Cover Type'].str.contains('Endorsement', case=False, na=False)
+    df_policies = prioritize_renewal(df_premiums[~endorsement])
+    df_attached, _ = attach_to_periods(df_premiums[endorsement], df_policies, on=key, date_col='Start Date')
+    df_kept = pd.concat([df_policies, df_attached])
+    if prioritize_on == "spelled":
+        # Shown as the pages showed names before the registry (a missing name as 'NAN')
+        df_kept['Client Name'] = df_kept['Client Name'].str.strip().str.lower().astype(str).str.upper()
+
+    # Claims without a client are left out, as the pages do
+    df_claims = df_claims[df_claims['client_id'] >= 0] if join_on == "client" else df_claims[df_claims['Spelled'].notna()]
+    df_joined = join_within_periods(df_claims, df_kept, on=key, date_col='Claim Created Date')
+    return df_kept, df_joined
+
+
+# Function to compute the headline measures of kept premium rows and joined claims
+def kpis(df_kept, df_joined):
+    scale = 1_000_000
+    cover = df_kept['Cover Type']
+    return pd.Series({
+        "Clients": df_kept['Client Name'].nunique(),
+        "New Business": df_kept.loc[cover == 'New', 'Client Name'].nunique(),
+        "Renewals": df_kept.loc[cover == 'Renewal', 'Client Name'].nunique(),
+        "Endorsements": int((cover == 'Endorsement').sum()),
+        "Total Premium": df_kept['Total'].sum() / scale,
+        "Endorsement Premium": df_kept.loc[cover == 'Endorsement', 'Total'].sum() / scale,
+        "Claims": len(df_joined),
+        "Claim Amount": df_joined['Claim Amount'].sum() / scale,
+    })
+
+
+# Function to compute the same measures from a page's aggregate cube
+def cube_kpis(cube):
+    scale = 1_000_000
+    cover = cube['Cover Type']
+    return pd.Series({
+        "Clients": cube['Client Name'].nunique(),
+        "New Business": cube.loc[cover == 'New', 'Client Name'].nunique(),
+        "Renewals": cube.loc[cover == 'Renewal', 'Client Name'].nunique(),
+        "Endorsements": int(cube.loc[cover == 'Endorsement', 'Rows'].sum()),
+        "Total Premium": cube['Total'].sum() / scale,
+        "Endorsement Premium": cube.loc[cover == 'Endorsement', 'Total'].sum() / scale,
+        "Claims": int(cube['Claim ID count'].sum()),
+        "Claim Amount": cube['Claim Amount sum'].sum() / scale,
+    })
+
+
+# Function to list, per canonical client, the premium rows one step keeps and
+# the next does not (or the other way round), with the spellings involved:
+# the rows behind the moves of the premium measures
+def moved_premiums(df_premiums, before, after):
+    dropped = df_premiums.loc[before.index.difference(after.index)].assign(Change="dropped")
+    added = df_premiums.loc[after.index.difference(before.index)].assign(Change="added")
+    rows = pd.concat([dropped, added])
+    if rows.empty:
+        return pd.DataFrame(columns=['Client', 'Change', 'Cover Type', 'Rows', 'Total', 'Spellings'])
+    spellings = df_premiums.groupby('Canonical')['Spelled'].agg(lambda names: " / ".join(sorted(set(map(str, names)))))
+    moved = rows.groupby(['Canonical', 'Change', 'Cover Type'], observed=True).agg(Rows=('Total', 'size'), Total=('Total', 'sum')).reset_index()
+    moved['Spellings'] = moved['Canonical'].map(spellings)
+    return moved.rename(columns={'Canonical': 'Client'})
+
+
+# Function to list, per canonical client, how many claims and how much claim
+# amount one step joins and the next, for the clients where they differ, with
+# the spellings of the client in the premium and the claims workbooks
+def moved_claims(df_premiums, df_claims, before, after):
+    counts = pd.DataFrame({
+        'Claims before': before.groupby('Canonical').size(),
+        'Claims after': after.groupby('Canonical').size(),
+        'Amount before': before.groupby('Canonical')['Claim Amount'].sum(),
+        'Amount after': after.groupby('Canonical')['Claim Amount'].sum(),
+    }).fillna(0)
+    counts = counts[(counts['Claims before'] != counts['Claims after']) | (counts['Amount before'] != counts['Amount after'])]
+    spelled = lambda df: df.groupby('Canonical')['Spelled'].agg(lambda names: " / ".join(sorted(set(map(str, names)))))
+    counts['Premium spellings'] = spelled(df_premiums).reindex(counts.index)
+    counts['Claim spellings'] = spelled(df_claims).reindex(counts.index)
+    return counts.rename_axis('Client').reset_index()
+
+
+# Function to reconcile the headline measures across the client registry
+# steps: the measures per step and on the page itself (the loss page's cube
+# as of the given date), and the clients behind every move. The last step
+# must match the page.
+def reconcile(as_of):
+    df_premiums, df_claims = load_rows()
+    rows = {step: page_rows(df_premiums, df_claims, *rules) for step, rules in STEPS.items()}
+    table = pd.DataFrame({step: kpis(*rows[step]) for step in STEPS}).reindex(KPIS)
+
+    _, df_cube, _, _ = importlib.import_module("loss").load_data(as_of)
+    table["Page"] = cube_kpis(df_cube)
+    steps = list(STEPS)
+    details = {}
+    for before, after in zip(steps, steps[1:]):
+        details[f"{before} -> {after}: premium rows"] = moved_premiums(df_premiums, rows[before][0], rows[after][0])
+        details[f"{before} -> {after}: claims"] = moved_claims(df_premiums, df_claims, rows[before][1], rows[after][1])
+    ties = (table[steps[-1]] - table["Page"]).abs() < 1e-6
+    return table, details, bool(ties.all())
+
+
+# Show how the client registry moves the headline measures of the premium
+# pages, and check the last step against the page:
+#
+#     python reconcile.py [--as-of YYYY-MM-DD]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reconcile the premium page measures across the client registry steps.")
+    parser.add_argument("--as-of", default=None, help="date the page data is counted to (default: the last data refresh)")
+    args = parser.parse_args()
+    as_of = pd.Timestamp(args.as_of).normalize() if args.as_of else refresh_date()
+    table, details, ties = reconcile(as_of)
+    amounts = ["Total Premium", "Endorsement Premium", "Claim Amount"]
+    shown = table.apply(lambda row: row.map(("{:,.1f} M" if row.name in amounts else "{:,.0f}").format), axis=1)
+    with pd.option_context("display.width", 200, "display.max_columns", 20, "display.max_rows", 200,
+                           "display.float_format", "{:,.0f}".format):
+        print(shown)
+        for title, moved in details.items():
+            print(f"\n{title}")
+            print(moved.to_string(index=False) if len(moved) else "(none)")
+    print(f"\nLast step {'matches' if ties else 'DOES NOT match'} the page")
+    raise SystemExit(0 if ties else 1)
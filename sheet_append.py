@@ -0,0 +1,193 @@
+import hashlib
+import io
+import posixpath
+import re
+import zipfile
+import xml.etree.ElementTree as ET
+
+import pandas as pd
+
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PACKAGE_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+
+SHEET_DATA = re.compile(rb"<(?:\w+:)?sheetData\b[^>]*?(/?)>")
+SHEET_DATA_END = re.compile(rb"</(?:\w+:)?sheetData>")
+ROW = re.compile(rb"<(?:\w+:)?row\b[^>]*?\sr=\"(\d+)\"[^>]*>.*?</(?:\w+:)?row>", re.S)
+ROW_END = re.compile(rb"</(?:\w+:)?row>")
+ROW_NUMBER = re.compile(rb"(<(?:\w+:)?row\b[^>]*?\sr=\")(\d+)(\")")
+CELL_NUMBER = re.compile(rb"(<(?:\w+:)?c\b[^>]*?\sr=\"[A-Z]+)(\d+)(\")")
+CELL_STYLE = re.compile(rb"(<(?:\w+:)?c\b[^>]*?\s)s=\"(\d+)\"")
+STRING = re.compile(rb"<(?:\w+:)?si\b")
+STRING_END = re.compile(rb"</(?:\w+:)?si>")
+EMPTY_SHEET = f'<worksheet xmlns="{MAIN_NS}"><sheetData/></worksheet>'.encode("utf-8")
+
+
+# Function to find the parts of an open workbook: the XML part of each sheet
+# (in workbook order), the shared strings and styles parts (or None) and
+# whether dates count from 1904
+def _parts(book):
+    workbook = ET.fromstring(book.read("xl/workbook.xml"))
+    relations = ET.fromstring(book.read("xl/_rels/workbook.xml.rels"))
+    targets, by_type = {}, {}
+    for relation in relations.iter(f"{{{PACKAGE_REL_NS}}}Relationship"):
+        target = relation.get("Target")
+        target = target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+        targets[relation.get("Id")] = target
+        by_type[relation.get("Type").rsplit("/", 1)[-1]] = target
+    sheets = {sheet.get("name"): targets[sheet.get(f"{{{REL_NS}}}id")] for sheet in workbook.iter(f"{{{MAIN_NS}}}sheet")}
+    properties = workbook.find(f"{{{MAIN_NS}}}workbookPr")
+    date1904 = properties is not None and properties.get("date1904") in ("1", "true")
+    return sheets, by_type.get("sharedStrings"), by_type.get("styles"), date1904
+
+
+# Function to list, per cell style of the workbook (the index cells refer to
+# with s="..."), the number format it applies: the only part of a style that
+# changes how a cell is read (as a date or as a number)
+def _formats(book, styles_part):
+    if not styles_part:
+        return []
+    styles = ET.fromstring(book.read(styles_part))
+    codes = {fmt.get("numFmtId"): fmt.get("formatCode") for fmt in styles.iter(f"{{{MAIN_NS}}}numFmt")}
+    cell_styles = styles.find(f"{{{MAIN_NS}}}cellXfs")
+    if cell_styles is None:
+        return []
+    return [codes.get(xf.get("numFmtId", "0"), xf.get("numFmtId", "0")) for xf in cell_styles.iter(f"{{{MAIN_NS}}}xf")]
+
+
+# Function to hash rows of a sheet with every cell style index replaced by
+# the number format it applies, so styles renumbered or added when the
+# workbook is saved again (openpyxl does both) leave the hash of rows that
+# read the same unchanged
+def _rows_digest(rows, formats):
+    resolved = {str(index).encode("ascii"): repr(code).encode("utf-8") for index, code in enumerate(formats)}
+    rows = CELL_STYLE.sub(lambda match: match.group(1) + b"s=" + resolved.get(match.group(2), match.group(2)), rows)
+    return hashlib.sha256(rows).hexdigest()
+
+
+# Function to hash the first count entries of the shared strings table.
+# None when the table has fewer entries.
+def _strings_digest(strings, count):
+    if not count:
+        return hashlib.sha256(b"").hexdigest()
+    ends = [match.end() for _, match in zip(range(count), STRING_END.finditer(strings))]
+    if len(ends) < count:
+        return None
+    return hashlib.sha256(strings[STRING.search(strings).start():ends[-1]]).hexdigest()
+
+
+# Function to describe the rows of a sheet up to rows_end (just after the
+# closing tag of a row): their hash from <sheetData> on (see _rows_digest),
+# the number of the last of them, and the shared strings and date system
+# they depend on. None when the last row carries no row number.
+def _mark(book, strings_part, formats, date1904, xml, data_start, rows_end):
+    numbers = ROW_NUMBER.findall(xml, max(data_start, rows_end - (1 << 16)), rows_end) or ROW_NUMBER.findall(xml, data_start, rows_end)
+    if not numbers:
+        return None
+    strings = book.read(strings_part) if strings_part else b""
+    count = len(STRING_END.findall(strings))
+    return {
+        "rows_sha256": _rows_digest(xml[data_start:rows_end], formats),
+        "last_row": int(numbers[-1][1]),
+        "strings": count,
+        "strings_sha256": _strings_digest(strings, count),
+        "date1904": date1904,
+    }
+
+
+# Function to find where the rows of a sheet up to row number last_row end
+# (just after that row's closing tag), None when the sheet has no such row
+def _rows_end(xml, data_start, data_end, last_row):
+    row = re.compile(rb"<(?:\w+:)?row\b[^>]*?\sr=\"%d\"" % last_row).search(xml, data_start, data_end)
+    end = row and ROW_END.search(xml, row.end(), data_end)
+    return end and end.end()
+
+
+# Function to read a sheet's XML and locate its <sheetData> element. Returns
+# the sheet's name in the workbook, its XML, the sheetData open and close
+# matches, or None when the sheet has no rows.
+def _sheet_xml(book, sheets, sheet_name):
+    name = list(sheets)[sheet_name] if isinstance(sheet_name, int) else sheet_name
+    xml = book.read(sheets[name])
+    start = SHEET_DATA.search(xml)
+    if start is None or start.group(1):
+        return None
+    return name, xml, start, SHEET_DATA_END.search(xml, start.end())
+
+
+# Function to take the append mark of a sheet as it is now. A later
+# read_appended_rows compares against it to tell rows appended to the sheet
+# from any other change. None when the sheet has no rows or does not start
+# with its header in row 1.
+def append_mark(filepath, sheet_name):
+    with zipfile.ZipFile(filepath) as book:
+        sheets, strings_part, styles_part, date1904 = _parts(book)
+        located = _sheet_xml(book, sheets, sheet_name)
+        if located is None:
+            return None
+        _, xml, start, close = located
+        first = ROW.search(xml, start.end(), close.start())
+        if first is None or first.group(1) != b"1":
+            return None
+        rows_end = max(match.end() for match in ROW_END.finditer(xml, start.end(), close.start()))
+        return _mark(book, strings_part, _formats(book, styles_part), date1904, xml, start.start(), rows_end)
+
+
+# Function to read only the rows appended to a sheet since mark was taken
+# (see append_mark). This applies when the rows the mark covers still read
+# the same: the same cells with the same values, shared string indices and
+# number formats, in the same XML. Saving again with pandas or openpyxl keeps
+# them so (openpyxl may renumber and add cell styles, which is allowed), as
+# long as the shared strings they use keep their place at the start of the
+# table (new strings added at its end) and the date system is unchanged.
+# A save that rewrites the rows (Excel converting inline strings to shared
+# ones or adding row attributes, a sort, an edit or a deleted row) returns
+# None, and the sheet has to be parsed in full once; later appends to that
+# save are read incrementally again. The new rows are parsed by pandas from
+# a copy of the workbook holding only the sheet's header row and the
+# appended rows, so their values come out as a full parse gives them.
+# Returns the frame of appended rows (empty when there are none) and the
+# mark of the sheet as it is now.
+def read_appended_rows(filepath, sheet_name, mark):
+    with zipfile.ZipFile(filepath) as book:
+        sheets, strings_part, styles_part, date1904 = _parts(book)
+        located = _sheet_xml(book, sheets, sheet_name)
+        if located is None or date1904 != mark["date1904"]:
+            return None
+        name, xml, start, close = located
+        rows_end = _rows_end(xml, start.end(), close.start(), mark["last_row"])
+        formats = _formats(book, styles_part)
+        if rows_end is None or _rows_digest(xml[start.start():rows_end], formats) != mark["rows_sha256"]:
+            return None
+        strings = book.read(strings_part) if strings_part else b""
+        if _strings_digest(strings, mark["strings"]) != mark["strings_sha256"]:
+            return None
+
+        tail = xml[rows_end:close.start()]
+        tail_ends = [match.end() for match in ROW_END.finditer(tail)]
+        if not tail_ends:
+            return pd.DataFrame(), mark
+        new_mark = _mark(book, strings_part, formats, date1904, xml, start.start(), rows_end + tail_ends[-1])
+        if new_mark is None:
+            return None
+
+        # Appended rows move up to follow the header, keeping their distance
+        # from the last row the mark covers
+        shift = mark["last_row"] - 1
+        renumber = lambda match: match.group(1) + str(int(match.group(2)) - shift).encode("ascii") + match.group(3)
+        tail = CELL_NUMBER.sub(renumber, ROW_NUMBER.sub(renumber, tail))
+        header = ROW.search(xml, start.end(), rows_end).group(0)
+        sheet = xml[:start.end()] + header + tail + xml[close.start():]
+
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED, compresslevel=1) as copy:
+            for info in book.infolist():
+                if info.filename == sheets[name]:
+                    copy.writestr(info.filename, sheet)
+                elif info.filename in sheets.values():
+                    copy.writestr(info.filename, EMPTY_SHEET)
+                else:
+                    copy.writestr(info.filename, book.read(info.filename))
+    buffer.seek(0)
+    return pd.read_excel(buffer, sheet_name=name), new_mark
@@ -0,0 +1,68 @@
+import math
+
+import numpy as np
+import streamlit as st
+
+from data_store import get_filtered
+
+
+# Rows sent to the browser per table page
+PAGE_SIZE = 50
+
+# Sort choice meaning "keep the rows in their current order"
+NO_SORT = "(none)"
+
+
+# Function to find the rows of a frame to show, in order: those whose search
+# column contains the search text (any case), sorted by the sort column
+# (missing values last, ties kept in frame order). Returns row positions.
+def table_rows(df, search_column, search, sort_column, descending):
+    rows = np.arange(len(df))
+    if search:
+        found = df[search_column].astype(str).str.contains(search, case=False, regex=False, na=False)
+        rows = rows[found.to_numpy()]
+    if sort_column != NO_SORT:
+        values = df[sort_column].iloc[rows].reset_index(drop=True)
+        try:
+            order = values.sort_values(ascending=not descending, na_position="last", kind="stable").index
+        except TypeError:
+            # Mixed types in one column: sort by their text
+            order = values.astype(str).where(values.notna()).sort_values(ascending=not descending, na_position="last", kind="stable").index
+        rows = rows[order.to_numpy()]
+    return rows
+
+
+# Function to show a frame one page at a time. Searching and sorting run on
+# the server and only the rows of the current page (and the picked columns,
+# default_columns to start with) are sent to the browser. The row order of
+# each search / sort choice is remembered in the page's filter cache under
+# name, state and params, the filter state and the page data parameters df
+# was taken with (see data_store.get_filtered). The full searched and sorted
+# result is turned into CSV only when its download button is pressed.
+def paged_table(df, name, state, key, default_columns=None, params=()):
+    columns = list(df.columns)
+    default_columns = [column for column in (default_columns or columns) if column in columns]
+
+    cols1, cols2, cols3, cols4 = st.columns([2, 1, 1, 1])
+    shown = cols1.multiselect("Columns", options=columns, default=default_columns, key=f"{key}_columns")
+    search_column = cols2.selectbox("Search in", options=columns, key=f"{key}_search_column")
+    search = cols3.text_input("Search", key=f"{key}_search").strip()
+    sort_column = cols4.selectbox("Sort by", options=[NO_SORT] + columns, key=f"{key}_sort")
+    descending = cols4.toggle("Descending", key=f"{key}_descending")
+
+    rows = get_filtered(name, ("table", state, search_column, search, sort_column, descending),
+                        lambda: table_rows(df, search_column, search, sort_column, descending), params=params)
+
+    # Back to the last page when a narrower result has fewer pages
+    pages = max(math.ceil(len(rows) / PAGE_SIZE), 1)
+    if st.session_state.get(f"{key}_page", 1) > pages:
+        st.session_state[f"{key}_page"] = pages
+    page = st.number_input(f"Page (of {pages:,})", min_value=1, max_value=pages, step=1, key=f"{key}_page")
+
+    first = (page - 1) * PAGE_SIZE
+    page_rows = rows[first:first + PAGE_SIZE]
+    st.dataframe(df.iloc[page_rows][shown or default_columns])
+    st.caption(f"Rows {first + 1 if len(page_rows) else 0:,}-{first + len(page_rows):,} of {len(rows):,}")
+
+    st.download_button("Download all rows (CSV)", data=lambda: df.iloc[rows].to_csv(index=False),
+                       file_name=f"{key}.csv", mime="text/csv", on_click="ignore", key=f"{key}_download")
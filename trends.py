@@ -0,0 +1,99 @@
+import numpy as np
+import pandas as pd
+
+from earned import monthly_earned_premium
+from intervals import join_within_periods
+from periods import period_label
+from triangle import month_number
+
+
+# Loss ratio windows, in months: each point covers its month and the ones before it
+WINDOWS = {"Monthly": 1, "Rolling 3 Months": 3, "Trailing 12 Months": 12}
+
+
+# Function to sum a measure per group and month onto a dense groups x months
+# grid, as prefix sums along the months (one leading zero column, so the sum
+# over months a..b is prefix[b + 1] - prefix[a])
+def _prefix_sums(values, groups, months, n_groups, n_months):
+    values = np.nan_to_num(np.asarray(values, dtype=float))
+    grid = np.bincount(groups * n_months + months, weights=values, minlength=n_groups * n_months)
+    prefix = np.zeros((n_groups, n_months + 1))
+    np.cumsum(grid.reshape(n_groups, n_months), axis=1, out=prefix[:, 1:])
+    return prefix
+
+
+# Function to compute loss ratio series of premium rows and the usage events
+# (claims or visits, see usage.usage_events) made under them: for every month
+# from the first policy start to the as-of date and every window of WINDOWS,
+# the amount of the events dated in the window divided by the premium earned
+# in it. An event counts in the month of its own date, once per premium row
+# of its client covering that date (as the pages count it), and events after
+# as_of are left out; premium is earned month by month to as_of (see
+# earned.monthly_earned_premium). Both measures are turned into prefix sums
+# over the months once, so every window sum is one subtraction whatever its
+# length. events need client_id, date_col and amount; policies client_id,
+# Start Date, End Date, Total and by. With by (a column with one value per
+# client, such as 'Client Name') there is a series per value, otherwise one
+# overall. Points whose window reaches back before the first month, or whose
+# premium is zero, have no ratio (NaN).
+# Returns a long frame: by (if given), Period, Month-Year, Window, Claims,
+# Premium and Loss Ratio (a fraction).
+def loss_ratio_series(events, amount, date_col, policies, as_of, by=None, windows=WINDOWS):
+    columns = ([by] if by else []) + ["Period", "Month-Year", "Window", "Claims", "Premium", "Loss Ratio"]
+    policies = policies[policies["Start Date"].notna() & policies["End Date"].notna()]
+    if by:
+        policies = policies[policies[by].notna()]
+    last = month_number([as_of])[0]
+    if not len(policies) or month_number(policies["Start Date"]).min() > last:
+        return pd.DataFrame(columns=columns)
+
+    first = month_number(policies["Start Date"]).min()
+    n_months = int(last - first + 1)
+    if by:
+        groups, labels = pd.factorize(policies[by])
+        client_groups = pd.Series(groups, index=policies["client_id"].to_numpy())
+        client_groups = client_groups[~client_groups.index.duplicated()]
+    else:
+        groups, labels = np.zeros(len(policies), dtype=np.int64), None
+    n_groups = len(labels) if by else 1
+
+    # Premium each premium row earns in each month, summed per group and month
+    year, month = divmod(int(first), 12)
+    earned = monthly_earned_premium(policies["Total"], policies["Start Date"], policies["End Date"],
+                                    pd.Timestamp(year=year, month=month + 1, day=1), as_of)
+    premium_prefix = _prefix_sums(earned.ravel(), np.repeat(groups, n_months), np.tile(np.arange(n_months), len(policies)),
+                                  n_groups, n_months)
+
+    # Events in the month of their own date, once per premium row covering it
+    events = join_within_periods(events, policies, on="client_id", date_col=date_col)
+    events = events[(events[date_col] <= as_of).to_numpy()]
+    months = month_number(events[date_col]) - first
+    event_groups = (client_groups.reindex(events["client_id"].to_numpy()).to_numpy(dtype=np.int64) if by
+                    else np.zeros(len(events), dtype=np.int64))
+    claims_prefix = _prefix_sums(events[amount], event_groups, months, n_groups, n_months)
+
+    axis = first + np.arange(n_months)
+    periods = (axis // 12) * 100 + axis % 12 + 1
+    month_labels = np.array([period_label(period) for period in periods], dtype=object)
+    frames = []
+    for name, width in windows.items():
+        ends = np.arange(1, n_months + 1)
+        starts = np.maximum(ends - width, 0)
+        claims_sum = claims_prefix[:, ends] - claims_prefix[:, starts]
+        premium_sum = premium_prefix[:, ends] - premium_prefix[:, starts]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            ratio = np.where(premium_sum > 0, claims_sum / premium_sum, np.nan)
+        ratio[:, ends < width] = np.nan
+        frame = pd.DataFrame({
+            "Period": np.tile(periods, n_groups),
+            "Month-Year": np.tile(month_labels, n_groups),
+            "Window": name,
+            "Claims": claims_sum.ravel(),
+            "Premium": premium_sum.ravel(),
+            "Loss Ratio": ratio.ravel(),
+        })
+        if by:
+            frame.insert(0, by, np.repeat(labels, n_months))
+        frames.append(frame)
+
+    return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+
+
+# Function to number the months of dates consecutively (year * 12 + month - 1),
+# -1 where the date is missing
+def month_number(dates):
+    months = pd.to_datetime(pd.Series(dates), errors="coerce").to_numpy(dtype="datetime64[ns]").astype("datetime64[M]")
+    return np.where(np.isnat(months), -1, months.astype(np.int64) + 1970 * 12)
+
+
+# Function to label an origin period: the first month number of the period
+# and the number of months it spans (1 for months, 3 for quarters, 12 for years)
+def origin_label(first_month, grain):
+    year, month = divmod(int(first_month), 12)
+    if grain == 12:
+        return str(year)
+    if grain == 3:
+        return f"{year} Q{month // 3 + 1}"
+    return pd.Timestamp(year=year, month=month + 1, day=1).strftime("%b %Y")
+
+
+# Function to build the cumulative development triangle of claims: rows are
+# the origin periods (the period the claim's policy started in), columns the
+# development lag in periods (how many periods after its origin the claim was
+# reported), cells the amount reported up to that lag. Both come from month
+# numbers (see month_number) by integer division by grain, so the whole
+# triangle is one bincount. Claims reported after the as-of month, before their
+# origin, or without an origin or report month are left out; cells past the
+# as-of period are NaN. Returns the triangle indexed by the first month number
+# of each origin period, with lags 0, 1, ... as columns.
+def claims_triangle(origin_months, report_months, amounts, as_of_month, grain=1):
+    origin_months = np.asarray(origin_months, dtype=np.int64)
+    report_months = np.asarray(report_months, dtype=np.int64)
+    amounts = np.nan_to_num(np.asarray(amounts, dtype=float))
+    keep = (origin_months >= 0) & (report_months >= origin_months) & (report_months <= as_of_month)
+    origins = origin_months[keep] // grain
+    lags = report_months[keep] // grain - origins
+    if not len(origins):
+        return pd.DataFrame(dtype=float)
+
+    first, last = origins.min(), as_of_month // grain
+    n = int(last - first + 1)
+    incremental = np.bincount((origins - first) * n + lags, weights=amounts[keep], minlength=n * n).reshape(n, n)
+    cumulative = np.cumsum(incremental, axis=1)
+
+    # Origin period i has been developing for n - 1 - i periods by the as-of period
+    cumulative[np.arange(n)[:, None] + np.arange(n)[None, :] > n - 1] = np.nan
+    return pd.DataFrame(cumulative, index=pd.Index((first + np.arange(n)) * grain, name="Origin"),
+                        columns=pd.RangeIndex(n, name="Lag"))
+
+
+# Function to project a cumulative triangle to ultimate with the chain ladder.
+# The development factor from lag j to j + 1 is the volume-weighted ratio of
+# the origins known at both lags (1 when nothing was reported by lag j); each
+# origin's latest amount is developed to ultimate by the product of the
+# factors after its latest lag. Returns the factors (indexed by the lag they
+# develop from) and per origin the latest amount, its lag, the
+# cumulative development factor, the ultimate amount and the IBNR (ultimate
+# less latest).
+def chain_ladder(triangle):
+    values = triangle.to_numpy(dtype=float)
+    n = values.shape[1]
+    known = ~np.isnan(values)
+    both = known[:, :-1] & known[:, 1:]
+    to = np.where(both, values[:, 1:], 0.0).sum(axis=0)
+    base = np.where(both, values[:, :-1], 0.0).sum(axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        factors = np.where(base > 0, to / base, 1.0)
+
+    # Cumulative factor from every lag to ultimate: product of the factors after it
+    to_ultimate = np.append(np.cumprod(factors[::-1])[::-1], 1.0)
+    latest_lag = known.sum(axis=1) - 1
+    rows = np.arange(len(values))
+    latest = np.where(latest_lag >= 0, values[rows, np.maximum(latest_lag, 0)], np.nan)
+    cdf = to_ultimate[np.maximum(latest_lag, 0)]
+    projection = pd.DataFrame({
+        "Latest": latest,
+        "Lag": latest_lag,
+        "CDF": cdf,
+        "Ultimate": latest * cdf,
+    }, index=triangle.index)
+    projection["IBNR"] = projection["Ultimate"] - projection["Latest"]
+    return pd.Series(factors, index=pd.RangeIndex(max(n - 1, 0), name="Lag"), name="Factor"), projection
@@ -0,0 +1,117 @@
+import hashlib
+import os
+
+import pandas as pd
+
+from clients import canonical_names, client_ids, load_client_rules
+from data_store import dataset_delta, dataset_digest, get_dataset
+from duckdb_backend import usage_duckdb
+from intervals import join_within_periods
+
+
+# Backend running the visit / claim joins and aggregations: "pandas" (in
+# memory) or "duckdb" (local DuckDB file, see duckdb_backend)
+BACKEND = os.environ.get("LOSS_RATIO_BACKEND", "pandas")
+
+# Per usage dataset: the client name column, the event date column and the
+# (column, aggregation) pairs summarised per client
+USAGE = {
+    "visits": ("Client Name", "Visit Date", [("Visit ID", "count"), ("Total Amount", "sum"), ("Pharmacy Claim Amount", "sum")]),
+    "claims": ("Employer Name", "Claim Created Date", [("Claim ID", "count"), ("Claim Amount", "sum"), ("Approved Claim Amount", "sum")]),
+}
+
+
+# Last pandas summary per (dataset, columns), keyed by canonical client name:
+# (periods key, workbook digest, summary), updated in place when rows are
+# only appended to the dataset
+_summaries = {}
+
+
+# Function to summarise usage events per client: every event is kept once per
+# premium period of its client that covers the event date (interval join),
+# then counted / summed per client_id with its first and last event date.
+# Events without a client name are left out.
+def _summarise(df_events, df_premiums, registry, client_column, date_column, measures):
+    df_events['client_id'] = client_ids(registry, df_events[client_column])
+    df_events[date_column] = pd.to_datetime(df_events[date_column], errors='coerce')
+
+    df_filtered = join_within_periods(df_events, df_premiums, on='client_id', date_col=date_column)
+    aggregations = {column: aggregation for column, aggregation in measures}
+    aggregations[date_column] = ['min', 'max']
+    df_usage = df_filtered[df_filtered['client_id'] >= 0].groupby('client_id').agg(aggregations).reset_index()
+    df_usage.columns = [' '.join(col).strip() if isinstance(col, tuple) else col for col in df_usage.columns]
+    # Integer sums as int64 whatever the compacted input type
+    for column in df_usage.columns:
+        if pd.api.types.is_integer_dtype(df_usage[column]):
+            df_usage[column] = df_usage[column].astype('int64')
+    return df_usage
+
+
+# Function to fingerprint what a summary depends on besides the events: the
+# premium periods (by canonical client name) and the client rules
+def _periods_key(df_premiums, registry):
+    periods = pd.DataFrame({"client": canonical_names(registry, df_premiums['client_id']),
+                            "start": df_premiums['Start Date'].to_numpy(), "end": df_premiums['End Date'].to_numpy()})
+    digest = hashlib.sha256(pd.util.hash_pandas_object(periods, index=False).to_numpy().tobytes())
+    digest.update(repr(load_client_rules()).encode("utf-8"))
+    return digest.hexdigest()
+
+
+# Function to add the summary of appended events to an earlier summary, both
+# keyed by canonical client name: counts and sums add up, first and last
+# dates are the min / max of both
+def _merge_summaries(previous, appended, date_column):
+    aggregations = {column: 'sum' for column in previous.columns if column not in ('Client', f'{date_column} min', f'{date_column} max')}
+    aggregations[f'{date_column} min'] = 'min'
+    aggregations[f'{date_column} max'] = 'max'
+    return pd.concat([previous, appended]).groupby('Client', sort=False).agg(aggregations).reset_index()
+
+
+# Function to summarise a usage dataset per client in pandas. When the
+# dataset's last refresh only appended rows (see data_store.dataset_delta)
+# and the premium periods are the ones of the previous summary, only the
+# appended rows are summarised and added to it instead of redoing them all.
+def _usage_pandas(name, columns, df_premiums, registry):
+    client_column, date_column, measures = USAGE[name]
+    df_events = get_dataset(name, columns=columns)
+    key, periods = (name, tuple(sorted(columns))), _periods_key(df_premiums, registry)
+    delta = dataset_delta(name)
+    previous = _summaries.get(key)
+
+    if (delta is not None and previous is not None and previous[:2] == (periods, delta["from"])
+            and len(df_events) == delta["rows"]):
+        df_usage = _summarise(df_events.iloc[delta["positions"]], df_premiums, registry, client_column, date_column, measures)
+        df_usage.insert(0, 'Client', canonical_names(registry, df_usage.pop('client_id')))
+        by_client = _merge_summaries(previous[2], df_usage, date_column)
+        digest = delta["to"]
+    else:
+        by_client = _summarise(df_events, df_premiums, registry, client_column, date_column, measures)
+        by_client.insert(0, 'Client', canonical_names(registry, by_client.pop('client_id')))
+        digest = dataset_digest(name)
+    _summaries[key] = (periods, digest, by_client)
+
+    df_usage = by_client.drop(columns='Client')
+    df_usage.insert(0, 'client_id', registry["names"].get_indexer(by_client['Client']))
+    return df_usage.sort_values('client_id', ignore_index=True)
+
+
+# Function to summarise a usage dataset ('visits' or 'claims') per client
+# against the premium periods, with the configured backend. Returns one row
+# per client_id with '<column> <aggregation>' measures and '<date> min' /
+# '<date> max'; both backends return the same frame.
+def usage_by_client(name, columns, df_premiums, registry):
+    if BACKEND == "duckdb":
+        return usage_duckdb(name, *USAGE[name], df_premiums, registry)
+    return _usage_pandas(name, columns, df_premiums, registry)
+
+
+# Function to get the events of a usage dataset ('visits' or 'claims') with
+# their client_id and event date, for measures that need the events
+# themselves rather than their summary per client. Events without a client
+# name are left out, as usage_by_client leaves them out.
+def usage_events(name, columns, registry):
+    client_column, date_column, _ = USAGE[name]
+    df_events = get_dataset(name, columns=columns)
+    df_events['client_id'] = client_ids(registry, df_events[client_column])
+    df_events[date_column] = pd.to_datetime(df_events[date_column], errors='coerce')
+    return df_events[df_events['client_id'] >= 0]